@@ -17,7 +17,9 @@ REVISIONS = "revisions"  # Only when enabled in config, not by default look at s
 ONLY_V2 = "only_v2"  # Remotes and virtuals from Artifactory returns this capability
 MATRIX_PARAMS = "matrix_params"
 OAUTH_TOKEN = "oauth_token"
-SERVER_CAPABILITIES = [COMPLEX_SEARCH_CAPABILITY, REVISIONS]  # Server is always with revisions
+PACKAGES_INFO = "packages_info"  # Only when v2, many binaries info in one request
+# Server is always with revisions
+SERVER_CAPABILITIES = [COMPLEX_SEARCH_CAPABILITY, REVISIONS, CHECKSUM_DEPLOY, PACKAGES_INFO]
 DEFAULT_REVISION_V1 = "0"
 
 __version__ = '10.0.1'
@@ -1,6 +1,8 @@
 import os
+import pickle
 import platform
 import shutil
+import uuid
 from collections import OrderedDict
 
 from jinja2 import Environment, select_autoescape, FileSystemLoader, ChoiceLoader, Template
@@ -14,26 +16,31 @@ from conans.client.conf import ConanClientConfigParser, get_default_client_conf,
 from conans.client.conf.detect import detect_defaults_settings
 from conans.client.output import Color
 from conans.client.profile_loader import read_profile
+from conans.client.store.cache_index import CacheIndex
 from conans.client.store.localdb import LocalDB
 from conans.errors import ConanException
 from conans.model.conf import ConfDefinition
 from conans.model.profile import Profile
-from conans.model.ref import ConanFileReference
-from conans.model.settings import Settings
-from conans.paths import ARTIFACTS_PROPERTIES_FILE
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.model.settings import Settings, load_settings_yml
+from conans.paths import ARTIFACTS_PROPERTIES_FILE, CONANINFO
 from conans.paths.package_layouts.package_cache_layout import PackageCacheLayout
 from conans.paths.package_layouts.package_editable_layout import PackageEditableLayout
 from conans.util.files import list_folder_subdirs, load, normalize, save, remove
 from conans.util.locks import Lock
+from conans.util.sha import sha1
 
 CONAN_CONF = 'conan.conf'
 CONAN_SETTINGS = "settings.yml"
+CONAN_SETTINGS_PARSED = ".settings.yml.pickle"
 LOCALDB = ".conan.db"
+CACHE_INDEX = ".conan_index.db"
 REMOTES = "remotes.json"
 PROFILES_FOLDER = "profiles"
 HOOKS_FOLDER = "hooks"
 TEMPLATES_FOLDER = "templates"
 GENERATORS_FOLDER = "generators"
+BYTECODE_FOLDER = "bytecode"
 
 
 def _is_case_insensitive_os():
@@ -78,17 +85,42 @@ class ClientCache(object):
         # Caching
         self._no_lock = None
         self._config = None
+        self._index = None
         self._new_config = None
+        self._settings = None  # (stat of settings.yml, Settings)
         self.editable_packages = EditablePackages(self.cache_folder)
         # paths
         self._store_folder = self.config.storage_path or os.path.join(self.cache_folder, "data")
         # Just call it to make it raise in case of short_paths misconfiguration
         _ = self.config.short_paths_home
 
-    def all_refs(self):
-        subdirs = list_folder_subdirs(basedir=self._store_folder, level=4)
+    def all_refs(self, name_filter=None):
+        """ if defined, name_filter(name) selects the names of the returned references
+        """
+        subdirs = self.index.list_subdirs(self._store_folder, level=4,
+                                          first_level_filter=name_filter)
         return [ConanFileReference.load_dir_repr(folder) for folder in subdirs]
 
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = CacheIndex.create(os.path.join(self.cache_folder, CACHE_INDEX))
+        return self._index
+
+    def update_index(self, ref):
+        """ updates the index with the store folders of the reference and the info of its
+        packages, after they have been modified
+        """
+        tokens = ref.dir_repr().split("/")
+        folders = [os.path.join(self._store_folder, *tokens[:i]) for i in range(len(tokens))]
+        package_layout = self.package_layout(ref.copy_clear_rev())
+        info_paths = []
+        if not isinstance(package_layout, PackageEditableLayout):
+            for package_id in package_layout.package_ids():
+                pref = PackageReference(package_layout.ref, package_id)
+                info_paths.append(os.path.join(package_layout.package(pref), CONANINFO))
+        self.index.update(folders, info_paths)
+
     @property
     def store(self):
         return self._store_folder
@@ -201,6 +233,10 @@ class ClientCache(object):
     def generators_path(self):
         return os.path.join(self.cache_folder, GENERATORS_FOLDER)
 
+    @property
+    def bytecode_path(self):
+        return os.path.join(self.cache_folder, BYTECODE_FOLDER)
+
     @property
     def default_profile_path(self):
         if os.path.isabs(self.config.default_profile):
@@ -230,8 +266,37 @@ class ClientCache(object):
         """Returns {setting: [value, ...]} defining all the possible
            settings without values"""
         self.initialize_settings()
+        stat = os.stat(self.settings_path)
+        key = stat.st_mtime_ns, stat.st_size
+        if self._settings is None or self._settings[0] != key:
+            self._settings = key, Settings.from_definition(self._settings_definition())
+        return self._settings[1].copy()
+
+    def _settings_definition(self):
+        """ the parsed settings.yml. The result is stored in the cache with the hash of the file,
+        and reused while the file does not change, as parsing the yaml is the slow part of
+        loading the settings
+        """
         content = load(self.settings_path)
-        return Settings.loads(content)
+        sha = sha1(content.encode())
+        parsed_path = os.path.join(self.cache_folder, CONAN_SETTINGS_PARSED)
+        try:
+            with open(parsed_path, "rb") as f:
+                parsed_sha, definition = pickle.load(f)
+            if parsed_sha == sha:
+                return definition
+        except Exception:
+            pass
+
+        definition = load_settings_yml(content)
+        try:
+            tmp_path = "%s.%s" % (parsed_path, uuid.uuid4().hex)
+            with open(tmp_path, "wb") as f:
+                pickle.dump((sha, definition), f)
+            os.replace(tmp_path, parsed_path)
+        except (IOError, OSError, pickle.PickleError):
+            pass  # Just an optimization
+        return definition
 
     @property
     def hooks(self):
@@ -99,3 +99,4 @@ def package_copy(src_ref, user_channel, package_ids, cache, user_io, short_paths
         for package_id, (revision, recipe_revision) in package_revisions.items():
             metadata.packages[package_id].revision = revision
             metadata.packages[package_id].recipe_revision = recipe_revision
+    cache.update_index(dest_ref)
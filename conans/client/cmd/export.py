@@ -193,7 +193,7 @@ def cmd_export(app, conanfile_path, name, version, user, channel, keep_source,
 
     # When revisions enabled, remove the packages not matching the revision
     if revisions_enabled:
-        packages = search_packages(package_layout, query=None)
+        packages = search_packages(package_layout, query=None, cache_index=cache.index)
         metadata = package_layout.load_metadata()
         recipe_revision = metadata.recipe.revision
         to_remove = [pid for pid in packages if
@@ -204,6 +204,7 @@ def cmd_export(app, conanfile_path, name, version, user, channel, keep_source,
             remover = DiskRemover()
             remover.remove_packages(package_layout, ids_filter=to_remove)
 
+    cache.update_index(ref)
     ref = ref.copy_with_rev(revision)
     output.info("Exported revision: %s" % revision)
     if graph_lock:
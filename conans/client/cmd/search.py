@@ -60,7 +60,7 @@ class Search(object):
 
     def _search_packages_in_local(self, ref=None, query=None, outdated=False):
         package_layout = self._cache.package_layout(ref, short_paths=None)
-        packages_props = search_packages(package_layout, query)
+        packages_props = search_packages(package_layout, query, cache_index=self._cache.index)
         ordered_packages = OrderedDict(sorted(packages_props.items()))
 
         try:
@@ -15,10 +15,11 @@ from conans.errors import ConanException, NotFoundException
 from conans.model.manifest import gather_files, FileTreeManifest
 from conans.model.ref import ConanFileReference, PackageReference, check_valid_ref
 from conans.paths import (CONAN_MANIFEST, CONANFILE, EXPORT_SOURCES_TGZ_NAME,
-                          EXPORT_TGZ_NAME, PACKAGE_TGZ_NAME, CONANINFO)
+                          EXPORT_TGZ_NAME, PACKAGE_TGZ_NAME, CONANINFO, COMPRESSION_EXTENSIONS,
+                          compressed_file_names)
 from conans.search.search import search_packages, search_recipes
-from conans.util.files import (load, clean_dirty, is_dirty,
-                               gzopen_without_timestamps, set_dirty_context_manager)
+from conans.util.files import (load, clean_dirty, is_dirty, gzopen_without_timestamps,
+                               open_compressed_tar, set_dirty_context_manager)
 from conans.util.log import logger
 from conans.util.tracer import log_recipe_upload, log_compressed_files, log_package_upload
 from conans.tools import cpu_count
@@ -122,7 +123,8 @@ class _UploadCollecter(object):
                     # better to do a search, that will retrieve real packages with ConanInfo
                     # Not only "package_id" folders that could be empty
                     package_layout = self._cache.package_layout(ref.copy_clear_rev())
-                    packages = search_packages(package_layout, query)
+                    packages = search_packages(package_layout, query,
+                                               cache_index=self._cache.index)
                     packages_ids = list(packages.keys())
                 elif package_id:
                     packages_ids = [package_id, ]
@@ -278,7 +280,8 @@ class _PackagePreparator(object):
     def _compress_recipe_files(self, layout, ref):
         download_export_folder = layout.download_export()
 
-        for f in (EXPORT_TGZ_NAME, EXPORT_SOURCES_TGZ_NAME):
+        for f in compressed_file_names(EXPORT_TGZ_NAME) + \
+                compressed_file_names(EXPORT_SOURCES_TGZ_NAME):
             tgz_path = os.path.join(download_export_folder, f)
             if is_dirty(tgz_path):
                 self._output.warn("%s: Removing %s, marked as dirty" % (str(ref), f))
@@ -296,10 +299,14 @@ class _PackagePreparator(object):
                   CONAN_MANIFEST: files.pop(CONAN_MANIFEST)}
 
         def add_tgz(tgz_name, tgz_files, tgz_symlinks, msg):
-            tgz = os.path.join(download_export_folder, tgz_name)
-            if os.path.isfile(tgz):
-                result[tgz_name] = tgz
-            elif tgz_files:
+            # An existing file is reused, even if in another format, not to change its checksum
+            for name in compressed_file_names(tgz_name):
+                tgz = os.path.join(download_export_folder, name)
+                if os.path.isfile(tgz):
+                    result[name] = tgz
+                    return
+            tgz_name = self._compressed_name(tgz_name)
+            if tgz_files:
                 if self._output and not self._output.is_terminal:
                     self._output.writeln(msg)
                 tgz = compress_files(tgz_files, tgz_symlinks, tgz_name, download_export_folder,
@@ -311,6 +318,12 @@ class _PackagePreparator(object):
 
         return result
 
+    def _compressed_name(self, tgz_name):
+        """ name of the artifact in the compression format defined in the configuration
+        """
+        extension = COMPRESSION_EXTENSIONS[self._cache.config.compression_format]
+        return os.path.splitext(tgz_name)[0] + extension
+
     def prepare_package(self, pref, integrity_check, policy, p_remote):
         pkg_layout = self._cache.package_layout(pref.ref)
         cache_files = self._compress_package_files(pkg_layout, pref, integrity_check)
@@ -328,11 +341,16 @@ class _PackagePreparator(object):
                                  % (pref, pref.ref, pref.id))
 
         download_pkg_folder = layout.download_package(pref)
-        package_tgz = os.path.join(download_pkg_folder, PACKAGE_TGZ_NAME)
-        if is_dirty(package_tgz):
-            self._output.warn("%s: Removing %s, marked as dirty" % (str(pref), PACKAGE_TGZ_NAME))
-            os.remove(package_tgz)
-            clean_dirty(package_tgz)
+        package_tgz = None
+        for tgz_name in compressed_file_names(PACKAGE_TGZ_NAME):
+            tgz_path = os.path.join(download_pkg_folder, tgz_name)
+            if is_dirty(tgz_path):
+                self._output.warn("%s: Removing %s, marked as dirty" % (str(pref), tgz_name))
+                os.remove(tgz_path)
+                clean_dirty(tgz_path)
+            elif package_tgz is None and os.path.isfile(tgz_path):
+                # An existing file is reused, even if in another format, to keep its checksum
+                package_tgz = tgz_path
 
         # Get all the files in that directory
         # existing package, will use short paths if defined
@@ -349,17 +367,17 @@ class _PackagePreparator(object):
             logger.debug("UPLOAD: Time remote_manager check package integrity : %f"
                          % (time.time() - t1))
 
-        if not os.path.isfile(package_tgz):
+        if package_tgz is None:
             if self._output and not self._output.is_terminal:
                 self._output.writeln("Compressing package...")
             tgz_files = {f: path for f, path in files.items() if
                          f not in [CONANINFO, CONAN_MANIFEST]}
-            tgz_path = compress_files(tgz_files, symlinks, PACKAGE_TGZ_NAME, download_pkg_folder,
-                                      self._output)
-            assert tgz_path == package_tgz
+            tgz_name = self._compressed_name(PACKAGE_TGZ_NAME)
+            package_tgz = compress_files(tgz_files, symlinks, tgz_name, download_pkg_folder,
+                                         self._output)
             assert os.path.exists(package_tgz)
 
-        return {PACKAGE_TGZ_NAME: package_tgz,
+        return {os.path.basename(package_tgz): package_tgz,
                 CONANINFO: files[CONANINFO],
                 CONAN_MANIFEST: files[CONAN_MANIFEST]}
 
@@ -511,6 +529,8 @@ class CmdUpload(object):
         self._output.info(left_justify_message(msg))
         self._upload_recipe(ref, conanfile, retry, retry_wait, policy, recipe_remote, remotes)
         upload_recorder.add_recipe(ref, recipe_remote.name, recipe_remote.url)
+        # The recently created packages that are uploaded are found in the index next time
+        self._cache.update_index(ref)
 
         # Now the binaries
         if prefs:
@@ -559,8 +579,10 @@ class CmdUpload(object):
 
         files_to_upload, deleted, cache_files, conanfile_path, t1, current_remote_name, layout = prep
         if files_to_upload or deleted:
+            # The checksums were computed and stored while preparing the upload
+            checksums = layout.load_metadata().recipe.checksums
             self._remote_manager.upload_recipe(ref, files_to_upload, deleted, remote, retry,
-                                               retry_wait)
+                                               retry_wait, checksums=checksums)
             msg = "\rUploaded conan recipe '%s' to '%s': %s" % (str(ref), remote.name, remote.url)
             self._output.info(left_justify_message(msg))
         else:
@@ -596,9 +618,10 @@ class CmdUpload(object):
             return None
         files_to_upload, deleted, cache_files = prep
 
+        checksums = calc_files_checksum(cache_files)
         if files_to_upload or deleted:
             self._remote_manager.upload_package(pref, files_to_upload, deleted, p_remote, retry,
-                                                retry_wait)
+                                                retry_wait, checksums=checksums)
             logger.debug("UPLOAD: Time upload package: %f" % (time.time() - t1))
         else:
             self._output.info("Package is up to date, upload skipped")
@@ -611,7 +634,6 @@ class CmdUpload(object):
         logger.debug("UPLOAD: Time uploader upload_package: %f" % (time.time() - t1))
 
         # Update the package metadata
-        checksums = calc_files_checksum(cache_files)
         with pkg_layout.update_metadata() as metadata:
             cur_package_remote = metadata.packages[pref.id].remote
             if not cur_package_remote:
@@ -638,7 +660,10 @@ def compress_files(files, symlinks, name, dest_dir, output=None):
     # FIXME, better write to disk sequentially and not keep tgz contents in memory
     tgz_path = os.path.join(dest_dir, name)
     with set_dirty_context_manager(tgz_path), open(tgz_path, "wb") as tgz_handle:
-        tgz = gzopen_without_timestamps(name, mode="w", fileobj=tgz_handle)
+        if name.endswith(".tgz"):
+            tgz = gzopen_without_timestamps(name, mode="w", fileobj=tgz_handle)
+        else:
+            tgz = open_compressed_tar(name, tgz_handle)
 
         for filename, dest in sorted(symlinks.items()):
             info = tarfile.TarInfo(name=filename)
@@ -662,6 +662,44 @@ class Command(object):
             for key, description in BUILT_IN_CONFS.items():
                 self._out.writeln("{}: {}".format(key, description))
 
+    def cache(self, *args):
+        """
+        Manages the download cache.
+
+        Reports the download cache usage and hit/miss counters, or removes the least
+        recently used entries until it fits in a maximum size.
+        """
+        parser = argparse.ArgumentParser(description=self.cache.__doc__,
+                                         prog="conan cache",
+                                         formatter_class=SmartFormatter)
+
+        subparsers = parser.add_subparsers(dest='subcommand', help='sub-command help')
+        subparsers.required = True
+
+        subparsers.add_parser('stats', help='Show the download cache size and hit/miss counters')
+        prune_subparser = subparsers.add_parser('prune', help='Remove the least recently used '
+                                                              'entries of the download cache')
+        prune_subparser.add_argument("-s", "--max-size", action=OnceArgument,
+                                     help="Maximum size of the download cache (KB, MB and GB "
+                                          "suffixes allowed). Default to "
+                                          "'storage.download_cache_max_size' in conan.conf")
+
+        args = parser.parse_args(*args)
+
+        if args.subcommand == "stats":
+            stats = self._conan.download_cache_stats()
+            self._out.writeln("Entries: %s" % stats["entries"])
+            self._out.writeln("Size: %s" % stats["size"])
+            if stats["max_size"] is not None:
+                self._out.writeln("Max size: %s" % stats["max_size"])
+            self._out.writeln("Hits: %s" % stats["hits"])
+            self._out.writeln("Misses: %s" % stats["misses"])
+            return stats
+        elif args.subcommand == "prune":
+            removed = self._conan.download_cache_prune(max_size=args.max_size)
+            self._out.info("Removed %s entries from the download cache" % len(removed))
+            return removed
+
     def info(self, *args):
         """
         Gets information about the dependency graph of a recipe.
@@ -2066,7 +2104,7 @@ class Command(object):
         """
         Prints a summary of all commands.
         """
-        grps = [("Consumer commands", ("install", "config", "get", "info", "search")),
+        grps = [("Consumer commands", ("install", "config", "get", "info", "search", "cache")),
                 ("Creator commands", ("new", "create", "upload", "export", "export-pkg", "test")),
                 ("Package development commands", ("source", "build", "package", "editable",
                                                   "workspace")),
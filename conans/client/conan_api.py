@@ -21,6 +21,7 @@ from conans.client.cmd.test import install_build_and_test
 from conans.client.cmd.uploader import CmdUpload
 from conans.client.cmd.user import user_set, users_clean, users_list, token_present
 from conans.client.conanfile.package import run_package_method
+from conans.client.conf import size_from_text
 from conans.client.conf.required_version import check_required_conan_version
 from conans.client.generators import GeneratorManager
 from conans.client.graph.graph import RECIPE_EDITABLE
@@ -181,7 +182,8 @@ class ConanApp(object):
         # To handle remote connections
         artifacts_properties = self.cache.read_artifacts_properties()
         rest_client_factory = RestApiClientFactory(self.out, self.requester, self.config,
-                                                   artifacts_properties=artifacts_properties)
+                                                   artifacts_properties=artifacts_properties,
+                                                   cache_index=self.cache.index)
         # Wraps RestApiClient to add authentication support (same interface)
         auth_manager = ConanApiAuthManager(rest_client_factory, self.user_io, self.cache.localdb)
         # Handle remote connections
@@ -199,10 +201,12 @@ class ConanApp(object):
         self.range_resolver = RangeResolver(self.cache, self.remote_manager)
         self.generator_manager = GeneratorManager()
         self.python_requires = ConanPythonRequire(self.proxy, self.range_resolver,
-                                                  self.generator_manager)
+                                                  self.generator_manager,
+                                                  self.cache.bytecode_path)
         self.pyreq_loader = PyRequireLoader(self.proxy, self.range_resolver)
         self.loader = ConanFileLoader(self.runner, self.out, self.python_requires,
-                                      self.generator_manager, self.pyreq_loader, self.requester)
+                                      self.generator_manager, self.pyreq_loader, self.requester,
+                                      self.cache.bytecode_path)
 
         self.binaries_analyzer = GraphBinariesAnalyzer(self.cache, self.out, self.remote_manager)
         self.graph_manager = GraphManager(self.out, self.cache, self.remote_manager, self.loader,
@@ -694,6 +698,29 @@ class ConanAPIV1(object):
             self.app.cache.initialize_default_profile()
             self.app.cache.initialize_settings()
 
+    def _download_cache(self):
+        download_cache = self.app.config.download_cache
+        if not download_cache:
+            raise ConanException("The download cache is not enabled, define "
+                                 "'storage.download_cache' in conan.conf")
+        from conans.client.downloaders.cached_file_downloader import CachedFileDownloader
+        return CachedFileDownloader(download_cache, None,
+                                    max_size=self.app.config.download_cache_max_size)
+
+    @api_method
+    def download_cache_stats(self):
+        return self._download_cache().stats()
+
+    @api_method
+    def download_cache_prune(self, max_size=None):
+        max_size = size_from_text(max_size) if max_size is not None else None
+        if max_size is None:
+            max_size = self.app.config.download_cache_max_size
+        if max_size is None:
+            raise ConanException("Specify the maximum size of the download cache, or define "
+                                 "'storage.download_cache_max_size' in conan.conf")
+        return self._download_cache().prune(max_size)
+
     def _info_args(self, reference_or_path, install_folder, profile_host, profile_build,
                    lockfile=None):
         cwd = os.getcwd()
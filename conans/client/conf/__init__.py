@@ -1,5 +1,6 @@
 import logging
 import os
+import re
 import textwrap
 
 from jinja2 import Template
@@ -7,7 +8,8 @@ from six.moves.configparser import ConfigParser, NoSectionError
 
 from conans.errors import ConanException
 from conans.model.env_info import unquote
-from conans.paths import DEFAULT_PROFILE_NAME, conan_expand_user, CACERT_FILE
+from conans.paths import DEFAULT_PROFILE_NAME, conan_expand_user, CACERT_FILE, \
+    COMPRESSION_EXTENSIONS
 from conans.util.dates import timedelta_from_text
 from conans.util.env_reader import get_env
 from conans.util.files import load
@@ -184,6 +186,9 @@ _t_default_client_conf = Template(textwrap.dedent("""
     [general]
     default_profile = {{default_profile}}
     compression_level = 9                 # environment CONAN_COMPRESSION_LEVEL
+    # compression_threads = 4             # environment CONAN_COMPRESSION_THREADS
+    # compression_format = gzip           # environment CONAN_COMPRESSION_FORMAT (gzip, xz, zstd)
+    # compression_format_level = 3        # environment CONAN_COMPRESSION_FORMAT_LEVEL
     sysrequires_sudo = True               # environment CONAN_SYSREQUIRES_SUDO
     request_timeout = 60                  # environment CONAN_REQUEST_TIMEOUT (seconds)
     default_package_id_mode = semver_direct_mode # environment CONAN_DEFAULT_PACKAGE_ID_MODE
@@ -229,6 +234,10 @@ _t_default_client_conf = Template(textwrap.dedent("""
     # scm_to_conandata                    # environment CONAN_SCM_TO_CONANDATA
 
     # config_install_interval = 1h
+    # version_ranges_remote_ttl = 10m     # environment CONAN_VERSION_RANGES_REMOTE_TTL
+    # remote_capabilities_ttl = 1h        # environment CONAN_REMOTE_CAPABILITIES_TTL
+    # parallel_file_transfers = 4         # environment CONAN_PARALLEL_FILE_TRANSFERS
+    # download_ranges = 4                 # environment CONAN_DOWNLOAD_RANGES
     # required_conan_version = >=1.26
 
     # keep_python_files = False           # environment CONAN_KEEP_PYTHON_FILES
@@ -239,6 +248,7 @@ _t_default_client_conf = Template(textwrap.dedent("""
     # with "~/", will be relative to the conan user home, not to the system user home)
     path = ./data
     download_cache = ./download_cache
+    # download_cache_max_size = 10GB      # environment CONAN_STORAGE_DOWNLOAD_CACHE_MAX_SIZE
 
     [tools]
     files.download.retry=3
@@ -263,6 +273,14 @@ _t_default_client_conf = Template(textwrap.dedent("""
     """))
 
 
+def size_from_text(size):
+    match = re.match(r"^\s*(\d+)\s*([KMG]?)B?\s*$", size.upper())
+    if not match:
+        raise ConanException("Incorrect size definition: %s" % size)
+    value, unit = match.group(1), match.group(2)
+    return int(value) * {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}[unit]
+
+
 def get_default_client_conf(force_v1=False):
     return _t_default_client_conf.render(default_profile=DEFAULT_PROFILE_NAME)
 
@@ -283,6 +301,13 @@ class ConanClientConfigParser(ConfigParser, object):
         ],
         "general": [
             ("CONAN_COMPRESSION_LEVEL", "compression_level", 9),
+            ("CONAN_COMPRESSION_THREADS", "compression_threads", None),
+            ("CONAN_COMPRESSION_FORMAT", "compression_format", None),
+            ("CONAN_COMPRESSION_FORMAT_LEVEL", "compression_format_level", None),
+            ("CONAN_VERSION_RANGES_REMOTE_TTL", "version_ranges_remote_ttl", None),
+            ("CONAN_REMOTE_CAPABILITIES_TTL", "remote_capabilities_ttl", None),
+            ("CONAN_PARALLEL_FILE_TRANSFERS", "parallel_file_transfers", None),
+            ("CONAN_DOWNLOAD_RANGES", "download_ranges", None),
             ("CONAN_NON_INTERACTIVE", "non_interactive", False),
             ("CONAN_SKIP_BROKEN_SYMLINKS_CHECK", "skip_broken_symlinks_check", False),
             ("CONAN_CACHE_NO_LOCKS", "cache_no_locks", False),
@@ -324,6 +349,7 @@ class ConanClientConfigParser(ConfigParser, object):
         "storage" : [
             ("CONAN_STORAGE_PATH", "path", None),
             ("CONAN_STORAGE_DOWNLOAD_CACHE", "download_cache", None),
+            ("CONAN_STORAGE_DOWNLOAD_CACHE_MAX_SIZE", "download_cache_max_size", None),
         ],
 
         "tools": [
@@ -500,6 +526,83 @@ class ConanClientConfigParser(ConfigParser, object):
         except ValueError:
             raise ConanException("Specify a numeric parameter for 'parallel_download'")
 
+    @property
+    def parallel_file_transfers(self):
+        """ number of files of the same recipe or package transferred concurrently
+        """
+        try:
+            parallel = get_env("CONAN_PARALLEL_FILE_TRANSFERS")
+            if parallel is None:
+                parallel = self.get_item("general.parallel_file_transfers")
+        except ConanException:
+            return None
+
+        try:
+            return int(parallel) if parallel is not None else None
+        except ValueError:
+            raise ConanException("Specify a numeric parameter for 'parallel_file_transfers'")
+
+    @property
+    def download_ranges(self):
+        """ number of byte ranges of a large file downloaded concurrently
+        """
+        try:
+            ranges = get_env("CONAN_DOWNLOAD_RANGES")
+            if ranges is None:
+                ranges = self.get_item("general.download_ranges")
+        except ConanException:
+            return None
+
+        try:
+            return int(ranges) if ranges is not None else None
+        except ValueError:
+            raise ConanException("Specify a numeric parameter for 'download_ranges'")
+
+    @property
+    def compression_format(self):
+        try:
+            compression_format = get_env("CONAN_COMPRESSION_FORMAT")
+            if compression_format is None:
+                compression_format = self.get_item("general.compression_format")
+        except ConanException:
+            return "gzip"
+        if compression_format not in COMPRESSION_EXTENSIONS:
+            raise ConanException("Invalid 'compression_format' '%s', allowed values: %s"
+                                 % (compression_format, ", ".join(COMPRESSION_EXTENSIONS)))
+        return compression_format
+
+    @property
+    def parallel_sources_retrieval(self):
+        try:
+            parallel = self.get_item("general.parallel_sources_retrieval")
+        except ConanException:
+            return None
+
+        try:
+            return int(parallel) if parallel is not None else None
+        except ValueError:
+            raise ConanException("Specify a numeric parameter for 'parallel_sources_retrieval'")
+
+    @property
+    def streaming_extract(self):
+        try:
+            streaming_extract = get_env("CONAN_STREAMING_EXTRACT")
+            if streaming_extract is None:
+                streaming_extract = self.get_item("general.streaming_extract")
+            return streaming_extract.lower() in ("1", "true")
+        except ConanException:
+            return False
+
+    @property
+    def keep_package_tgz(self):
+        try:
+            keep_package_tgz = get_env("CONAN_KEEP_PACKAGE_TGZ")
+            if keep_package_tgz is None:
+                keep_package_tgz = self.get_item("general.keep_package_tgz")
+            return keep_package_tgz.lower() in ("1", "true")
+        except ConanException:
+            return True
+
     @property
     def download_cache(self):
         try:
@@ -508,6 +611,19 @@ class ConanClientConfigParser(ConfigParser, object):
         except ConanException:
             return None
 
+    @property
+    def download_cache_max_size(self):
+        """ maximum size in bytes of the download cache, before evicting the least recently used
+        entries. Accepts the KB, MB and GB suffixes
+        """
+        try:
+            max_size = get_env("CONAN_STORAGE_DOWNLOAD_CACHE_MAX_SIZE")
+            if max_size is None:
+                max_size = self.get_item("storage.download_cache_max_size")
+        except ConanException:
+            return None
+        return size_from_text(max_size)
+
     @property
     def scm_to_conandata(self):
         try:
@@ -787,6 +903,32 @@ class ConanClientConfigParser(ConfigParser, object):
                                  "Removing it from conan.conf to avoid possible loop error."
                                  .format(interval))
 
+    @property
+    def version_ranges_remote_ttl(self):
+        """ time the searches in the remotes to resolve version ranges are reused, without
+        --update, in later commands
+        """
+        try:
+            ttl = get_env("CONAN_VERSION_RANGES_REMOTE_TTL")
+            if ttl is None:
+                ttl = self.get_item("general.version_ranges_remote_ttl")
+        except ConanException:
+            return None
+        return timedelta_from_text(ttl)
+
+    @property
+    def remote_capabilities_ttl(self):
+        """ time the capabilities of the servers are reused in later commands, instead of
+        asking them again to the servers
+        """
+        try:
+            ttl = get_env("CONAN_REMOTE_CAPABILITIES_TTL")
+            if ttl is None:
+                ttl = self.get_item("general.remote_capabilities_ttl")
+        except ConanException:
+            return None
+        return timedelta_from_text(ttl)
+
     @property
     def required_conan_version(self):
         try:
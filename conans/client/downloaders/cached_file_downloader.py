@@ -1,4 +1,8 @@
+import atexit
+import json
 import os
+import platform
+import re
 import shutil
 from contextlib import contextmanager
 from threading import Lock
@@ -8,18 +12,79 @@ from six.moves.urllib_parse import urlsplit, urlunsplit
 from conans.client.downloaders.file_downloader import check_checksum
 from conans.errors import ConanException
 from conans.util.log import logger
-from conans.util.files import mkdir, set_dirty, clean_dirty, is_dirty, remove
+from conans.util.files import mkdir, set_dirty, clean_dirty, is_dirty, remove, load, save
 from conans.util.locks import SimpleLock
 from conans.util.sha import sha256 as sha256_sum
 
 
+_CHUNK_SIZE = 1024 * 100
+_FICLONE = 0x40049409  # Linux ioctl to clone (reflink) a file, from linux/fs.h
+_STATS = "stats"  # hit/miss counters, saved as json next to the lock files
+_STATS_BATCH = 100  # The counters are saved every _STATS_BATCH accesses, and at exit
+_ENTRY_PATTERN = re.compile(r"^[0-9a-f]{64}$")  # sha256 of the url, see _get_hash()
+
+
+def _reflink(src, dst):
+    """ copy-on-write clone of src into dst, only in filesystems supporting it (btrfs, xfs...)
+    """
+    import fcntl  # Not available in Windows
+    with open(src, "rb") as src_handle:
+        with open(dst, "wb") as dst_handle:
+            fcntl.ioctl(dst_handle.fileno(), _FICLONE, src_handle.fileno())
+    shutil.copystat(src, dst)
+
+
+def _materialize(cached_path, file_path):
+    """ puts a copy of the cached file in file_path, a reflink where the filesystem supports it,
+    so the contents are not duplicated in disk. Never a hard link, the files in the Conan cache
+    are modified (made read-only, touched, patched...) and that would corrupt the cached entry
+    """
+    if os.path.lexists(file_path):
+        os.remove(file_path)
+    if platform.system() == "Linux":
+        try:
+            _reflink(cached_path, file_path)
+            return
+        except (IOError, OSError):
+            logger.debug("Cannot reflink %s to %s" % (cached_path, file_path))
+            if os.path.exists(file_path):
+                os.remove(file_path)
+    shutil.copy2(cached_path, file_path)
+
+
+class _CachingChunksHandler(object):
+    """ forwards the downloaded chunks to the wrapped handler, while saving them to the cache
+    """
+    def __init__(self, chunks_handler, cached_path):
+        self._chunks_handler = chunks_handler
+        self._cached_path = cached_path
+
+    @property
+    def description(self):
+        return self._chunks_handler.description
+
+    def __call__(self, chunks):
+        mkdir(os.path.dirname(self._cached_path))
+        with open(self._cached_path, 'wb') as handle:
+            def cached_chunks():
+                for chunk in chunks:
+                    handle.write(chunk)
+                    yield chunk
+            self._chunks_handler(cached_chunks())
+
+
 class CachedFileDownloader(object):
     _thread_locks = {}  # Needs to be shared among all instances
+    _pending_stats = {}  # {cache_folder: {"hits": n, "misses": n}} not saved yet
+    _stats_lock = Lock()
+    _stats_atexit = False
+    _cache_sizes = {}  # {cache_folder: size of its entries, as counted by this process}
 
-    def __init__(self, cache_folder, file_downloader, user_download=False):
+    def __init__(self, cache_folder, file_downloader, user_download=False, max_size=None):
         self._cache_folder = cache_folder
         self._file_downloader = file_downloader
         self._user_download = user_download
+        self._max_size = max_size
 
     @contextmanager
     def _lock(self, lock_id):
@@ -34,7 +99,8 @@ class CachedFileDownloader(object):
             finally:
                 thread_lock.release()
 
-    def download(self, url, file_path=None, md5=None, sha1=None, sha256=None, **kwargs):
+    def download(self, url, file_path=None, md5=None, sha1=None, sha256=None, chunks_handler=None,
+                 **kwargs):
         """ compatible interface of FileDownloader + checksum
         """
         checksum = sha256 or sha1 or md5
@@ -42,7 +108,20 @@ class CachedFileDownloader(object):
         assert (not self._user_download) or (self._user_download and checksum)
         h = self._get_hash(url, checksum)
 
+        hit, contents = self._cached_download(h, url, file_path, md5, sha1, sha256, chunks_handler,
+                                              **kwargs)
+        self._count_access(hit)
+        if not hit and self._max_size is not None:
+            self._count_size(h)
+        return contents
+
+    def _cached_download(self, h, url, file_path, md5, sha1, sha256, chunks_handler, **kwargs):
+        """ returns a tuple (cache hit, contents). Contents are only returned if there is neither
+        file_path nor chunks_handler
+        """
         with self._lock(h):
+            # The modification time of the lock file is the last access time of the entry
+            os.utime(os.path.join(self._cache_folder, "locks", h), None)
             cached_path = os.path.join(self._cache_folder, h)
             if is_dirty(cached_path):
                 if os.path.exists(cached_path):
@@ -58,20 +137,154 @@ class CachedFileDownloader(object):
                     logger.error("Cached file corrupt, redownloading")
                     remove(cached_path)
 
-            if not os.path.exists(cached_path):
+            hit = os.path.exists(cached_path)
+            if not hit:
                 set_dirty(cached_path)
+                if chunks_handler is not None:
+                    # The handler processes the chunks while they are saved to the cache
+                    caching_handler = _CachingChunksHandler(chunks_handler, cached_path)
+                    self._file_downloader.download(url=url, chunks_handler=caching_handler,
+                                                   md5=md5, sha1=sha1, sha256=sha256, **kwargs)
+                    clean_dirty(cached_path)
+                    return hit, None
                 self._file_downloader.download(url=url, file_path=cached_path, md5=md5,
                                                sha1=sha1, sha256=sha256, **kwargs)
                 clean_dirty(cached_path)
 
-            if file_path is not None:
+            if chunks_handler is not None:
+                with open(cached_path, 'rb') as handle:
+                    chunks_handler(iter(lambda: handle.read(_CHUNK_SIZE), b""))
+            elif file_path is not None:
                 file_path = os.path.abspath(file_path)
                 mkdir(os.path.dirname(file_path))
-                shutil.copy2(cached_path, file_path)
+                _materialize(cached_path, file_path)
             else:
                 with open(cached_path, 'rb') as handle:
                     tmp = handle.read()
-                return tmp
+                return hit, tmp
+        return hit, None
+
+    def _count_access(self, hit):
+        """ the counters are accumulated in memory and saved in batches, saving them for every
+        download would serialize all of them in the same inter-process lock
+        """
+        cls = CachedFileDownloader
+        with cls._stats_lock:
+            if not cls._stats_atexit:
+                atexit.register(cls._save_all_stats)
+                cls._stats_atexit = True
+            # Absolute, the current directory might be a different one when they are saved
+            cache_folder = os.path.abspath(self._cache_folder)
+            counters = cls._pending_stats.setdefault(cache_folder, {})
+            counter = "hits" if hit else "misses"
+            counters[counter] = counters.get(counter, 0) + 1
+            if sum(counters.values()) < _STATS_BATCH:
+                return
+            cls._pending_stats.pop(cache_folder)
+        self._save_stats(counters)
+
+    def _count_size(self, h):
+        """ the size of the cache is computed once per process and then increased with every new
+        entry, the folder is listed again and pruned only when it goes over the maximum size
+        """
+        cls = CachedFileDownloader
+        cache_folder = os.path.abspath(self._cache_folder)
+        with cls._stats_lock:
+            size = cls._cache_sizes.get(cache_folder)
+        if size is None:
+            size = sum(entry_size for _, _, entry_size in self._entries())
+        else:
+            try:
+                size += os.path.getsize(os.path.join(self._cache_folder, h))
+            except OSError:  # Removed concurrently
+                pass
+        if size > self._max_size:
+            size = self._prune(self._max_size)[1]
+        with cls._stats_lock:
+            cls._cache_sizes[cache_folder] = size
+
+    @staticmethod
+    def _save_all_stats():
+        with CachedFileDownloader._stats_lock:
+            pending = CachedFileDownloader._pending_stats.copy()
+            CachedFileDownloader._pending_stats.clear()
+        for cache_folder, counters in pending.items():
+            CachedFileDownloader(cache_folder, None)._save_stats(counters)
+
+    def _save_stats(self, counters):
+        with self._lock(_STATS):
+            stats_path = os.path.join(self._cache_folder, "locks", _STATS + ".json")
+            stats = json.loads(load(stats_path)) if os.path.isfile(stats_path) else {}
+            for counter, value in counters.items():
+                stats[counter] = stats.get(counter, 0) + value
+            save(stats_path, json.dumps(stats))
+
+    def _entries(self):
+        """ returns a list of (last access time, hash, size) of the cached files
+        """
+        result = []
+        if not os.path.isdir(self._cache_folder):
+            return result
+        for h in os.listdir(self._cache_folder):
+            cached_path = os.path.join(self._cache_folder, h)
+            if not _ENTRY_PATTERN.match(h) or not os.path.isfile(cached_path):
+                continue
+            try:
+                size = os.path.getsize(cached_path)
+                access_file = os.path.join(self._cache_folder, "locks", h)
+                access_path = access_file if os.path.exists(access_file) else cached_path
+                result.append((os.path.getmtime(access_path), h, size))
+            except OSError:  # Removed concurrently
+                continue
+        return result
+
+    def stats(self):
+        """ returns a dict with the number of entries, their total size and the hit/miss counters
+        """
+        with self._stats_lock:
+            counters = self._pending_stats.pop(os.path.abspath(self._cache_folder), None)
+        if counters:
+            self._save_stats(counters)
+        entries = self._entries()
+        stats_path = os.path.join(self._cache_folder, "locks", _STATS + ".json")
+        counters = json.loads(load(stats_path)) if os.path.isfile(stats_path) else {}
+        return {"entries": len(entries),
+                "size": sum(size for _, _, size in entries),
+                "max_size": self._max_size,
+                "hits": counters.get("hits", 0),
+                "misses": counters.get("misses", 0)}
+
+    def prune(self, max_size):
+        """ removes the least recently used entries until the cache size is not over max_size.
+        Returns the list of removed hashes
+        """
+        return self._prune(max_size)[0]
+
+    def _prune(self, max_size):
+        """ returns a tuple (removed hashes, size of the remaining entries)
+        """
+        entries = self._entries()
+        total_size = sum(size for _, _, size in entries)
+        removed = []
+        for _, h, size in sorted(entries):
+            if total_size <= max_size:
+                break
+            if self._remove_entry(h):
+                total_size -= size
+                removed.append(h)
+        return removed, total_size
+
+    def _remove_entry(self, h):
+        """ removes the cached file, unless it is being downloaded. The lock file is kept, other
+        processes could be waiting for it, and removing it would let them use the entry at the
+        same time than a process locking a new lock file
+        """
+        with self._lock(h):
+            cached_path = os.path.join(self._cache_folder, h)
+            if is_dirty(cached_path) or not os.path.exists(cached_path):
+                return False
+            os.remove(cached_path)
+        return True
 
     def _get_hash(self, url, checksum=None):
         """ For Api V2, the cached downloads always have recipe and package REVISIONS in the URL,
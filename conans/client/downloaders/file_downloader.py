@@ -1,12 +1,15 @@
+import hashlib
 import os
 import re
 import time
 import traceback
 
 import six
+from six.moves.urllib_parse import urlsplit
 
+from conans.client.downloaders.range_downloader import RangeDownloader, range_state_path
 from conans.client.rest import response_to_str
-from conans.client.tools.files import check_md5, check_sha1, check_sha256
+from conans.client.tools.files import check_checksums
 from conans.errors import ConanException, NotFoundException, AuthenticationException, \
     ForbiddenException, ConanConnectionError, RequestErrorException
 from conans.util import progress_bar
@@ -16,25 +19,63 @@ from conans.util.tracer import log_download
 
 
 def check_checksum(file_path, md5, sha1, sha256):
-    if md5 is not None:
-        check_md5(file_path, md5)
-    if sha1 is not None:
-        check_sha1(file_path, sha1)
-    if sha256 is not None:
-        check_sha256(file_path, sha256)
+    signatures = [(name, signature) for name, signature in
+                  (("md5", md5), ("sha1", sha1), ("sha256", sha256)) if signature is not None]
+    if signatures:
+        check_checksums(file_path, signatures)
+
+
+class _ChecksumChunksHandler(object):
+    """ forwards the downloaded chunks to the wrapped handler, computing their checksums in the
+    same pass. The checksums are checked after the last chunk, before the wrapped handler
+    finishes, so it can discard what it did with the chunks if they don't match
+    """
+    def __init__(self, chunks_handler, name, signatures):
+        self._chunks_handler = chunks_handler
+        self._name = name
+        self._signatures = signatures
+
+    @property
+    def description(self):
+        return self._chunks_handler.description
+
+    def __call__(self, chunks):
+        def checked_chunks():
+            hashes = [(name, signature, hashlib.new(name)) for name, signature in self._signatures]
+            for chunk in chunks:
+                for _, _, h in hashes:
+                    h.update(chunk)
+                yield chunk
+            for name, signature, h in hashes:
+                if h.hexdigest() != signature.lower():
+                    raise ConanException("%s signature failed for '%s' file. \n"
+                                         " Provided signature: %s  \n"
+                                         " Computed signature: %s" % (name, self._name, signature,
+                                                                      h.hexdigest()))
+        self._chunks_handler(checked_chunks())
 
 
 class FileDownloader(object):
 
-    def __init__(self, requester, output, verify, config_retry, config_retry_wait):
+    def __init__(self, requester, output, verify, config_retry, config_retry_wait, ranges=None):
         self._output = output
         self._requester = requester
         self._verify_ssl = verify
         self._config_retry = config_retry
         self._config_retry_wait = config_retry_wait
+        self._ranges = ranges
 
     def download(self, url, file_path=None, auth=None, retry=None, retry_wait=None, overwrite=False,
-                 headers=None, md5=None, sha1=None, sha256=None):
+                 headers=None, md5=None, sha1=None, sha256=None, chunks_handler=None):
+        """ downloads the url into file_path, or returns its contents if file_path is None.
+        If chunks_handler is given, it is called with the iterator of downloaded chunks instead,
+        so the contents can be processed while they are streamed. A failed transfer is retried
+        from the beginning, calling the handler again, so it must start from scratch every time.
+        The checksums of the streamed contents are checked when the iterator of chunks is
+        exhausted, raising from it, so the handler must remove what it produced on errors.
+        If ranges is greater than 1, large files are downloaded in that many concurrent ranges, and
+        an interrupted download into file_path is resumed later from its state file
+        """
         retry = retry if retry is not None else self._config_retry
         retry = retry if retry is not None else 2
         retry_wait = retry_wait if retry_wait is not None else self._config_retry_wait
@@ -43,7 +84,8 @@ class FileDownloader(object):
         if file_path and not os.path.isabs(file_path):
             file_path = os.path.abspath(file_path)
 
-        if file_path and os.path.exists(file_path):
+        resume = file_path and os.path.exists(range_state_path(file_path))
+        if file_path and os.path.exists(file_path) and not resume:
             if overwrite:
                 if self._output:
                     self._output.warn("file '%s' already exists, overwriting" % file_path)
@@ -52,18 +94,30 @@ class FileDownloader(object):
                 # the dest folder before
                 raise ConanException("Error, the file to download already exists: '%s'" % file_path)
 
+        signatures = [(name, signature) for name, signature in
+                      (("md5", md5), ("sha1", sha1), ("sha256", sha256)) if signature is not None]
+        if chunks_handler is not None and signatures:
+            name = os.path.basename(urlsplit(url).path)
+            chunks_handler = _ChecksumChunksHandler(chunks_handler, name, signatures)
+
         try:
             r = _call_with_retry(self._output, retry, retry_wait, self._download_file, url, auth,
-                                 headers, file_path)
+                                 headers, file_path, chunks_handler=chunks_handler)
             if file_path:
+                if os.path.exists(range_state_path(file_path)):
+                    os.remove(range_state_path(file_path))
                 check_checksum(file_path, md5, sha1, sha256)
             return r
         except Exception:
             if file_path and os.path.exists(file_path):
-                os.remove(file_path)
+                if not os.path.exists(range_state_path(file_path)):
+                    os.remove(file_path)
+                elif self._output:
+                    self._output.warn("Download of '%s' interrupted, it will be resumed the next "
+                                      "time" % file_path)
             raise
 
-    def _download_file(self, url, auth, headers, file_path, try_resume=False):
+    def _download_file(self, url, auth, headers, file_path, try_resume=False, chunks_handler=None):
         t1 = time.time()
         if try_resume and file_path and os.path.exists(file_path):
             range_start = os.path.getsize(file_path)
@@ -90,6 +144,13 @@ class FileDownloader(object):
                 raise AuthenticationException()
             raise ConanException("Error %d downloading file %s" % (response.status_code, url))
 
+        if (not range_start and file_path and chunks_handler is None and self._ranges and
+                self._ranges > 1):
+            ranged = RangeDownloader(self._requester, self._output, self._verify_ssl, self._ranges)
+            if ranged.download(url, auth, headers, file_path, response):
+                log_download(url, time.time() - t1)
+                return None
+
         def read_response(size):
             for chunk in response.iter_content(size):
                 yield chunk
@@ -97,7 +158,17 @@ class FileDownloader(object):
         def write_chunks(chunks, path):
             ret = None
             downloaded_size = range_start
-            if path:
+            if chunks_handler is not None:
+                sizes = []
+
+                def counted_chunks():
+                    for chunk in chunks:
+                        sizes.append(len(chunk))
+                        yield chunk
+
+                chunks_handler(counted_chunks())
+                downloaded_size += sum(sizes)
+            elif path:
                 mkdir(os.path.dirname(path))
                 mode = "ab" if range_start else "wb"
                 with open(path, mode) as file_handler:
@@ -130,11 +201,16 @@ class FileDownloader(object):
             logger.debug("DOWNLOAD: %s" % url)
             total_length = get_total_length()
             action = "Downloading" if range_start == 0 else "Continuing download of"
-            description = "{} {}".format(action, os.path.basename(file_path)) if file_path else None
+            if file_path:
+                description = "{} {}".format(action, os.path.basename(file_path))
+            elif chunks_handler is not None:
+                description = chunks_handler.description
+            else:
+                description = None
             progress = progress_bar.Progress(total_length, self._output, description)
             progress.initial_value(range_start)
 
-            chunk_size = 1024 if not file_path else 1024 * 100
+            chunk_size = 1024 if not file_path and chunks_handler is None else 1024 * 100
             written_chunks, total_downloaded_size = write_chunks(
                 progress.update(read_response(chunk_size)),
                 file_path
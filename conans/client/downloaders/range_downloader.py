@@ -0,0 +1,175 @@
+import json
+import os
+import threading
+from multiprocessing.pool import ThreadPool
+
+from conans.client.rest import response_to_str
+from conans.errors import ConanException, NotFoundException, AuthenticationException, \
+    ForbiddenException, ConanConnectionError
+from conans.util import progress_bar
+from conans.util.files import mkdir, save
+from conans.util.log import logger
+
+# Files are split in ranges of at least this size, smaller files are downloaded in one request
+RANGE_MIN_SIZE = 8 * 1024 * 1024
+_CHUNK_SIZE = 1024 * 1024
+# The state file is saved every time a range downloads this amount of data
+_SAVE_STATE_SIZE = 16 * 1024 * 1024
+
+
+def range_state_path(file_path):
+    return file_path + ".ranges"
+
+
+def _check_response(response, url, auth):
+    if response.ok:
+        return
+    if response.status_code == 404:
+        raise NotFoundException("Not found: %s" % url)
+    elif response.status_code == 403:
+        if auth is None or (hasattr(auth, "token") and auth.token is None):
+            raise AuthenticationException(response_to_str(response))
+        raise ForbiddenException(response_to_str(response))
+    elif response.status_code == 401:
+        raise AuthenticationException()
+    raise ConanException("Error %d downloading file %s" % (response.status_code, url))
+
+
+class RangeDownloader(object):
+    """ Downloads a file fetching several byte ranges of it concurrently, written at their offsets
+    of the pre-allocated file. The progress of every range is saved in a sidecar state file, so
+    an interrupted transfer continues from there instead of starting again.
+    """
+
+    def __init__(self, requester, output, verify, ranges):
+        self._requester = requester
+        self._output = output
+        self._verify_ssl = verify
+        self._ranges = ranges
+        self._lock = threading.Lock()
+
+    def _get(self, url, auth, headers, range_header):
+        headers = headers.copy() if headers else {}
+        headers["range"] = range_header
+        try:
+            response = self._requester.get(url, stream=True, verify=self._verify_ssl, auth=auth,
+                                           headers=headers)
+        except Exception as exc:
+            raise ConanConnectionError("Error downloading file %s: '%s'" % (url, exc))
+        _check_response(response, url, auth)
+        return response
+
+    def download(self, url, auth, headers, file_path, response):
+        """ the response of the plain request of the url tells the size of the file, it is not
+        consumed, and False is returned, if the file is too small to be split or the server does
+        not support ranges. Otherwise it is closed and the file is downloaded in ranges
+        """
+        try:
+            total_size = int(response.headers.get("Content-Length"))
+        except (TypeError, ValueError):
+            return False
+        if (response.status_code != 200 or response.headers.get("Accept-Ranges") != "bytes"
+                or response.headers.get("Content-Encoding") or total_size < 2 * RANGE_MIN_SIZE):
+            return False
+        etag = response.headers.get("ETag")
+        response.close()
+
+        parts = self._load_state(file_path, total_size, etag)
+        if parts is None:
+            parts = self._new_parts(total_size)
+            mkdir(os.path.dirname(file_path))
+            with open(file_path, "wb") as f:
+                f.truncate(total_size)
+            self._save_state(file_path, total_size, etag, parts)
+
+        description = "Downloading {}".format(os.path.basename(file_path))
+        progress = progress_bar.Progress(total_size, self._output, description)
+        progress.initial_value(sum(part[2] - part[0] for part in parts))
+
+        def download_part(part):
+            self._download_part(url, auth, headers, file_path, part, progress,
+                                lambda: self._save_state(file_path, total_size, etag, parts))
+
+        pending = [part for part in parts if part[2] <= part[1]]
+        thread_pool = ThreadPool(max(1, min(self._ranges, len(pending))))
+        try:
+            thread_pool.map(download_part, pending)
+        finally:
+            thread_pool.close()
+            thread_pool.join()
+            self._save_state(file_path, total_size, etag, parts)
+        progress.pb_close()
+        os.remove(range_state_path(file_path))
+        return True
+
+    def _new_parts(self, total_size):
+        count = max(1, min(self._ranges, total_size // RANGE_MIN_SIZE))
+        part_size = total_size // count
+        parts = []
+        for i in range(count):
+            start = i * part_size
+            end = total_size - 1 if i == count - 1 else start + part_size - 1
+            parts.append([start, end, start])  # [first byte, last byte, next byte to download]
+        return parts
+
+    @staticmethod
+    def _load_state(file_path, total_size, etag):
+        state_path = range_state_path(file_path)
+        try:
+            if os.path.getsize(file_path) != total_size:
+                return None
+            with open(state_path) as f:
+                state = json.load(f)
+            if state["size"] != total_size or state["etag"] != etag:
+                return None
+            return state["parts"]
+        except (OSError, IOError, ValueError, KeyError, TypeError):
+            return None
+
+    def _save_state(self, file_path, total_size, etag, parts):
+        """ the parts threads call it concurrently, the file is written under the lock and
+        replaced atomically, so an interruption never leaves a truncated state
+        """
+        state_path = range_state_path(file_path)
+        tmp_path = state_path + ".tmp"
+        with self._lock:
+            save(tmp_path, json.dumps({"size": total_size, "etag": etag, "parts": parts}))
+            os.replace(tmp_path, state_path)
+
+    def _download_part(self, url, auth, headers, file_path, part, progress, save_state):
+        start, end, offset = part
+        response = self._get(url, auth, headers, "bytes={}-{}".format(offset, end))
+        try:
+            content_range = response.headers.get("Content-Range", "")
+            if response.status_code != 206 or not content_range.startswith(
+                    "bytes {}-{}/".format(offset, end)):
+                raise ConanException("Error in ranged download from %s\n"
+                                     "Incorrect Content-Range header %s" % (url, content_range))
+            unsaved = 0
+            with open(file_path, "r+b") as f:
+                f.seek(offset)
+                for chunk in response.iter_content(_CHUNK_SIZE):
+                    chunk = chunk[:end + 1 - offset]
+                    f.write(chunk)
+                    offset += len(chunk)
+                    unsaved += len(chunk)
+                    with self._lock:
+                        part[2] = offset
+                        progress.timed_update(len(chunk))
+                    if unsaved >= _SAVE_STATE_SIZE:
+                        f.flush()
+                        save_state()
+                        unsaved = 0
+                    if offset > end:
+                        break
+        except ConanException:
+            raise
+        except Exception as exc:
+            logger.debug("DOWNLOAD: range %s-%s of %s failed: %s" % (start, end, url, exc))
+            raise ConanConnectionError("Download failed, check server, possibly try again\n%s"
+                                       % str(exc))
+        finally:
+            response.close()
+        if offset <= end:
+            raise ConanConnectionError("Download failed, range %s-%s of %s interrupted at %s"
+                                       % (start, end, url, offset))
@@ -51,7 +51,10 @@ class BuildMode(object):
                 raise ConanException("--build=never not compatible with other options")
         self._unused_patterns = list(self.patterns) + self._excluded_patterns
 
-    def forced(self, conan_file, ref, with_deps_to_build=False):
+    def forced(self, conan_file, ref, with_deps_to_build=False, annotate=True):
+        """ annotate=False only checks it, without output and without marking the patterns
+        as used
+        """
         def pattern_match(pattern_):
             return (fnmatch.fnmatchcase(ref.name, pattern_) or
                     fnmatch.fnmatchcase(repr(ref.copy_clear_rev()), pattern_) or
@@ -59,11 +62,12 @@ class BuildMode(object):
 
         for pattern in self._excluded_patterns:
             if pattern_match(pattern):
-                try:
-                    self._unused_patterns.remove(pattern)
-                except ValueError:
-                    pass
-                conan_file.output.info("Excluded build from source")
+                if annotate:
+                    try:
+                        self._unused_patterns.remove(pattern)
+                    except ValueError:
+                        pass
+                    conan_file.output.info("Excluded build from source")
                 return False
 
         if conan_file.build_policy == "never":  # this package has been export-pkg
@@ -75,8 +79,9 @@ class BuildMode(object):
             return True
 
         if conan_file.build_policy_always:
-            conan_file.output.info("Building package from source as defined by "
-                                   "build_policy='always'")
+            if annotate:
+                conan_file.output.info("Building package from source as defined by "
+                                       "build_policy='always'")
             return True
 
         if self.cascade and with_deps_to_build:
@@ -85,10 +90,11 @@ class BuildMode(object):
         # Patterns to match, if package matches pattern, build is forced
         for pattern in self.patterns:
             if pattern_match(pattern):
-                try:
-                    self._unused_patterns.remove(pattern)
-                except ValueError:
-                    pass
+                if annotate:
+                    try:
+                        self._unused_patterns.remove(pattern)
+                    except ValueError:
+                        pass
                 return True
         return False
 
@@ -254,6 +254,8 @@ class DepsGraph(object):
         self.aliased = {}
         self.new_aliased = {}
         self._node_counter = initial_node_id if initial_node_id is not None else -1
+        # {direct: [[Node]]} levels of the whole graph, unsorted, computed by _order_levels()
+        self._levels = {}
 
     def add_node(self, node):
         if node.id is None:
@@ -262,12 +264,14 @@ class DepsGraph(object):
         if not self.nodes:
             self.root = node
         self.nodes.add(node)
+        self._levels = {}
 
     def add_edge(self, src, dst, require):
         assert src in self.nodes and dst in self.nodes
         edge = Edge(src, dst, require)
         src.add_edge(edge)
         dst.add_edge(edge)
+        self._levels = {}
 
     def ordered_iterate(self, nodes_subset=None):
         ordered = self.by_levels(nodes_subset)
@@ -276,16 +280,15 @@ class DepsGraph(object):
                 yield node
 
     def _inverse_closure(self, references):
-        closure = set()
         current = [n for n in self.nodes if str(n.ref) in references or "ALL" in references]
-        closure.update(current)
+        closure = set(current)
         while current:
-            new_current = set()
+            new_current = []
             for n in current:
-                closure.add(n)
-                new_neighs = n.inverse_neighbors()
-                to_add = set(new_neighs).difference(current)
-                new_current.update(to_add)
+                for neighbor in n.inverse_neighbors():
+                    if neighbor not in closure:
+                        closure.add(neighbor)
+                        new_current.append(neighbor)
             current = new_current
         return closure
 
@@ -339,10 +342,13 @@ class DepsGraph(object):
 
     def nodes_to_build(self):
         ret = []
+        added = set()
         for node in self.ordered_iterate():
             if node.binary == BINARY_BUILD:
-                if node.ref.copy_clear_rev() not in ret:
-                    ret.append(node.ref.copy_clear_rev())
+                ref = node.ref.copy_clear_rev()
+                if ref not in added:
+                    added.add(ref)
+                    ret.append(ref)
         return ret
 
     def by_levels(self, nodes_subset=None):
@@ -357,20 +363,47 @@ class DepsGraph(object):
         first level nodes, and so on
         return [[node1, node34], [node3], [node23, node8],...]
         """
-        result = []
-        opened = nodes_subset if nodes_subset is not None else self.nodes
-        while opened:
-            current_level = []
-            for o in opened:
-                o_neighs = o.neighbors() if direct else o.inverse_neighbors()
-                if not any(n in opened for n in o_neighs):
-                    current_level.append(o)
-
-            current_level.sort()
-            result.append(current_level)
-            # now initialize new level
-            opened = opened.difference(current_level)
+        if nodes_subset is not None:
+            levels = self._compute_levels(direct, nodes_subset)
+        else:
+            levels = self._levels.get(direct)
+            if levels is None:
+                levels = self._levels[direct] = self._compute_levels(direct, self.nodes)
+        # Sorted every time, the references, used to sort, can change
+        return [sorted(level) for level in levels]
 
+    @staticmethod
+    def _compute_levels(direct, nodes):
+        """ Kahn topological sort, by levels, of the nodes. The nodes of each level are
+        in the iteration order of the set, not sorted
+        """
+        pending = {}  # {node: number of neighbors without level yet}
+        dependants = {}  # {node: [nodes that have it as neighbor]}
+        for node in nodes:
+            neighbors = node.neighbors() if direct else node.inverse_neighbors()
+            neighbors = set(n for n in neighbors if n in nodes)
+            pending[node] = len(neighbors)
+            for neighbor in neighbors:
+                dependants.setdefault(neighbor, []).append(node)
+
+        node_levels = {}  # {node: level index}
+        current_level = [node for node, count in pending.items() if not count]
+        while current_level:
+            next_level = []
+            for node in current_level:
+                level = node_levels[node] = node_levels.get(node, 0)
+                for dependant in dependants.get(node, []):
+                    pending[dependant] -= 1
+                    if not pending[dependant]:
+                        node_levels[dependant] = level + 1
+                        next_level.append(dependant)
+            current_level = next_level
+
+        result = [[] for _ in range(max(node_levels.values()) + 1 if node_levels else 0)]
+        for node in nodes:
+            level = node_levels.get(node)
+            if level is not None:
+                result[level].append(node)
         return result
 
     def mark_private_skippable(self, nodes_subset=None, root=None):
@@ -380,17 +413,20 @@ class DepsGraph(object):
         root = root if root is not None else self.root
         nodes = nodes_subset if nodes_subset is not None else self.nodes
         current = [root]
+        public_nodes.add(root)
         while current:
-            new_current = set()
-            public_nodes.update(current)
+            new_current = []
             for n in current:
                 if n.binary in (BINARY_CACHE, BINARY_DOWNLOAD, BINARY_UPDATE, BINARY_SKIP):
                     # Might skip deps
                     to_add = [d.dst for d in n.dependencies if not d.private]
                 else:
                     # sure deps doesn't skip
-                    to_add = set(n.neighbors()).difference(public_nodes)
-                new_current.update(to_add)
+                    to_add = n.neighbors()
+                for dep in to_add:
+                    if dep not in public_nodes:
+                        public_nodes.add(dep)
+                        new_current.append(dep)
             current = new_current
 
         for node in nodes:
@@ -403,15 +439,16 @@ class DepsGraph(object):
         transitively). Nodes that are both in requires and build_requires will not be returned.
         This is used just for output purposes, printing deps, HTML graph, etc.
         """
-        public_nodes = set()
+        public_nodes = {self.root}
         current = [self.root]
         while current:
-            new_current = set()
-            public_nodes.update(current)
+            new_current = []
             for n in current:
                 # Might skip deps
-                to_add = [d.dst for d in n.dependencies if not d.build_require]
-                new_current.update(to_add)
+                for dep in n.dependencies:
+                    if not dep.build_require and dep.dst not in public_nodes:
+                        public_nodes.add(dep.dst)
+                        new_current.append(dep.dst)
             current = new_current
 
         return [n for n in self.nodes if n not in public_nodes]
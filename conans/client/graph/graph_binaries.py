@@ -1,3 +1,5 @@
+from multiprocessing.pool import ThreadPool
+
 from conans.client.graph.build_mode import BuildMode
 from conans.client.graph.compatibility import BinaryCompatibility
 from conans.client.graph.graph import (BINARY_BUILD, BINARY_CACHE, BINARY_DOWNLOAD, BINARY_MISSING,
@@ -5,7 +7,7 @@ from conans.client.graph.graph import (BINARY_BUILD, BINARY_CACHE, BINARY_DOWNLO
                                        RECIPE_CONSUMER, RECIPE_VIRTUAL, BINARY_SKIP, BINARY_UNKNOWN,
                                        BINARY_INVALID)
 from conans.errors import NoRemoteAvailable, NotFoundException, conanfile_exception_formatter, \
-    ConanException, ConanInvalidConfiguration
+    ConanException, ConanInvalidConfiguration, PackageNotFoundException
 from conans.model.info import ConanInfo, PACKAGE_ID_UNKNOWN, PACKAGE_ID_INVALID
 from conans.model.manifest import FileTreeManifest
 from conans.model.ref import PackageReference
@@ -20,6 +22,8 @@ class GraphBinariesAnalyzer(object):
         self._remote_manager = remote_manager
         # These are the nodes with pref (not including PREV) that have been evaluated
         self._evaluated = {}  # {pref: [nodes]}
+        # Results of the concurrent remote lookups, consumed by the nodes evaluation
+        self._remote_infos = {}  # {(pref, remote_name): (result, exception)}
         self._fixed_package_id = cache.config.full_transitive_package_id
         self._compatibility = BinaryCompatibility(self._cache)
 
@@ -34,9 +38,7 @@ class GraphBinariesAnalyzer(object):
                 output.warn("Current package is newer than remote upstream one")
 
     @staticmethod
-    def _evaluate_build(node, build_mode):
-        ref, conanfile = node.ref, node.conanfile
-        with_deps_to_build = False
+    def _with_deps_to_build(node, build_mode):
         # For cascade mode, we need to check also the "modified" status of the lockfile if exists
         # modified nodes have already been built, so they shouldn't be built again
         if build_mode.cascade and not (node.graph_lock_node and node.graph_lock_node.modified):
@@ -44,8 +46,12 @@ class GraphBinariesAnalyzer(object):
                 dep_node = dep.dst
                 if (dep_node.binary == BINARY_BUILD or
                     (dep_node.graph_lock_node and dep_node.graph_lock_node.modified)):
-                    with_deps_to_build = True
-                    break
+                    return True
+        return False
+
+    def _evaluate_build(self, node, build_mode):
+        ref, conanfile = node.ref, node.conanfile
+        with_deps_to_build = self._with_deps_to_build(node, build_mode)
         if build_mode.forced(conanfile, ref, with_deps_to_build):
             node.should_build = True
             conanfile.output.info('Forced build from source')
@@ -104,8 +110,129 @@ class GraphBinariesAnalyzer(object):
             assert node.prev, "PREV for %s is None: %s" % (str(pref), metadata.dumps())
 
     def _get_package_info(self, node, pref, remote):
+        prefetched = self._remote_infos.pop((pref, remote.name), None)
+        if prefetched is not None:
+            result, exc = prefetched
+            if exc is not None:
+                raise exc
+            return result
         return self._remote_manager.get_package_info(pref, remote, info=node.conanfile.info)
 
+    def _remote_candidates(self, node, pref, remotes):
+        """ the remotes, in order, in which _evaluate_remote_pkg() would look for the binary of
+        this node, or None if the binary will not be looked for in the remotes at all
+        """
+        if node.recipe == RECIPE_EDITABLE or pref.id == PACKAGE_ID_INVALID:
+            return None
+        package_layout = self._cache.package_layout(pref.ref,
+                                                    short_paths=node.conanfile.short_paths)
+        metadata = package_layout.load_metadata()
+        if package_layout.package_id_exists(pref.id) and pref.id in metadata.packages:
+            return None
+
+        remote = remotes.selected
+        if remote is not None:
+            return [remote]
+        if pref.id in metadata.packages:
+            remote_name = metadata.packages[pref.id].remote or metadata.recipe.remote
+        else:
+            remote_name = metadata.recipe.remote
+        remote = remotes.get(remote_name)
+        others = [r for r in remotes.values() if r != remote]
+        if not remote:
+            return others
+        # The other remotes are only checked if the binary is not in the recipe one with revisions
+        return [remote] + others if self._cache.config.revisions_enabled else [remote]
+
+    def _prefetch_remote_infos(self, nodes, build_mode, remotes, parallel):
+        """ checks in the remotes the binaries that the evaluation of these nodes would
+        otherwise request one by one. The remotes that support it are asked for all of them in
+        a single request, the others concurrently with a pool of "parallel" threads per remote,
+        if defined. The remotes are queried in waves, so no more requests than the sequential
+        evaluation are done: the following remote of a binary is only checked if it was not
+        found in the previous
+        """
+        if build_mode.all or not remotes:
+            return
+        pending = {}  # {pref: (node, [remotes])}
+        for node in nodes:
+            # The same check of _evaluate_build(), the forced builds are not looked for
+            if build_mode.forced(node.conanfile, node.ref,
+                                 self._with_deps_to_build(node, build_mode), annotate=False):
+                continue
+            locked = node.graph_lock_node
+            if locked and locked.package_id and locked.package_id != PACKAGE_ID_UNKNOWN:
+                pref = PackageReference(locked.ref, locked.package_id, locked.prev)
+            else:
+                pref = PackageReference(node.ref, node.package_id)
+            if pref in self._evaluated or pref in pending:
+                continue
+            candidates = self._remote_candidates(node, pref, remotes)
+            if candidates:
+                pending[pref] = node, candidates
+
+        def _get_info(args):
+            node_, pref_, remote_ = args
+            try:
+                result = self._remote_manager.get_package_info(pref_, remote_,
+                                                               info=node_.conanfile.info)
+            except Exception as e:
+                self._remote_infos[(pref_, remote_.name)] = None, e
+                return pref_, not isinstance(e, NotFoundException)
+            self._remote_infos[(pref_, remote_.name)] = result, None
+            return pref_, bool(result[0])
+
+        def _get_infos(remote_queries):
+            """ None if the remote cannot return all the binaries in one request """
+            remote_ = remote_queries[0][2]
+            prefs = [pref_ for _, pref_, _ in remote_queries]
+            if any(pref_.ref.revision is None for pref_ in prefs):
+                return None
+            try:
+                results = self._remote_manager.get_packages_info(prefs, remote_)
+            except Exception as e:
+                for pref_ in prefs:
+                    self._remote_infos[(pref_, remote_.name)] = None, e
+                return [(pref_, True) for pref_ in prefs]
+            if results is None:
+                return None
+            for pref_ in prefs:
+                result = results.get(pref_)
+                if result is None:
+                    error = PackageNotFoundException(pref_)
+                    self._remote_infos[(pref_, remote_.name)] = None, error
+                else:
+                    self._remote_infos[(pref_, remote_.name)] = result, None
+            return [(pref_, pref_ in results) for pref_ in prefs]
+
+        while pending:
+            queries = {}  # {remote_name: [(node, pref, remote)]}
+            for pref, (node, candidates) in pending.items():
+                remote = candidates.pop(0)
+                queries.setdefault(remote.name, []).append((node, pref, remote))
+            thread_pools = []
+            resolutions = []
+            for remote_queries in queries.values():
+                batch = _get_infos(remote_queries)
+                if batch is not None:
+                    resolutions.append(batch)
+                elif parallel:
+                    thread_pool = ThreadPool(min(parallel, len(remote_queries)))
+                    resolutions.append(thread_pool.map_async(_get_info, remote_queries))
+                    thread_pools.append(thread_pool)
+                else:  # Not prefetched, the evaluation will request them one by one
+                    for _, pref, _ in remote_queries:
+                        pending.pop(pref)
+            for thread_pool in thread_pools:
+                thread_pool.close()
+                thread_pool.join()
+            for resolution in resolutions:
+                if not isinstance(resolution, list):
+                    resolution = resolution.get()
+                for pref, resolved in resolution:
+                    if resolved or not pending[pref][1]:
+                        pending.pop(pref)
+
     def _evaluate_remote_pkg(self, node, pref, remote, remotes, remote_selected):
         remote_info = None
         # If the remote is pinned (remote_selected) we won't iterate the remotes.
@@ -431,32 +558,47 @@ class GraphBinariesAnalyzer(object):
         info = conanfile.info
         node.package_id = info.package_id()
 
+    def _compute_node_package_id(self, node, build_mode, default_package_id_mode,
+                                 default_python_requires_id_mode):
+        """ computes the package_id of the node, returns True if its binary has to be evaluated
+        """
+        self._propagate_options(node)
+
+        # Make sure that locked options match
+        if (node.graph_lock_node is not None and
+                node.graph_lock_node.options is not None and
+                node.conanfile.options.values != node.graph_lock_node.options):
+            raise ConanException("{}: Locked options do not match computed options\n"
+                                 "Locked options:\n{}\n"
+                                 "Computed options:\n{}".format(node.ref,
+                                                                node.graph_lock_node.options,
+                                                                node.conanfile.options.values))
+
+        self._compute_package_id(node, default_package_id_mode, default_python_requires_id_mode)
+        if node.recipe in (RECIPE_CONSUMER, RECIPE_VIRTUAL):
+            return False
+        if node.package_id == PACKAGE_ID_UNKNOWN:
+            assert node.binary is None, "Node.binary should be None"
+            node.binary = BINARY_UNKNOWN
+            # annotate pattern, so unused patterns in --build are not displayed as errors
+            build_mode.forced(node.conanfile, node.ref)
+            return False
+        return True
+
     def evaluate_graph(self, deps_graph, build_mode, update, remotes, nodes_subset=None, root=None):
         default_package_id_mode = self._cache.config.default_package_id_mode
         default_python_requires_id_mode = self._cache.config.default_python_requires_id_mode
-        for node in deps_graph.ordered_iterate(nodes_subset=nodes_subset):
-            self._propagate_options(node)
-
-            # Make sure that locked options match
-            if (node.graph_lock_node is not None and
-                    node.graph_lock_node.options is not None and
-                    node.conanfile.options.values != node.graph_lock_node.options):
-                raise ConanException("{}: Locked options do not match computed options\n"
-                                     "Locked options:\n{}\n"
-                                     "Computed options:\n{}".format(node.ref,
-                                                                    node.graph_lock_node.options,
-                                                                    node.conanfile.options.values))
-
-            self._compute_package_id(node, default_package_id_mode, default_python_requires_id_mode)
-            if node.recipe in (RECIPE_CONSUMER, RECIPE_VIRTUAL):
-                continue
-            if node.package_id == PACKAGE_ID_UNKNOWN:
-                assert node.binary is None, "Node.binary should be None"
-                node.binary = BINARY_UNKNOWN
-                # annotate pattern, so unused patterns in --build are not displayed as errors
-                build_mode.forced(node.conanfile, node.ref)
-                continue
-            self._evaluate_node(node, build_mode, update, remotes)
+        parallel = self._cache.config.parallel_download
+        # The package_ids of a level only depend on the previous levels, so all the binaries
+        # of a level can be checked in the remotes at once before evaluating its nodes
+        for level in deps_graph.by_levels(nodes_subset=nodes_subset):
+            level = [node for node in level
+                     if self._compute_node_package_id(node, build_mode, default_package_id_mode,
+                                                      default_python_requires_id_mode)]
+            self._prefetch_remote_infos(level, build_mode, remotes, parallel)
+            for node in level:
+                self._evaluate_node(node, build_mode, update, remotes)
+            self._remote_infos.clear()
         deps_graph.mark_private_skippable(nodes_subset=nodes_subset, root=root)
 
     def reevaluate_node(self, node, remotes, build_mode, update):
@@ -1,7 +1,8 @@
 import time
 
 from conans.client.conanfile.configure import run_configure_method
-from conans.client.graph.graph import DepsGraph, Node, RECIPE_EDITABLE, CONTEXT_HOST, CONTEXT_BUILD
+from conans.client.graph.graph import DepsGraph, Node, RECIPE_EDITABLE, CONTEXT_HOST, \
+    CONTEXT_BUILD, RECIPE_DOWNLOADED
 from conans.errors import (ConanException, ConanExceptionInUserConanfileMethod,
                            conanfile_exception_formatter, ConanInvalidConfiguration)
 from conans.model.conan_file import get_env_context_manager
@@ -175,6 +176,8 @@ class DepsGraphBuilder(object):
             try:
                 result = self._proxy.get_recipe(alias, check_updates, update, remotes, self._recorder)
                 conanfile_path, recipe_status, remote, new_ref = result
+                if recipe_status == RECIPE_DOWNLOADED:
+                    self._resolver.recipe_retrieved(new_ref)
             except ConanException as e:
                 raise e
 
@@ -425,6 +428,8 @@ class DepsGraphBuilder(object):
                                    % (requirement.ref, current_node.conanfile.display_name))
             raise e
         conanfile_path, recipe_status, remote, new_ref = result
+        if recipe_status == RECIPE_DOWNLOADED:
+            self._resolver.recipe_retrieved(new_ref)
 
         locked_id = requirement.locked_id
         lock_py_requires = graph_lock.python_requires(locked_id) if locked_id is not None else None
@@ -2,6 +2,7 @@ import os
 from collections import namedtuple
 from contextlib import contextmanager
 
+from conans.client.graph.graph import RECIPE_DOWNLOADED
 from conans.client.loader import parse_conanfile
 from conans.client.recorder.action_recorder import ActionRecorder
 from conans.errors import ConanException, NotFoundException
@@ -139,7 +140,9 @@ class PyRequireLoader(object):
     def _load_pyreq_conanfile(self, loader, lock_python_requires, ref):
         recipe = self._proxy.get_recipe(ref, self._check_updates, self._update,
                                         remotes=self._remotes, recorder=ActionRecorder())
-        path, _, _, new_ref = recipe
+        path, status, _, new_ref = recipe
+        if status == RECIPE_DOWNLOADED:
+            self._range_resolver.recipe_retrieved(new_ref)
         conanfile, module = loader.load_basic_module(path, lock_python_requires, user=new_ref.user,
                                                      channel=new_ref.channel)
         conanfile.name = new_ref.name
@@ -159,8 +162,9 @@ class PyRequireLoader(object):
 
 
 class ConanPythonRequire(object):
-    def __init__(self, proxy, range_resolver, generator_manager=None):
+    def __init__(self, proxy, range_resolver, generator_manager=None, bytecode_folder=None):
         self._generator_manager = generator_manager
+        self._bytecode_folder = bytecode_folder
         self._cached_requires = {}  # {reference: PythonRequire}
         self._proxy = proxy
         self._range_resolver = range_resolver
@@ -196,9 +200,12 @@ class ConanPythonRequire(object):
             result = self._proxy.get_recipe(ref, self._check_updates, self._update,
                                             remotes=self._remotes,
                                             recorder=ActionRecorder())
-            path, _, _, new_ref = result
+            path, status, _, new_ref = result
+            if status == RECIPE_DOWNLOADED:
+                self._range_resolver.recipe_retrieved(new_ref)
             module, conanfile = parse_conanfile(conanfile_path=path, python_requires=self,
-                                                generator_manager=self._generator_manager)
+                                                generator_manager=self._generator_manager,
+                                                bytecode_folder=self._bytecode_folder)
 
             # Check for alias
             if getattr(conanfile, "alias", None):
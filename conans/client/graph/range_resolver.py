@@ -1,4 +1,5 @@
 import re
+from functools import cmp_to_key
 
 from conans.errors import ConanException
 from conans.model.ref import ConanFileReference
@@ -51,12 +52,29 @@ def _parse_versionexpr(versionexpr, result):
     return version_range, loose, include_prerelease
 
 
-def satisfying(list_versions, versionexpr, result):
+def _sorted_candidates(list_versions, loose, result):
+    """ returns the (SemVer, version) of the valid versions, sorted from the highest one
+    """
+    from semver import SemVer
+    candidates = []
+    for v in list_versions:
+        try:
+            candidates.append((SemVer(v, loose=loose), v))
+        except (ValueError, AttributeError):
+            result.append("WARN: Version '%s' is not semver, cannot be compared with a range"
+                          % str(v))
+    # Stable sort, equal versions keep their original order
+    candidates.sort(key=cmp_to_key(lambda a, b: a[0].compare(b[0])), reverse=True)
+    return candidates
+
+
+def satisfying(list_versions, versionexpr, result, parsed=None):
     """ returns the maximum version that satisfies the expression
     if some version cannot be converted to loose SemVer, it is discarded with a msg
     This provides some workaround for failing comparisons like "2.1" not matching "<=2.1"
+    The optional parsed dict keeps the sorted versions between calls for the same list_versions
     """
-    from semver import SemVer, Range, max_satisfying
+    from semver import Range
     version_range, loose, include_prerelease = _parse_versionexpr(versionexpr, result)
 
     # Check version range expression
@@ -66,19 +84,21 @@ def satisfying(list_versions, versionexpr, result):
         raise ConanException("version range expression '%s' is not valid" % version_range)
 
     # Validate all versions
-    candidates = {}
-    for v in list_versions:
-        try:
-            ver = SemVer(v, loose=loose)
-            candidates[ver] = v
-        except (ValueError, AttributeError):
-            result.append("WARN: Version '%s' is not semver, cannot be compared with a range"
-                          % str(v))
-
-    # Search best matching version in range
-    result = max_satisfying(candidates, act_range, loose=loose,
-                            include_prerelease=include_prerelease)
-    return candidates.get(result)
+    if parsed is None or loose not in parsed:
+        warnings = []
+        candidates = _sorted_candidates(list_versions, loose, warnings)
+        if parsed is not None:
+            parsed[loose] = candidates, warnings
+    else:
+        candidates, warnings = parsed[loose]
+    for warning in warnings:
+        result.append(warning)
+
+    # Search best matching version in range, the first one as they are sorted
+    for ver, v in candidates:
+        if act_range.test(ver, include_prerelease=include_prerelease):
+            return v
+    return None
 
 
 class RangeResolver(object):
@@ -87,6 +107,8 @@ class RangeResolver(object):
         self._cache = cache
         self._remote_manager = remote_manager
         self._cached_remote_found = {}
+        # {(name, user, channel): ({version: ref}, parsed versions)} of the local cache
+        self._local_found = {}
         self._result = []
 
     @property
@@ -119,7 +141,8 @@ class RangeResolver(object):
         search_ref = ConanFileReference(ref.name, "*", ref.user, ref.channel)
 
         if update:
-            resolved_ref, remote_name = self._resolve_remote(search_ref, version_range, remotes)
+            resolved_ref, remote_name = self._resolve_remote(search_ref, version_range, remotes,
+                                                             update)
             if not resolved_ref:
                 remote_name = None
                 resolved_ref = self._resolve_local(search_ref, version_range)
@@ -127,7 +150,8 @@ class RangeResolver(object):
             remote_name = None
             resolved_ref = self._resolve_local(search_ref, version_range)
             if not resolved_ref:
-                resolved_ref, remote_name = self._resolve_remote(search_ref, version_range, remotes)
+                resolved_ref, remote_name = self._resolve_remote(search_ref, version_range,
+                                                                 remotes, update)
 
         origin = ("remote '%s'" % remote_name) if remote_name else "local cache"
         if resolved_ref:
@@ -139,31 +163,59 @@ class RangeResolver(object):
                                  "could not be resolved in %s"
                                  % (version_range, require, base_conanref, origin))
 
+    def recipe_retrieved(self, ref):
+        """ the recipe was downloaded to the local cache, that has to be searched again to
+        resolve the ranges of the same name, user and channel
+        """
+        self._local_found.pop((ref.name, ref.user, ref.channel), None)
+
     def _resolve_local(self, search_ref, version_range):
-        local_found = search_recipes(self._cache, search_ref)
-        local_found = [ref for ref in local_found
-                       if ref.user == search_ref.user and
-                       ref.channel == search_ref.channel]
-        if local_found:
-            return self._resolve_version(version_range, local_found)
-
-    def _search_remotes(self, search_ref, remotes):
+        key = search_ref.name, search_ref.user, search_ref.channel
+        local_found = self._local_found.get(key)
+        if local_found is None:
+            refs = search_recipes(self._cache, search_ref)
+            refs = [ref for ref in refs
+                    if ref.user == search_ref.user and ref.channel == search_ref.channel]
+            local_found = {ref.version: ref for ref in refs}, {}
+            self._local_found[key] = local_found
+        versions, parsed = local_found
+        if versions:
+            result = satisfying(versions, version_range, self._result, parsed)
+            return versions.get(result)
+
+    def _search_remote(self, remote, pattern, update):
+        """ the references found in the remote, reusing the stored result of a previous search
+        if it is still valid and there is no update
+        """
+        ttl = self._cache.config.version_ranges_remote_ttl
+        if not ttl:
+            return self._remote_manager.search_recipes(remote, pattern, ignorecase=False)
+
+        if not update:
+            refs = self._cache.index.remote_listing(remote, pattern, ttl.total_seconds())
+            if refs is not None:
+                return [ConanFileReference.loads(r) for r in refs]
+        result = self._remote_manager.search_recipes(remote, pattern, ignorecase=False)
+        self._cache.index.store_remote_listing(remote, pattern, [repr(r) for r in result])
+        return result
+
+    def _search_remotes(self, search_ref, remotes, update):
         pattern = str(search_ref)
         for remote in remotes.values():
             if not remotes.selected or remote == remotes.selected:
-                result = self._remote_manager.search_recipes(remote, pattern, ignorecase=False)
+                result = self._search_remote(remote, pattern, update)
                 result = [ref for ref in result
                           if ref.user == search_ref.user and ref.channel == search_ref.channel]
                 if result:
                     return result, remote.name
         return None, None
 
-    def _resolve_remote(self, search_ref, version_range, remotes):
+    def _resolve_remote(self, search_ref, version_range, remotes, update):
         # We should use ignorecase=False, we want the exact case!
         found_refs, remote_name = self._cached_remote_found.get(search_ref, (None, None))
         if found_refs is None:
             # Searching for just the name is much faster in remotes like Artifactory
-            found_refs, remote_name = self._search_remotes(search_ref, remotes)
+            found_refs, remote_name = self._search_remotes(search_ref, remotes, update)
             if found_refs:
                 self._result.append("%s versions found in '%s' remote" % (search_ref, remote_name))
             else:
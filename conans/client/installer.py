@@ -2,6 +2,7 @@ import os
 import shutil
 import textwrap
 import time
+from collections import OrderedDict
 from multiprocessing.pool import ThreadPool
 
 from conans.client import tools
@@ -437,37 +438,87 @@ class BinaryInstaller(object):
         processed_package_refs = {}
         self._download(downloads, processed_package_refs)
 
+        def _install_node(node):
+            self._install_node(node, keep_build, processed_package_refs, profile_host,
+                               profile_build, graph_lock, remotes, build_mode, update,
+                               using_build_profile)
+
+        parallel = self._cache.config.parallel_sources_retrieval
+        if parallel is not None and parallel > 1 and not keep_build:
+            self._retrieve_exports_sources(nodes_by_level, remotes, parallel)
         for level in nodes_by_level:
             for node in level:
-                ref, conan_file = node.ref, node.conanfile
-                output = conan_file.output
-
-                self._propagate_info(node, using_build_profile)
-                if node.binary == BINARY_EDITABLE:
-                    self._handle_node_editable(node, profile_host, profile_build, graph_lock)
-                    # Need a temporary package revision for package_revision_mode
-                    # Cannot be PREV_UNKNOWN otherwise the consumers can't compute their packageID
-                    node.prev = "editable"
-                else:
-                    if node.binary == BINARY_SKIP:  # Privates not necessary
-                        continue
-                    assert ref.revision is not None, "Installer should receive RREV always"
-                    if node.binary == BINARY_UNKNOWN:
-                        self._binaries_analyzer.reevaluate_node(node, remotes, build_mode, update)
-                        if node.binary == BINARY_MISSING:
-                            self._raise_missing([node])
-                    if node.binary == BINARY_EDITABLE:
-                        self._handle_node_editable(node, profile_host, profile_build, graph_lock)
-                        # Need a temporary package revision for package_revision_mode
-                        # Cannot be PREV_UNKNOWN otherwise the consumers can't compute their packageID
-                        node.prev = "editable"
-                    else:
-                        _handle_system_requirements(conan_file, node.pref, self._cache, output)
-                        self._handle_node_cache(node, keep_build, processed_package_refs, remotes)
+                _install_node(node)
 
         # Finally, propagate information to root node (ref=None)
         self._propagate_info(root_node, using_build_profile)
 
+    def _retrieve_exports_sources(self, nodes_by_level, remotes, parallel):
+        """ The builds run one after the other, as they change the current directory and the
+        environment of the process, but the exports_sources of the recipes to build can be
+        downloaded in parallel before. Errors are ignored here, they will be raised by the build
+        of the node, as without the parallel retrieval
+        """
+        conanfiles = OrderedDict()  # {ref: conanfile}
+        for level in nodes_by_level:
+            for node in level:
+                if node.binary != BINARY_BUILD:
+                    continue
+                conanfiles.setdefault(node.ref, node.conanfile)
+                python_requires = getattr(node.conanfile, "python_requires", None)
+                if python_requires and isinstance(python_requires, dict):  # Legacy
+                    for python_require in python_requires.values():
+                        conanfiles.setdefault(python_require.ref, python_require.conanfile)
+        if not conanfiles:
+            return
+
+        def _retrieve(item):
+            ref, conanfile = item
+            layout = self._cache.package_layout(ref, conanfile.short_paths)
+            try:
+                with layout.conanfile_write_lock(self._out):
+                    retrieve_exports_sources(self._remote_manager, self._cache, conanfile, ref,
+                                             remotes)
+            except Exception as e:
+                logger.debug("Retrieving exports_sources of %s failed: %s" % (repr(ref), str(e)))
+
+        self._out.info("Retrieving the sources of the packages to build in %s parallel threads"
+                       % parallel)
+        thread_pool = ThreadPool(parallel)
+        try:
+            thread_pool.map(_retrieve, list(conanfiles.items()))
+        finally:
+            thread_pool.close()
+            thread_pool.join()
+
+    def _install_node(self, node, keep_build, processed_package_refs, profile_host, profile_build,
+                      graph_lock, remotes, build_mode, update, using_build_profile):
+        ref, conan_file = node.ref, node.conanfile
+        output = conan_file.output
+
+        self._propagate_info(node, using_build_profile)
+        if node.binary == BINARY_EDITABLE:
+            self._handle_node_editable(node, profile_host, profile_build, graph_lock)
+            # Need a temporary package revision for package_revision_mode
+            # Cannot be PREV_UNKNOWN otherwise the consumers can't compute their packageID
+            node.prev = "editable"
+        else:
+            if node.binary == BINARY_SKIP:  # Privates not necessary
+                return
+            assert ref.revision is not None, "Installer should receive RREV always"
+            if node.binary == BINARY_UNKNOWN:
+                self._binaries_analyzer.reevaluate_node(node, remotes, build_mode, update)
+                if node.binary == BINARY_MISSING:
+                    self._raise_missing([node])
+            if node.binary == BINARY_EDITABLE:
+                self._handle_node_editable(node, profile_host, profile_build, graph_lock)
+                # Need a temporary package revision for package_revision_mode
+                # Cannot be PREV_UNKNOWN otherwise the consumers can't compute their packageID
+                node.prev = "editable"
+            else:
+                _handle_system_requirements(conan_file, node.pref, self._cache, output)
+                self._handle_node_cache(node, keep_build, processed_package_refs, remotes)
+
     def _handle_node_editable(self, node, profile_host, profile_build, graph_lock):
         # Get source of information
         conanfile = node.conanfile
@@ -557,6 +608,7 @@ class BinaryInstaller(object):
                     layout.package_remove(pref)
                     with layout.set_dirty_context_manager(pref):
                         pref = self._build_package(node, output, keep_build, remotes)
+                    self._cache.update_index(pref.ref)
                     assert node.prev, "Node PREV shouldn't be empty"
                     assert node.pref.revision, "Node PREF revision shouldn't be empty"
                     assert pref.revision is not None, "PREV for %s to be built is None" % str(pref)
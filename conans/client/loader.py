@@ -1,6 +1,10 @@
 import fnmatch
+import hashlib
 import imp
+import importlib.machinery
+import importlib.util
 import inspect
+import marshal
 import os
 import re
 import sys
@@ -25,13 +29,13 @@ from conans.model.options import OptionsValues
 from conans.model.ref import ConanFileReference
 from conans.model.settings import Settings
 from conans.paths import DATA_YML
-from conans.util.files import load
+from conans.util.files import load, mkdir
 
 
 class ConanFileLoader(object):
 
     def __init__(self, runner, output, python_requires, generator_manager=None, pyreq_loader=None,
-                 requester=None):
+                 requester=None, bytecode_folder=None):
         self._runner = runner
         self._generator_manager = generator_manager
         self._output = output
@@ -40,6 +44,7 @@ class ConanFileLoader(object):
         sys.modules["conans"].python_requires = python_requires
         self._cached_conanfile_classes = {}
         self._requester = requester
+        self._bytecode_folder = bytecode_folder
 
     def load_basic(self, conanfile_path, lock_python_requires=None, user=None, channel=None,
                    display=""):
@@ -66,7 +71,7 @@ class ConanFileLoader(object):
         try:
             self._python_requires.valid = True
             module, conanfile = parse_conanfile(conanfile_path, self._python_requires,
-                                                self._generator_manager)
+                                                self._generator_manager, self._bytecode_folder)
             self._python_requires.valid = False
 
             self._python_requires.locked_versions = None
@@ -110,7 +115,7 @@ class ConanFileLoader(object):
             to the provided generator list
             @param conanfile_module: the module to be processed
             """
-        conanfile_module, module_id = _parse_conanfile(conanfile_path)
+        conanfile_module, module_id = _parse_conanfile(conanfile_path, self._bytecode_folder)
         for name, attr in conanfile_module.__dict__.items():
             if (name.startswith("_") or not inspect.isclass(attr) or
                     attr.__dict__.get("__module__") != module_id):
@@ -408,9 +413,9 @@ def _parse_module(conanfile_module, module_id, generator_manager):
     return result
 
 
-def parse_conanfile(conanfile_path, python_requires, generator_manager):
+def parse_conanfile(conanfile_path, python_requires, generator_manager, bytecode_folder=None):
     with python_requires.capture_requires() as py_requires:
-        module, filename = _parse_conanfile(conanfile_path)
+        module, filename = _parse_conanfile(conanfile_path, bytecode_folder)
         try:
             conanfile = _parse_module(module, filename, generator_manager)
 
@@ -432,7 +437,61 @@ def parse_conanfile(conanfile_path, python_requires, generator_manager):
             raise ConanException("%s: %s" % (conanfile_path, str(e)))
 
 
-def _parse_conanfile(conan_file_path):
+class _CachedSourceLoader(importlib.machinery.SourceFileLoader):
+    """ Loader of the recipes that stores their compiled code in the bytecode folder of the cache,
+    one entry per path of the recipe and tag of the interpreter, so loading the same recipe again
+    skips the compilation. The entry keeps the hash of the source, a changed recipe replaces the
+    entry of its path instead of adding a new one, and the folder can be removed at any moment.
+    """
+
+    def __init__(self, fullname, path, bytecode_folder):
+        super(_CachedSourceLoader, self).__init__(fullname, path)
+        self._bytecode_folder = bytecode_folder
+
+    def get_code(self, fullname):
+        source = self.get_data(self.path)
+        source_hash = hashlib.sha1(source).digest()
+        header = importlib.util.MAGIC_NUMBER + source_hash
+        path_hash = hashlib.sha1(self.path.encode("utf-8")).hexdigest()
+        bytecode_path = os.path.join(self._bytecode_folder, "%s.%s.pyc"
+                                     % (path_hash, sys.implementation.cache_tag))
+        try:
+            with open(bytecode_path, "rb") as f:
+                data = f.read()
+            if data.startswith(header):
+                return marshal.loads(data[len(header):])
+        except (IOError, OSError, EOFError, ValueError, TypeError):
+            pass
+
+        code = self.source_to_code(source, self.path)
+        try:
+            mkdir(self._bytecode_folder)
+            tmp_path = "%s.%s.tmp" % (bytecode_path, uuid.uuid4().hex)
+            with open(tmp_path, "wb") as f:
+                f.write(header + marshal.dumps(code))
+            os.replace(tmp_path, bytecode_path)
+        except (IOError, OSError):
+            pass  # The cache is just an optimization
+        return code
+
+
+def _load_source(module_id, path, bytecode_folder):
+    """ same as imp.load_source(), using the bytecode folder if defined """
+    if not bytecode_folder:
+        return imp.load_source(module_id, path)
+    loader = _CachedSourceLoader(module_id, path, bytecode_folder)
+    spec = importlib.util.spec_from_file_location(module_id, path, loader=loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_id] = module
+    try:
+        loader.exec_module(module)
+    except BaseException:
+        sys.modules.pop(module_id, None)
+        raise
+    return module
+
+
+def _parse_conanfile(conan_file_path, bytecode_folder=None):
     """ From a given path, obtain the in memory python import module
     """
 
@@ -449,7 +508,7 @@ def _parse_conanfile(conan_file_path):
             try:
                 sys.dont_write_bytecode = True
                 # FIXME: imp is deprecated in favour of implib
-                loaded = imp.load_source(module_id, conan_file_path)
+                loaded = _load_source(module_id, conan_file_path, bytecode_folder)
                 sys.dont_write_bytecode = old_dont_write_bytecode
             except ImportError:
                 version_txt = _get_required_conan_version_without_loading(conan_file_path)
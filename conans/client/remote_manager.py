@@ -1,3 +1,4 @@
+import hashlib
 import os
 import shutil
 import time
@@ -10,11 +11,13 @@ from conans.client.cache.remote_registry import Remote
 from conans.errors import ConanConnectionError, ConanException, NotFoundException, \
     NoRestV2Available, PackageNotFoundException
 from conans.model.info import ConanInfo
-from conans.paths import EXPORT_SOURCES_TGZ_NAME, EXPORT_TGZ_NAME, PACKAGE_TGZ_NAME, rm_conandir
+from conans.paths import EXPORT_SOURCES_TGZ_NAME, EXPORT_TGZ_NAME, PACKAGE_TGZ_NAME, rm_conandir, \
+    compressed_file_names
 from conans.search.search import filter_packages
 from conans.util import progress_bar
 from conans.util.env_reader import get_env
-from conans.util.files import make_read_only, mkdir, tar_extract, touch_folder, md5sum, sha1sum
+from conans.util.files import make_read_only, mkdir, rmdir, touch_folder, file_checksums, \
+    compressed_tar_extract
 from conans.util.log import logger
 # FIXME: Eventually, when all output is done, tracer functions should be moved to the recorder class
 from conans.util.tracer import (log_package_download,
@@ -64,16 +67,20 @@ class RemoteManager(object):
         assert pref.revision, "get_package_snapshot requires PREV"
         return self._call_remote(remote, "get_package_snapshot", pref)
 
-    def upload_recipe(self, ref, files_to_upload, deleted, remote, retry, retry_wait):
+    def upload_recipe(self, ref, files_to_upload, deleted, remote, retry, retry_wait,
+                      checksums=None):
         assert ref.revision, "upload_recipe requires RREV"
         self._call_remote(remote, "upload_recipe", ref, files_to_upload, deleted,
-                          retry, retry_wait)
+                          retry, retry_wait, checksums=checksums)
+        # The stored searches of the remote to resolve version ranges are outdated
+        self._cache.index.forget_remote_listings(remote)
 
-    def upload_package(self, pref, files_to_upload, deleted, remote, retry, retry_wait):
+    def upload_package(self, pref, files_to_upload, deleted, remote, retry, retry_wait,
+                       checksums=None):
         assert pref.ref.revision, "upload_package requires RREV"
         assert pref.revision, "upload_package requires PREV"
         self._call_remote(remote, "upload_package", pref,
-                          files_to_upload, deleted, retry, retry_wait)
+                          files_to_upload, deleted, retry, retry_wait, checksums=checksums)
 
     def get_recipe_manifest(self, ref, remote):
         ref = self._resolve_latest_ref(ref, remote)
@@ -91,6 +98,13 @@ class RemoteManager(object):
         # FIXME Conan 2.0: With revisions, it is not needed to pass headers to this second function
         return self._call_remote(remote, "get_package_info", pref, headers=headers), pref
 
+    def get_packages_info(self, prefs, remote):
+        """ Read the ConanInfo of many packages from the remote in a single request, returns
+        {pref: (ConanInfo, pref with PREV)} of the ones found, or None if the remote does not
+        support it
+        """
+        return self._call_remote(remote, "get_packages_info", prefs)
+
     def get_recipe(self, ref, remote):
         """
         Read the conans from remotes
@@ -113,8 +127,8 @@ class RemoteManager(object):
         recipe_checksums = calc_files_checksum(zipped_files)
 
         export_folder = package_layout.export()
-        tgz_file = zipped_files.pop(EXPORT_TGZ_NAME, None)
-        check_compressed_files(EXPORT_TGZ_NAME, zipped_files)
+        tgz_name = check_compressed_files(EXPORT_TGZ_NAME, zipped_files)
+        tgz_file = zipped_files.pop(tgz_name, None)
         if tgz_file:
             uncompress_file(tgz_file, export_folder, output=self._output)
         mkdir(export_folder)
@@ -133,6 +147,7 @@ class RemoteManager(object):
 
         self._hook_manager.execute("post_download_recipe", conanfile_path=conanfile_path,
                                    reference=ref, remote=remote)
+        self._cache.update_index(ref)
 
         return ref
 
@@ -150,8 +165,8 @@ class RemoteManager(object):
         duration = time.time() - t1
         log_recipe_sources_download(ref, duration, remote.name, zipped_files)
 
-        tgz_file = zipped_files[EXPORT_SOURCES_TGZ_NAME]
-        check_compressed_files(EXPORT_SOURCES_TGZ_NAME, zipped_files)
+        tgz_name = check_compressed_files(EXPORT_SOURCES_TGZ_NAME, zipped_files)
+        tgz_file = zipped_files[tgz_name]
         uncompress_file(tgz_file, export_sources_folder, output=self._output)
         touch_folder(export_sources_folder)
 
@@ -181,11 +196,22 @@ class RemoteManager(object):
                 raise PackageNotFoundException(pref)
 
             download_pkg_folder = layout.download_package(pref)
+            package_folder = layout.package(pref)
+            tgz_handler = None
+            if self._cache.config.streaming_extract:
+                # The tgz is extracted and hashed while it is downloaded, in a single pass
+                tgz_folder = None
+                if self._cache.config.keep_package_tgz:
+                    tgz_folder = download_pkg_folder
+                tgz_handler = StreamingTgzExtractor(package_folder, tgz_folder)
             # Download files to the pkg_tgz folder, not to the final one
-            zipped_files = self._call_remote(remote, "get_package", pref, download_pkg_folder)
+            zipped_files = self._call_remote(remote, "get_package", pref, download_pkg_folder,
+                                             tgz_handler=tgz_handler)
 
             # Compute and update the package metadata
             package_checksums = calc_files_checksum(zipped_files)
+            if tgz_handler is not None and tgz_handler.checksums is not None:
+                package_checksums[tgz_handler.tgz_name] = tgz_handler.checksums
             with layout.update_metadata() as metadata:
                 metadata.packages[pref.id].revision = pref.revision
                 metadata.packages[pref.id].recipe_revision = pref.ref.revision
@@ -195,9 +221,8 @@ class RemoteManager(object):
             duration = time.time() - t1
             log_package_download(pref, duration, remote, zipped_files)
 
-            tgz_file = zipped_files.pop(PACKAGE_TGZ_NAME, None)
-            check_compressed_files(PACKAGE_TGZ_NAME, zipped_files)
-            package_folder = layout.package(pref)
+            tgz_name = check_compressed_files(PACKAGE_TGZ_NAME, zipped_files)
+            tgz_file = zipped_files.pop(tgz_name, None)
             if tgz_file:  # This must happen always, but just in case
                 # TODO: The output could be changed to the package one, but
                 uncompress_file(tgz_file, package_folder, output=self._output)
@@ -209,6 +234,7 @@ class RemoteManager(object):
             touch_folder(package_folder)
             if get_env("CONAN_READ_ONLY_CACHE", False):
                 make_read_only(package_folder)
+            self._cache.update_index(pref.ref)
             recorder.package_downloaded(pref, remote.url)
             output.success('Package installed %s' % pref.id)
             output.info("Downloaded package revision %s" % pref.revision)
@@ -237,7 +263,9 @@ class RemoteManager(object):
         return packages
 
     def remove_recipe(self, ref, remote):
-        return self._call_remote(remote, "remove_recipe", ref)
+        result = self._call_remote(remote, "remove_recipe", ref)
+        self._cache.index.forget_remote_listings(remote)
+        return result
 
     def remove_packages(self, ref, remove_ids, remote):
         return self._call_remote(remote, "remove_packages", ref, remove_ids)
@@ -303,8 +331,7 @@ class RemoteManager(object):
 
 
 def calc_files_checksum(files):
-    return {file_name: {"md5": md5sum(path), "sha1": sha1sum(path)}
-            for file_name, path in files.items()}
+    return {file_name: file_checksums(path, ("md5", "sha1")) for file_name, path in files.items()}
 
 
 def is_package_snapshot_complete(snapshot):
@@ -315,13 +342,112 @@ def is_package_snapshot_complete(snapshot):
 
 
 def check_compressed_files(tgz_name, files):
+    """ returns the name of the tgz_name artifact in files, in any of the supported compression
+    formats (the preferred one if there are several), or None if there is no such artifact
+    """
     bare_name = os.path.splitext(tgz_name)[0]
+    supported_names = compressed_file_names(tgz_name)
     for f in files:
-        if f == tgz_name:
+        if f in supported_names:
             continue
         if bare_name == os.path.splitext(f)[0]:
             raise ConanException("This Conan version is not prepared to handle '%s' file format. "
                                  "Please upgrade conan client." % f)
+    return next((f for f in supported_names if f in files), None)
+
+
+class _ChunksReader(object):
+    """ Minimal read-only file object over an iterator of chunks, so they can be consumed by
+    tarfile in stream mode. Every chunk is also passed to the consumers when it is read
+    """
+    def __init__(self, chunks, consumers):
+        self._chunks = iter(chunks)
+        self._consumers = consumers
+        self._chunk = b""
+        self._pos = 0
+
+    def _next_chunk(self):
+        for chunk in self._chunks:
+            if chunk:
+                for consumer in self._consumers:
+                    consumer(chunk)
+                self._chunk, self._pos = chunk, 0
+                return True
+        return False
+
+    def read(self, size=-1):
+        parts = []
+        while size != 0:
+            if self._pos >= len(self._chunk) and not self._next_chunk():
+                break
+            end = len(self._chunk) if size < 0 else min(len(self._chunk), self._pos + size)
+            parts.append(self._chunk[self._pos:end])
+            if size > 0:
+                size -= end - self._pos
+            self._pos = end
+        return b"".join(parts)
+
+    def drain(self):
+        """ consume the remaining chunks, for example the padding after the end of the tar
+        """
+        self._pos = len(self._chunk)
+        while self._next_chunk():
+            self._pos = len(self._chunk)
+
+
+class StreamingTgzExtractor(object):
+    """ Chunks handler for the FileDownloader that extracts a tgz file while it is being
+    downloaded, computing its md5 and sha1 checksums in the same pass. The tgz file is also
+    saved to tgz_folder if defined
+    """
+    def __init__(self, dest_folder, tgz_folder=None):
+        self._dest_folder = dest_folder
+        self._tgz_folder = tgz_folder
+        self.tgz_name = PACKAGE_TGZ_NAME
+        self.checksums = None
+
+    def for_file(self, tgz_name):
+        """ the name of the downloaded file defines its compression format
+        """
+        self.tgz_name = tgz_name
+        return self
+
+    @property
+    def description(self):
+        return "Downloading %s" % self.tgz_name
+
+    def __call__(self, chunks):
+        # A retried download will call again, start from scratch
+        self.checksums = None
+        rmdir(self._dest_folder)
+        md5, sha1 = hashlib.md5(), hashlib.sha1()
+        consumers = [md5.update, sha1.update]
+        tgz_handle = None
+        tgz_path = self.tgz_name
+        if self._tgz_folder:
+            mkdir(self._tgz_folder)
+            tgz_path = os.path.join(self._tgz_folder, self.tgz_name)
+            tgz_handle = open(tgz_path, "wb")
+            consumers.append(tgz_handle.write)
+        try:
+            reader = _ChunksReader(chunks, consumers)
+            t1 = time.time()
+            compressed_tar_extract(self.tgz_name, reader, self._dest_folder, stream=True)
+            # The checksums of the download are checked when the chunks are exhausted
+            reader.drain()
+            log_uncompressed_file(tgz_path, time.time() - t1, self._dest_folder)
+        except BaseException:
+            # Nothing of a corrupted or interrupted download is left behind
+            rmdir(self._dest_folder)
+            if tgz_handle is not None:
+                tgz_handle.close()
+                tgz_handle = None
+                os.remove(tgz_path)
+            raise
+        finally:
+            if tgz_handle is not None:
+                tgz_handle.close()
+        self.checksums = {"md5": md5.hexdigest(), "sha1": sha1.hexdigest()}
 
 
 def uncompress_file(src_path, dest_folder, output):
@@ -330,7 +456,7 @@ def uncompress_file(src_path, dest_folder, output):
         with progress_bar.open_binary(src_path, output,
                                       "Decompressing %s" % os.path.basename(src_path)) \
                 as file_handler:
-            tar_extract(file_handler, dest_folder)
+            compressed_tar_extract(src_path, file_handler, dest_folder)
     except Exception as e:
         error_msg = "Error while extracting downloaded file '%s' to %s\n%s\n"\
                     % (src_path, dest_folder, str(e))
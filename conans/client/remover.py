@@ -125,6 +125,8 @@ class ConanRemover(object):
 
         if not src and build_ids is None and package_ids is None:
             remover.remove(package_layout, output=self._user_io.out)
+            self._cache.index.forget(package_layout.base_folder())
+        self._cache.update_index(ref)
 
     def remove(self, pattern, remote_name, src=None, build_ids=None, package_ids_filter=None,
                force=False, packages_query=None, outdated=False):
@@ -192,7 +194,8 @@ class ConanRemover(object):
                 if remote_name:
                     packages = self._remote_manager.search_packages(remote, ref, packages_query)
                 else:
-                    packages = search_packages(package_layout, packages_query)
+                    packages = search_packages(package_layout, packages_query,
+                                               cache_index=self._cache.index)
                 if outdated:
                     if remote_name:
                         manifest, ref = self._remote_manager.get_recipe_manifest(ref, remote)
@@ -27,10 +27,12 @@ class ConanApiAuthManager(object):
         self._user_io = user_io
         self._rest_client_factory = rest_client_factory
         self._localdb = localdb
+        # {remote_url: (user, token, refresh_token)}, updated when they are stored in the localdb
+        self._logins = {}
 
     def call_rest_api_method(self, remote, method_name, *args, **kwargs):
         """Handles AuthenticationException and request user to input a user and a password"""
-        user, token, refresh_token = self._localdb.get_login(remote.url)
+        user, token, refresh_token = self._get_login(remote)
         rest_client = self._get_rest_client(remote)
 
         if method_name == "authenticate":
@@ -83,8 +85,15 @@ class ConanApiAuthManager(object):
 
         raise AuthenticationException("Too many failed login attempts, bye!")
 
+    def _get_login(self, remote):
+        login = self._logins.get(remote.url)
+        if login is None:
+            login = self._localdb.get_login(remote.url)
+            self._logins[remote.url] = login
+        return login
+
     def _get_rest_client(self, remote):
-        username, token, refresh_token = self._localdb.get_login(remote.url)
+        username, token, refresh_token = self._get_login(remote)
         custom_headers = {'X-Client-Anonymous-Id': self._get_mac_digest(),
                           'X-Client-Id': str(username or "")}
         return self._rest_client_factory.new(remote, token, refresh_token, custom_headers)
@@ -95,6 +104,7 @@ class ConanApiAuthManager(object):
         except Exception as e:
             self._user_io.out.error('Your credentials could not be stored in local cache\n')
             self._user_io.out.debug(str(e) + '\n')
+        self._logins.pop(remote.url, None)
 
     @staticmethod
     def _get_mac_digest():
@@ -105,7 +115,7 @@ class ConanApiAuthManager(object):
     def _authenticate(self, remote, user, password):
         rest_client = self._get_rest_client(remote)
         if user is None:  # The user is already in DB, just need the password
-            prev_user = self._localdb.get_username(remote.url)
+            prev_user = self._get_login(remote)[0]
             if prev_user is None:
                 raise ConanException("User for remote '%s' is not defined" % remote.name)
             else:
@@ -118,4 +128,5 @@ class ConanApiAuthManager(object):
         # Store result in DB
         remote_name, prev_user, user = update_localdb(self._localdb, user, token, refresh_token,
                                                       remote)
+        self._logins.pop(remote.url, None)
         return remote_name, prev_user, user
@@ -220,6 +220,10 @@ class ClientV2Router(ClientCommonRouter):
         assert ref.revision is None, "for_recipe_latest shouldn't receive RREV"
         return self.base_url + _format_ref(self.routes.recipe_latest, ref)
 
+    def packages_info(self):
+        """Get the revisions and conaninfo.txt of many packages"""
+        return self.base_url + self.routes.packages_info
+
     def _for_package_file(self, pref, path, matrix_params):
         """url for getting a file from a package, with revisions"""
         assert pref.ref.revision is not None, "_for_package_file needs RREV"
@@ -1,3 +1,4 @@
+import base64
 import fnmatch
 import logging
 import os
@@ -7,9 +8,13 @@ import warnings
 
 import urllib3
 import requests
-from requests.adapters import HTTPAdapter
+from requests.adapters import HTTPAdapter, DEFAULT_POOLSIZE
+from requests.sessions import merge_setting
+from requests.utils import get_auth_from_url
+from six.moves.urllib.parse import urlparse
 
 from conans import __version__ as client_version
+from conans.client.tools.oss import cpu_count
 from conans.util.files import save
 from conans.util.tracer import log_client_rest_api_call
 
@@ -19,18 +24,42 @@ from conans.util.tracer import log_client_rest_api_call
 logging.captureWarnings(True)
 
 
-class ConanRequester(object):
+class _ConanSession(requests.Session):
+    """ Session that can ignore the proxies defined in the environment (http_proxy, no_proxy...)
+    so only the proxies passed to every request are used, without modifying os.environ, that
+    would be a race condition with the requests of other threads
+    """
+    ignore_environment_proxies = False
+
+    def merge_environment_settings(self, url, proxies, stream, verify, cert):
+        if not self.ignore_environment_proxies:
+            return super(_ConanSession, self).merge_environment_settings(url, proxies, stream,
+                                                                         verify, cert)
+        # The environment proxies are only merged if some proxies are given. Old requests
+        # versions fail with None proxies, the environment ones added to {} are discarded
+        settings = super(_ConanSession, self).merge_environment_settings(url, {}, stream,
+                                                                         verify, cert)
+        settings["proxies"] = merge_setting(proxies, self.proxies)
+        return settings
+
+    def rebuild_proxies(self, prepared_request, proxies):
+        if not self.ignore_environment_proxies:
+            return super(_ConanSession, self).rebuild_proxies(prepared_request, proxies)
+        new_proxies = proxies.copy() if proxies is not None else {}
+        headers = prepared_request.headers
+        if "Proxy-Authorization" in headers:
+            del headers["Proxy-Authorization"]
+        scheme = urlparse(prepared_request.url).scheme
+        username, password = get_auth_from_url(new_proxies.get(scheme, ""))
+        if not scheme.startswith("https") and username and password:
+            credentials = ("%s:%s" % (username, password)).encode("latin1")
+            headers["Proxy-Authorization"] = "Basic %s" % base64.b64encode(credentials).decode()
+        return new_proxies
 
-    def __init__(self, config, http_requester=None):
-        if http_requester:
-            self._http_requester = http_requester
-        else:
-            self._http_requester = requests.Session()
-            adapter = HTTPAdapter(max_retries=self._get_retries(config.retry))
 
-            self._http_requester.mount("http://", adapter)
-            self._http_requester.mount("https://", adapter)
+class ConanRequester(object):
 
+    def __init__(self, config, http_requester=None):
         self._timeout_seconds = config.request_timeout
         self.proxies = config.proxies or {}
         self._cacert_path = config.cacert_path
@@ -48,6 +77,20 @@ class ConanRequester(object):
                           " Use proxies.no_proxy_match instead")
             os.environ["NO_PROXY"] = no_proxy
 
+        if http_requester:
+            self._http_requester = http_requester
+        else:
+            self._http_requester = _ConanSession()
+            # The conan.conf proxies replace the environment ones
+            self._http_requester.ignore_environment_proxies = bool(self.proxies or
+                                                                   self._no_proxy_match)
+            pool_size = self._get_pool_size(config)
+            adapter = HTTPAdapter(max_retries=self._get_retries(config.retry),
+                                  pool_connections=pool_size, pool_maxsize=pool_size)
+
+            self._http_requester.mount("http://", adapter)
+            self._http_requester.mount("https://", adapter)
+
         if not os.path.exists(self._cacert_path):
             from conans.client.rest.cacert import cacert
             save(self._cacert_path, cacert)
@@ -63,6 +106,15 @@ class ConanRequester(object):
             else:
                 self._client_certificates = self._client_cert_path
 
+    @staticmethod
+    def _get_pool_size(config):
+        """ Enough connections to every remote for all the parallel downloads and uploads, so
+        they are kept alive and reused instead of discarded when the pool is full
+        """
+        transfers = config.parallel_file_transfers or 1
+        return max((config.parallel_download or 1) * transfers, cpu_count() * transfers,
+                   DEFAULT_POOLSIZE)
+
     def _get_retries(self, retry):
         retry = retry if retry is not None else 2
         if retry == 0:
@@ -127,21 +179,9 @@ class ConanRequester(object):
         return self._call_method("post", url, **kwargs)
 
     def _call_method(self, method, url, **kwargs):
-        popped = False
-        if self.proxies or self._no_proxy_match:
-            old_env = dict(os.environ)
-            # Clean the proxies from the environ and use the conan specified proxies
-            for var_name in ("http_proxy", "https_proxy", "ftp_proxy", "all_proxy", "no_proxy"):
-                popped = True if os.environ.pop(var_name, None) else popped
-                popped = True if os.environ.pop(var_name.upper(), None) else popped
-        try:
-            t1 = time.time()
-            all_kwargs = self._add_kwargs(url, kwargs)
-            tmp = getattr(self._http_requester, method)(url, **all_kwargs)
-            duration = time.time() - t1
-            log_client_rest_api_call(url, method.upper(), duration, all_kwargs.get("headers"))
-            return tmp
-        finally:
-            if popped:
-                os.environ.clear()
-                os.environ.update(old_env)
+        t1 = time.time()
+        all_kwargs = self._add_kwargs(url, kwargs)
+        tmp = getattr(self._http_requester, method)(url, **all_kwargs)
+        duration = time.time() - t1
+        log_client_rest_api_call(url, method.upper(), duration, all_kwargs.get("headers"))
+        return tmp
@@ -9,6 +9,10 @@ from conans.errors import AuthenticationException, ConanException, \
 from conans.util import progress_bar
 from conans.util.files import sha1sum
 
+# Files are sent in large blocks, so the generators and the progress updates do not dominate the
+# upload of big packages
+_UPLOAD_BLOCK_SIZE = 1024 * 1024
+
 
 class FileUploader(object):
 
@@ -49,7 +53,9 @@ class FileUploader(object):
             return response
 
     def upload(self, url, abs_path, auth=None, dedup=False, retry=None, retry_wait=None,
-               headers=None, display_name=None):
+               headers=None, display_name=None, sha1=None):
+        """ sha1: the already computed checksum of the file, if known, to avoid hashing it again
+        """
         retry = retry if retry is not None else self._config.retry
         retry = retry if retry is not None else 1
         retry_wait = retry_wait if retry_wait is not None else self._config.retry_wait
@@ -57,7 +63,7 @@ class FileUploader(object):
 
         # Send always the header with the Sha1
         headers = copy(headers) or {}
-        headers["X-Checksum-Sha1"] = sha1sum(abs_path)
+        headers["X-Checksum-Sha1"] = sha1 or sha1sum(abs_path)
         if dedup:
             response = self._dedup(url, headers, auth)
             if response:
@@ -87,14 +93,14 @@ class FileUploader(object):
 
         def load_in_chunks(_file):
             """Lazy function (generator) to read a file piece by piece.
-            Default chunk size: 1k."""
+            Default chunk size: 1MB."""
             while True:
-                chunk = _file.read(1024)
+                chunk = _file.read(_UPLOAD_BLOCK_SIZE)
                 if not chunk:
                     break
                 yield chunk
 
-        with open(abs_path, mode='rb') as file_handler:
+        with open(abs_path, mode='rb', buffering=0) as file_handler:
             progress = progress_bar.Progress(file_size, self._output, description, post_description)
             data = progress.update(load_in_chunks(file_handler))
             iterable_to_file = IterableToFileAdapter(data, file_size)
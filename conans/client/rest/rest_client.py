@@ -1,4 +1,5 @@
-from conans import CHECKSUM_DEPLOY, REVISIONS, ONLY_V2, OAUTH_TOKEN, MATRIX_PARAMS
+from conans import CHECKSUM_DEPLOY, REVISIONS, ONLY_V2, OAUTH_TOKEN, MATRIX_PARAMS, \
+    PACKAGES_INFO
 from conans.client.rest.rest_client_v1 import RestV1Methods
 from conans.client.rest.rest_client_v2 import RestV2Methods
 from conans.errors import OnlyV2Available, AuthenticationException
@@ -8,19 +9,31 @@ from conans.util.log import logger
 
 class RestApiClientFactory(object):
 
-    def __init__(self, output, requester, config, artifacts_properties=None):
+    def __init__(self, output, requester, config, artifacts_properties=None, cache_index=None):
         self._output = output
         self._requester = requester
         self._config = config
         self._artifacts_properties = artifacts_properties
+        self._cache_index = cache_index
         self._cached_capabilities = {}
+        self._clients = {}
 
     def new(self, remote, token, refresh_token, custom_headers):
-        tmp = RestApiClient(remote, token, refresh_token, custom_headers,
-                            self._output, self._requester, self._config,
-                            self._cached_capabilities,
-                            self._artifacts_properties)
-        return tmp
+        """ The client of every remote is created once and reused by all the calls with the same
+        credentials. The clients are never modified, as they can be in use by other threads, new
+        credentials create a new client
+        """
+        key = remote.url, remote.verify_ssl
+        credentials = token, refresh_token, sorted(custom_headers.items())
+        cached = self._clients.get(key)
+        if cached is not None and cached[0] == credentials:
+            return cached[1]
+        client = RestApiClient(remote, token, refresh_token, custom_headers,
+                               self._output, self._requester, self._config,
+                               self._cached_capabilities,
+                               self._artifacts_properties, self._cache_index)
+        self._clients[key] = credentials, client
+        return client
 
 
 class RestApiClient(object):
@@ -29,7 +42,7 @@ class RestApiClient(object):
     """
 
     def __init__(self, remote, token, refresh_token, custom_headers, output, requester,
-                 config, cached_capabilities, artifacts_properties=None):
+                 config, cached_capabilities, artifacts_properties=None, cache_index=None):
 
         # Set to instance
         self._token = token
@@ -43,17 +56,31 @@ class RestApiClient(object):
         self._artifacts_properties = artifacts_properties
         self._revisions_enabled = config.revisions_enabled
         self._config = config
+        self._cache_index = cache_index
 
         # This dict is shared for all the instances of RestApiClient
         self._cached_capabilities = cached_capabilities
+        self._api = None
+
+    def _capabilities_ttl(self):
+        if self._cache_index is None:
+            return None
+        ttl = self._config.remote_capabilities_ttl
+        return ttl.total_seconds() if ttl else None
 
     def _capable(self, capability, user=None, password=None):
         capabilities = self._cached_capabilities.get(self._remote_url)
         if capabilities is None:
-            tmp = RestV1Methods(self._remote_url, self._token, self._custom_headers, self._output,
-                                self._requester, self._config, self._verify_ssl,
-                                self._artifacts_properties)
-            capabilities = tmp.server_capabilities(user, password)
+            ttl = self._capabilities_ttl()
+            if ttl:
+                capabilities = self._cache_index.remote_capabilities(self._remote_url, ttl)
+            if capabilities is None:
+                tmp = RestV1Methods(self._remote_url, self._token, self._custom_headers,
+                                    self._output, self._requester, self._config,
+                                    self._verify_ssl, self._artifacts_properties)
+                capabilities = tmp.server_capabilities(user, password)
+                if ttl:
+                    self._cache_index.store_remote_capabilities(self._remote_url, capabilities)
             self._cached_capabilities[self._remote_url] = capabilities
             logger.debug("REST: Cached capabilities for the remote: %s" % capabilities)
             if not self._revisions_enabled and ONLY_V2 in capabilities:
@@ -61,6 +88,11 @@ class RestApiClient(object):
         return capability in capabilities
 
     def _get_api(self):
+        if self._api is None:
+            self._api = self._new_api()
+        return self._api
+
+    def _new_api(self):
         revisions = self._capable(REVISIONS)
         matrix_params = self._capable(MATRIX_PARAMS)
         if self._revisions_enabled and revisions:
@@ -82,6 +114,13 @@ class RestApiClient(object):
     def get_package_info(self, pref, headers):
         return self._get_api().get_package_info(pref, headers=headers)
 
+    def get_packages_info(self, prefs):
+        """ None if the remote cannot return the info of many packages in one request """
+        api = self._get_api()
+        if not isinstance(api, RestV2Methods) or not self._capable(PACKAGES_INFO):
+            return None
+        return api.get_packages_info(prefs)
+
     def get_recipe(self, ref, dest_folder):
         return self._get_api().get_recipe(ref, dest_folder)
 
@@ -91,8 +130,8 @@ class RestApiClient(object):
     def get_recipe_sources(self, ref, dest_folder):
         return self._get_api().get_recipe_sources(ref, dest_folder)
 
-    def get_package(self, pref, dest_folder):
-        return self._get_api().get_package(pref, dest_folder)
+    def get_package(self, pref, dest_folder, tgz_handler=None):
+        return self._get_api().get_package(pref, dest_folder, tgz_handler=tgz_handler)
 
     def get_package_snapshot(self, ref):
         return self._get_api().get_package_snapshot(ref)
@@ -103,11 +142,13 @@ class RestApiClient(object):
     def get_package_path(self, pref, path):
         return self._get_api().get_package_path(pref, path)
 
-    def upload_recipe(self, ref, files_to_upload, deleted, retry, retry_wait):
-        return self._get_api().upload_recipe(ref, files_to_upload, deleted, retry, retry_wait)
+    def upload_recipe(self, ref, files_to_upload, deleted, retry, retry_wait, checksums=None):
+        return self._get_api().upload_recipe(ref, files_to_upload, deleted, retry, retry_wait,
+                                             checksums)
 
-    def upload_package(self, pref, files_to_upload, deleted, retry, retry_wait):
-        return self._get_api().upload_package(pref, files_to_upload, deleted, retry, retry_wait)
+    def upload_package(self, pref, files_to_upload, deleted, retry, retry_wait, checksums=None):
+        return self._get_api().upload_package(pref, files_to_upload, deleted, retry, retry_wait,
+                                              checksums)
 
     def authenticate(self, user, password):
         api_v1 = RestV1Methods(self._remote_url, self._token, self._custom_headers, self._output,
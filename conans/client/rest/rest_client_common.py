@@ -208,9 +208,11 @@ class RestCommonMethods(object):
             raise ConanException("Unexpected server response %s" % result)
         return result
 
-    def upload_recipe(self, ref, files_to_upload, deleted, retry, retry_wait):
+    def upload_recipe(self, ref, files_to_upload, deleted, retry, retry_wait, checksums=None):
+        """ checksums: {filename: {"sha1": ...}} of the files, if they were already computed
+        """
         if files_to_upload:
-            self._upload_recipe(ref, files_to_upload, retry, retry_wait)
+            self._upload_recipe(ref, files_to_upload, retry, retry_wait, checksums)
         if deleted:
             self._remove_conanfile_files(ref, deleted)
 
@@ -228,9 +230,9 @@ class RestCommonMethods(object):
         snap = self._get_snapshot(url)
         return snap
 
-    def upload_package(self, pref, files_to_upload, deleted, retry, retry_wait):
+    def upload_package(self, pref, files_to_upload, deleted, retry, retry_wait, checksums=None):
         if files_to_upload:
-            self._upload_package(pref, files_to_upload, retry, retry_wait)
+            self._upload_package(pref, files_to_upload, retry, retry_wait, checksums)
         if deleted:
             raise Exception("This shouldn't be happening, deleted files "
                             "in local package present in remote: %s.\n Please, report it at "
@@ -49,6 +49,7 @@ class RestV1Methods(RestCommonMethods):
         retry = self._config.retry
         retry_wait = self._config.retry_wait
         download_cache = self._config.download_cache
+        max_size = self._config.download_cache_max_size if download_cache else None
         for filename, resource_url in sorted(file_urls.items(), reverse=True):
             auth, _ = self._file_server_capabilities(resource_url)
             md5 = snapshot_md5.get(filename, None) if snapshot_md5 else None
@@ -56,6 +57,7 @@ class RestV1Methods(RestCommonMethods):
                 "if download_cache is set, we need the file checksums"
             contents = run_downloader(self.requester, None, self.verify_ssl, retry=retry,
                                       retry_wait=retry_wait, download_cache=download_cache,
+                                      download_cache_max_size=max_size,
                                       url=resource_url, auth=auth, md5=md5)
             yield os.path.normpath(filename), contents
 
@@ -129,7 +131,7 @@ class RestV1Methods(RestCommonMethods):
         urls = self.get_json(url, data=data, headers=headers)
         return {filepath: complete_url(self.remote_url, url) for filepath, url in urls.items()}
 
-    def _upload_recipe(self, ref, files_to_upload, retry, retry_wait):
+    def _upload_recipe(self, ref, files_to_upload, retry, retry_wait, checksums=None):
         # Get the upload urls and then upload files
         url = self.router.recipe_upload_urls(ref)
         file_sizes = {filename.replace("\\", "/"): os.stat(abs_path).st_size
@@ -138,9 +140,9 @@ class RestV1Methods(RestCommonMethods):
         if self._matrix_params:
             urls = self.router.add_matrix_params(urls)
         self._upload_files(urls, files_to_upload, self._output, retry, retry_wait,
-                           display_name=str(ref))
+                           display_name=str(ref), checksums=checksums)
 
-    def _upload_package(self, pref, files_to_upload, retry, retry_wait):
+    def _upload_package(self, pref, files_to_upload, retry, retry_wait, checksums=None):
         # Get the upload urls and then upload files
         url = self.router.package_upload_urls(pref)
         file_sizes = {filename: os.stat(abs_path).st_size for filename,
@@ -152,9 +154,10 @@ class RestV1Methods(RestCommonMethods):
         logger.debug("Requesting upload urls...Done!")
         short_pref_name = "%s:%s" % (pref.ref, pref.id[0:4])
         self._upload_files(urls, files_to_upload, self._output, retry, retry_wait,
-                           display_name=short_pref_name)
+                           display_name=short_pref_name, checksums=checksums)
 
-    def _upload_files(self, file_urls, files, output, retry, retry_wait, display_name=None):
+    def _upload_files(self, file_urls, files, output, retry, retry_wait, display_name=None,
+                      checksums=None):
         t1 = time.time()
         failed = []
         uploader = FileUploader(self.requester, output, self.verify_ssl, self._config)
@@ -168,9 +171,10 @@ class RestV1Methods(RestCommonMethods):
             auth, dedup = self._file_server_capabilities(resource_url)
             try:
                 headers = self._artifacts_properties if not self._matrix_params else {}
+                sha1 = (checksums or {}).get(filename, {}).get("sha1")
                 uploader.upload(resource_url, files[filename], auth=auth, dedup=dedup,
                                 retry=retry, retry_wait=retry_wait,
-                                headers=headers, display_name=display_name)
+                                headers=headers, display_name=display_name, sha1=sha1)
             except Exception as exc:
                 output.error("\nError uploading file: %s, '%s'" % (filename, exc))
                 failed.append(filename)
@@ -181,9 +185,11 @@ class RestV1Methods(RestCommonMethods):
         else:
             logger.debug("UPLOAD: \nAll uploaded! Total time: %s\n" % str(time.time() - t1))
 
-    def _download_files_to_folder(self, file_urls, to_folder, snapshot_md5):
+    def _download_files_to_folder(self, file_urls, to_folder, snapshot_md5, handlers=None):
         """
         :param: file_urls is a dict with {filename: abs_path}
+        :param: handlers is a dict with {filename: chunks_handler}, those files are streamed to
+        the handler instead of being saved to disk
 
         It writes downloaded files to disk (appending to file, only keeps chunks in memory)
         """
@@ -193,36 +199,43 @@ class RestV1Methods(RestCommonMethods):
         retry = self._config.retry
         retry_wait = self._config.retry_wait
         download_cache = self._config.download_cache
+        max_size = self._config.download_cache_max_size if download_cache else None
+        handlers = handlers or {}
         for filename, resource_url in sorted(file_urls.items(), reverse=True):
             if self._output and not self._output.is_terminal:
                 self._output.writeln("Downloading %s" % filename)
             auth, _ = self._file_server_capabilities(resource_url)
-            abs_path = os.path.join(to_folder, filename)
+            handler = handlers.get(filename)
+            abs_path = os.path.join(to_folder, filename) if handler is None else None
             md5 = snapshot_md5.get(filename, None) if snapshot_md5 else None
             assert not download_cache or snapshot_md5, \
                 "if download_cache is set, we need the file checksums"
             run_downloader(self.requester, self._output, self.verify_ssl, retry=retry,
                            retry_wait=retry_wait, download_cache=download_cache,
-                           url=resource_url, file_path=abs_path, auth=auth, md5=md5)
-            ret[filename] = abs_path
+                           download_cache_max_size=max_size,
+                           download_ranges=self._config.download_ranges,
+                           url=resource_url, file_path=abs_path, auth=auth, md5=md5,
+                           chunks_handler=handler)
+            if handler is None:
+                ret[filename] = abs_path
         return ret
 
     def get_recipe(self, ref, dest_folder):
         urls = self._get_recipe_urls(ref)
-        urls.pop(EXPORT_SOURCES_TGZ_NAME, None)
-        accepted_files = ["conanfile.py", "conan_export.tgz", "conanmanifest.txt"]
-        urls = {f: url for f, url in urls.items() if any(f.startswith(m) for m in accepted_files)}
-        check_compressed_files(EXPORT_TGZ_NAME, urls)
+        tgz_name = check_compressed_files(EXPORT_TGZ_NAME, urls)
+        accepted_files = ["conanfile.py", "conanmanifest.txt"]
+        urls = {f: url for f, url in urls.items()
+                if f == tgz_name or any(f.startswith(m) for m in accepted_files)}
         md5s = self.get_recipe_snapshot(ref) if self._config.download_cache else None
         zipped_files = self._download_files_to_folder(urls, dest_folder, md5s)
         return zipped_files
 
     def get_recipe_sources(self, ref, dest_folder):
         urls = self._get_recipe_urls(ref)
-        check_compressed_files(EXPORT_SOURCES_TGZ_NAME, urls)
-        if EXPORT_SOURCES_TGZ_NAME not in urls:
+        tgz_name = check_compressed_files(EXPORT_SOURCES_TGZ_NAME, urls)
+        if tgz_name is None:
             return None
-        urls = {EXPORT_SOURCES_TGZ_NAME: urls[EXPORT_SOURCES_TGZ_NAME]}
+        urls = {tgz_name: urls[tgz_name]}
         md5s = self.get_recipe_snapshot(ref) if self._config.download_cache else None
         zipped_files = self._download_files_to_folder(urls, dest_folder, md5s)
         return zipped_files
@@ -234,13 +247,18 @@ class RestV1Methods(RestCommonMethods):
         urls = self._get_file_to_url_dict(url)
         return urls
 
-    def get_package(self, pref, dest_folder):
+    def get_package(self, pref, dest_folder, tgz_handler=None):
         urls = self._get_package_urls(pref)
-        accepted_files = ["conaninfo.txt", "conan_package.tgz", "conanmanifest.txt"]
-        urls = {f: url for f, url in urls.items() if any(f.startswith(m) for m in accepted_files)}
-        check_compressed_files(PACKAGE_TGZ_NAME, urls)
-        md5s = self.get_package_snapshot(pref) if self._config.download_cache else None
-        zipped_files = self._download_files_to_folder(urls, dest_folder, md5s)
+        tgz_name = check_compressed_files(PACKAGE_TGZ_NAME, urls)
+        accepted_files = ["conaninfo.txt", "conanmanifest.txt"]
+        urls = {f: url for f, url in urls.items()
+                if f == tgz_name or any(f.startswith(m) for m in accepted_files)}
+        handlers = None
+        if tgz_handler is not None and tgz_name is not None:
+            handlers = {tgz_name: tgz_handler.for_file(tgz_name)}
+        # The streamed files are checked against their md5 while they are extracted
+        md5s = self.get_package_snapshot(pref) if self._config.download_cache or handlers else None
+        zipped_files = self._download_files_to_folder(urls, dest_folder, md5s, handlers)
         return zipped_files
 
     def _get_package_urls(self, pref):
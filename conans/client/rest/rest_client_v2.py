@@ -1,6 +1,7 @@
 import os
 import time
 import traceback
+from multiprocessing.pool import ThreadPool
 
 from conans import DEFAULT_REVISION_V1
 from conans.client.downloaders.download import run_downloader
@@ -13,11 +14,33 @@ from conans.errors import ConanException, NotFoundException, PackageNotFoundExce
 from conans.model.info import ConanInfo
 from conans.model.manifest import FileTreeManifest
 from conans.model.ref import PackageReference
-from conans.paths import EXPORT_SOURCES_TGZ_NAME, EXPORT_TGZ_NAME, PACKAGE_TGZ_NAME
+from conans.paths import CONAN_MANIFEST, EXPORT_SOURCES_TGZ_NAME, EXPORT_TGZ_NAME, \
+    PACKAGE_TGZ_NAME, compressed_file_names
 from conans.util.files import decode_text
 from conans.util.log import logger
 
 
+_COMPRESSED_NAMES = set(compressed_file_names(EXPORT_TGZ_NAME) +
+                        compressed_file_names(EXPORT_SOURCES_TGZ_NAME) +
+                        compressed_file_names(PACKAGE_TGZ_NAME))
+
+
+def _run_parallel(function, items, parallel):
+    """ calls function(item) for all the items, with at most parallel threads. The first error
+    is raised after all of them have finished
+    """
+    if len(items) < 2:
+        for item in items:
+            function(item)
+        return
+    thread_pool = ThreadPool(min(parallel, len(items)))
+    try:
+        thread_pool.map(function, items)
+    finally:
+        thread_pool.close()
+        thread_pool.join()
+
+
 class RestV2Methods(RestCommonMethods):
 
     def __init__(self, remote_url, token, custom_headers, output, requester, config, verify_ssl,
@@ -43,8 +66,10 @@ class RestV2Methods(RestCommonMethods):
         retry = self._config.retry
         retry_wait = self._config.retry_wait
         download_cache = False if not use_cache else self._config.download_cache
+        max_size = self._config.download_cache_max_size if download_cache else None
         contents = run_downloader(self.requester, None, self.verify_ssl, retry=retry,
                                   retry_wait=retry_wait, download_cache=download_cache, url=url,
+                                  download_cache_max_size=max_size,
                                   auth=self.auth, headers=headers)
         return contents
 
@@ -88,9 +113,9 @@ class RestV2Methods(RestCommonMethods):
         url = self.router.recipe_snapshot(ref)
         data = self._get_file_list_json(url)
         files = data["files"]
-        check_compressed_files(EXPORT_TGZ_NAME, files)
-        accepted_files = ["conanfile.py", "conan_export.tgz", "conanmanifest.txt"]
-        files = [f for f in files if any(f.startswith(m) for m in accepted_files)]
+        tgz_name = check_compressed_files(EXPORT_TGZ_NAME, files)
+        accepted_files = ["conanfile.py", "conanmanifest.txt"]
+        files = [f for f in files if f == tgz_name or any(f.startswith(m) for m in accepted_files)]
 
         # If we didn't indicated reference, server got the latest, use absolute now, it's safer
         urls = {fn: self.router.recipe_file(ref, fn) for fn in files}
@@ -106,10 +131,10 @@ class RestV2Methods(RestCommonMethods):
         url = self.router.recipe_snapshot(ref)
         data = self._get_file_list_json(url)
         files = data["files"]
-        check_compressed_files(EXPORT_SOURCES_TGZ_NAME, files)
-        if EXPORT_SOURCES_TGZ_NAME not in files:
+        tgz_name = check_compressed_files(EXPORT_SOURCES_TGZ_NAME, files)
+        if tgz_name is None:
             return None
-        files = [EXPORT_SOURCES_TGZ_NAME, ]
+        files = [tgz_name, ]
 
         # If we didn't indicated reference, server got the latest, use absolute now, it's safer
         urls = {fn: self.router.recipe_file(ref, fn) for fn in files}
@@ -118,18 +143,22 @@ class RestV2Methods(RestCommonMethods):
         ret = {fn: os.path.join(dest_folder, fn) for fn in files}
         return ret
 
-    def get_package(self, pref, dest_folder):
+    def get_package(self, pref, dest_folder, tgz_handler=None):
         url = self.router.package_snapshot(pref)
         data = self._get_file_list_json(url)
         files = data["files"]
-        accepted_files = ["conaninfo.txt", "conan_package.tgz", "conanmanifest.txt"]
-        files = [f for f in files if any(f.startswith(m) for m in accepted_files)]
-        check_compressed_files(PACKAGE_TGZ_NAME, files)
+        tgz_name = check_compressed_files(PACKAGE_TGZ_NAME, files)
+        accepted_files = ["conaninfo.txt", "conanmanifest.txt"]
+        files = [f for f in files if f == tgz_name or any(f.startswith(m) for m in accepted_files)]
         # If we didn't indicated reference, server got the latest, use absolute now, it's safer
         urls = {fn: self.router.package_file(pref, fn) for fn in files}
         cache = (pref.revision != DEFAULT_REVISION_V1)
-        self._download_and_save_files(urls, dest_folder, files, use_cache=cache)
-        ret = {fn: os.path.join(dest_folder, fn) for fn in files}
+        handlers = None
+        if tgz_handler is not None and tgz_name is not None:
+            handlers = {tgz_name: tgz_handler.for_file(tgz_name)}
+        streamed = self._download_and_save_files(urls, dest_folder, files, use_cache=cache,
+                                                 handlers=handlers)
+        ret = {fn: os.path.join(dest_folder, fn) for fn in files if fn not in streamed}
         return ret
 
     def get_recipe_path(self, ref, path):
@@ -176,26 +205,31 @@ class RestV2Methods(RestCommonMethods):
                     ret.append(tmp)
         return sorted(ret)
 
-    def _upload_recipe(self, ref, files_to_upload, retry, retry_wait):
+    def _upload_recipe(self, ref, files_to_upload, retry, retry_wait, checksums=None):
         # Direct upload the recipe
         urls = {fn: self.router.recipe_file(ref, fn, add_matrix_params=True)
                 for fn in files_to_upload}
-        self._upload_files(files_to_upload, urls, retry, retry_wait, display_name=str(ref))
+        self._upload_files(files_to_upload, urls, retry, retry_wait, display_name=str(ref),
+                           checksums=checksums)
 
-    def _upload_package(self, pref, files_to_upload, retry, retry_wait):
+    def _upload_package(self, pref, files_to_upload, retry, retry_wait, checksums=None):
         urls = {fn: self.router.package_file(pref, fn, add_matrix_params=True)
                 for fn in files_to_upload}
 
         short_pref_name = "%s:%s" % (pref.ref, pref.id[0:4])
-        self._upload_files(files_to_upload, urls, retry, retry_wait, display_name=short_pref_name)
+        self._upload_files(files_to_upload, urls, retry, retry_wait, display_name=short_pref_name,
+                           checksums=checksums)
+
+    def _parallel_transfers(self):
+        parallel = self._config.parallel_file_transfers
+        return parallel if parallel and parallel > 1 else None
 
-    def _upload_files(self, files, urls, retry, retry_wait, display_name=None):
+    def _upload_files(self, files, urls, retry, retry_wait, display_name=None, checksums=None):
         t1 = time.time()
         failed = []
         uploader = FileUploader(self.requester, self._output, self.verify_ssl, self._config)
-        # conan_package.tgz and conan_export.tgz are uploaded first to avoid uploading conaninfo.txt
-        # or conanamanifest.txt with missing files due to a network failure
-        for filename in sorted(files):
+
+        def upload(filename):
             if self._output and not self._output.is_terminal:
                 msg = "Uploading: %s" % filename if not display_name else (
                     "Uploading %s -> %s" % (filename, display_name))
@@ -203,35 +237,74 @@ class RestV2Methods(RestCommonMethods):
             resource_url = urls[filename]
             try:
                 headers = self._artifacts_properties if not self._matrix_params else {}
+                sha1 = (checksums or {}).get(filename, {}).get("sha1")
                 uploader.upload(resource_url, files[filename], auth=self.auth,
                                 dedup=self._checksum_deploy, retry=retry, retry_wait=retry_wait,
-                                headers=headers, display_name=display_name)
+                                headers=headers, display_name=display_name, sha1=sha1)
             except (AuthenticationException, ForbiddenException):
                 raise
             except Exception as exc:
                 self._output.error("\nError uploading file: %s, '%s'" % (filename, exc))
                 failed.append(filename)
 
+        # conan_package.tgz and conan_export.tgz are uploaded first to avoid uploading conaninfo.txt
+        # or conanamanifest.txt with missing files due to a network failure, and the
+        # conanmanifest.txt is the last one, once all the files it lists are there
+        parallel = self._parallel_transfers()
+        if parallel:
+            compressed = sorted(f for f in files if f in _COMPRESSED_NAMES)
+            manifest = [f for f in files if f == CONAN_MANIFEST]
+            others = sorted(f for f in files if f not in _COMPRESSED_NAMES and f != CONAN_MANIFEST)
+            stages = [compressed, others, manifest]
+            for i, stage in enumerate(stages):
+                _run_parallel(upload, stage, parallel)
+                if failed:  # The next files are not uploaded until the previous ones are there
+                    for pending in stages[i + 1:]:
+                        failed.extend(pending)
+                    break
+        else:
+            for filename in sorted(files):
+                upload(filename)
+
         if failed:
             raise ConanException("Execute upload again to retry upload the failed files: %s"
                                  % ", ".join(failed))
         else:
             logger.debug("\nUPLOAD: All uploaded! Total time: %s\n" % str(time.time() - t1))
 
-    def _download_and_save_files(self, urls, dest_folder, files, use_cache):
+    def _download_and_save_files(self, urls, dest_folder, files, use_cache, handlers=None):
+        """ :param handlers: {filename: chunks_handler} files to be streamed to the handler
+        instead of being saved in dest_folder
+        :return: the files that have been streamed to their handlers
+        """
         # Take advantage of filenames ordering, so that conan_package.tgz and conan_export.tgz
         # can be < conanfile, conaninfo, and sent always the last, so smaller files go first
         retry = self._config.retry
         retry_wait = self._config.retry_wait
         download_cache = False if not use_cache else self._config.download_cache
-        for filename in sorted(files, reverse=True):
+        max_size = self._config.download_cache_max_size if download_cache else None
+        handlers = handlers or {}
+
+        def download(filename):
             if self._output and not self._output.is_terminal:
                 self._output.writeln("Downloading %s" % filename)
             resource_url = urls[filename]
-            abs_path = os.path.join(dest_folder, filename)
+            handler = handlers.get(filename)
+            abs_path = os.path.join(dest_folder, filename) if handler is None else None
             run_downloader(self.requester, self._output, self.verify_ssl, retry=retry,
                            retry_wait=retry_wait, download_cache=download_cache,
-                           url=resource_url, file_path=abs_path, auth=self.auth)
+                           download_cache_max_size=max_size,
+                           download_ranges=self._config.download_ranges,
+                           url=resource_url, file_path=abs_path, auth=self.auth,
+                           chunks_handler=handler)
+
+        parallel = self._parallel_transfers()
+        if parallel:
+            _run_parallel(download, sorted(files, reverse=True), parallel)
+        else:
+            for filename in sorted(files, reverse=True):
+                download(filename)
+        return [f for f in files if f in handlers]
 
     def _remove_conanfile_files(self, ref, files):
         # V2 === revisions, do not remove files, it will create a new revision if the files changed
@@ -340,3 +413,19 @@ class RestV2Methods(RestCommonMethods):
         prev = data["revision"]
         # Ignored data["time"]
         return pref.copy_with_revs(pref.ref.revision, prev)
+
+    def get_packages_info(self, prefs):
+        """ returns {pref: (ConanInfo, pref with PREV)} of the binaries that exist in the
+        remote, the latest revision of those without PREV
+        """
+        for pref in prefs:
+            assert pref.ref.revision is not None, "get_packages_info needs RREV"
+        url = self.router.packages_info()
+        packages = {pref.full_str(): pref for pref in prefs}
+        data = self.get_json(url, data={"packages": list(packages)})
+        result = {}
+        for package, info in data["packages"].items():
+            pref = packages[package]
+            result[pref] = (ConanInfo.loads(info["content"]),
+                            pref.copy_with_revs(pref.ref.revision, info["revision"]))
+        return result
@@ -9,7 +9,8 @@ from conans.errors import ConanException, ConanExceptionInUserConanfileMethod, \
     conanfile_exception_formatter
 from conans.model.conan_file import get_env_context_manager
 from conans.model.scm import SCM, get_scm_data
-from conans.paths import CONANFILE, CONAN_MANIFEST, EXPORT_SOURCES_TGZ_NAME, EXPORT_TGZ_NAME
+from conans.paths import CONANFILE, CONAN_MANIFEST, EXPORT_SOURCES_TGZ_NAME, EXPORT_TGZ_NAME, \
+    compressed_file_names
 from conans.util.conan_v2_mode import conan_v2_property
 from conans.util.files import (is_dirty, mkdir, rmdir, set_dirty_context_manager,
                                merge_directories, clean_dirty)
@@ -166,8 +167,9 @@ def _run_source(conanfile, conanfile_path, hook_manager, reference, cache,
 
 
 def _clean_source_folder(folder):
-    for f in (EXPORT_TGZ_NAME, EXPORT_SOURCES_TGZ_NAME, CONANFILE+"c",
-              CONANFILE+"o", CONANFILE, CONAN_MANIFEST):
+    tgz_names = compressed_file_names(EXPORT_TGZ_NAME) + \
+        compressed_file_names(EXPORT_SOURCES_TGZ_NAME)
+    for f in tgz_names + [CONANFILE+"c", CONANFILE+"o", CONANFILE, CONAN_MANIFEST]:
         try:
             os.remove(os.path.join(folder, f))
         except OSError:
@@ -0,0 +1,375 @@
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+
+from six.moves.urllib.request import pathname2url
+
+from conans.model.info import ConanInfo
+from conans.util.files import load
+from conans.util.log import logger
+
+FOLDERS_TABLE = "store_folders"
+INFOS_TABLE = "package_infos"
+FIELDS_TABLE = "package_fields"
+REMOTE_LISTINGS_TABLE = "remote_listings"
+REMOTE_CAPABILITIES_TABLE = "remote_capabilities"
+_SCHEMA_VERSION = 3  # Different versions drop the existing tables
+
+# Entries computed closer than this to the modification time of their folder or file are racy,
+# they are not trusted as there might be changes done later in the same filesystem timestamp
+# tick. The filesystems with timestamps in whole seconds can have ticks of 2 seconds (FAT)
+_RACY_SECONDS = 0.1
+_RACY_SECONDS_COARSE = 2
+
+
+def _mtime_key(stat_result):
+    return getattr(stat_result, "st_mtime_ns", None) or int(stat_result.st_mtime * 1e9)
+
+
+def _racy(mtime, indexed):
+    window = _RACY_SECONDS if mtime % 10 ** 9 else _RACY_SECONDS_COARSE
+    return indexed - mtime / 1e9 <= window
+
+
+def _load_info_min(info_path):
+    return ConanInfo.loads(load(info_path)).serialize_min()
+
+
+def field_condition(kind, name, value):
+    """ sql condition, for the package_infos() queries, of the packages with the value in the
+    field name of the settings or options (kind). As in the package search queries, a missing
+    field has the "None" value
+    """
+    condition = ("coalesce((select value from {fields} where {fields}.path={infos}.path and "
+                 "kind=? and name=?), 'None') = ?".format(fields=FIELDS_TABLE, infos=INFOS_TABLE))
+    return condition, [kind, name, value]
+
+
+class CacheIndex(object):
+    """ sqlite index of the local cache store, with the subfolders of the store folders (the
+    references) and the summaries of the packages conaninfo.txt files, whose settings and
+    options can be queried. It also keeps the results of the searches in the remotes used to
+    resolve version ranges and the capabilities of the servers, that are only used while they
+    are younger than the configured time to live.
+
+    The index is updated by the operations that modify the store. Every entry is stored with the
+    modification time of the folder or file it was computed from, and it is only used while it is
+    still the same, so the index never returns stale data, even if the store is modified by other
+    processes or by hand: the outdated, missing or racy entries are read from the store, and the
+    reads store them again once they can be trusted. All the changes done in one operation are
+    committed in a single transaction. Any error with the database falls back to reading the
+    store directly.
+    """
+
+    def __init__(self, dbfile):
+        self._dbfile = dbfile
+
+    @staticmethod
+    def create(dbfile):
+        index = CacheIndex(dbfile)
+        tables = (FOLDERS_TABLE, INFOS_TABLE, FIELDS_TABLE, REMOTE_LISTINGS_TABLE,
+                  REMOTE_CAPABILITIES_TABLE)
+        try:
+            with index._connect() as connection:
+                version = connection.execute("pragma user_version").fetchone()[0]
+                if version != _SCHEMA_VERSION:
+                    for table in tables:
+                        connection.execute("drop table if exists %s" % table)
+                    connection.execute("pragma user_version = %d" % _SCHEMA_VERSION)
+                connection.execute("create table if not exists %s (path TEXT PRIMARY KEY, "
+                                   "mtime INTEGER, racy INTEGER, entries TEXT)" % FOLDERS_TABLE)
+                connection.execute("create table if not exists %s (path TEXT PRIMARY KEY, "
+                                   "mtime INTEGER, size INTEGER, racy INTEGER, "
+                                   "recipe_hash TEXT, full_requires TEXT)" % INFOS_TABLE)
+                for table in (FOLDERS_TABLE, INFOS_TABLE):
+                    connection.execute("create index if not exists %s_racy on %s (racy)"
+                                       % (table, table))
+                connection.execute("create table if not exists %s (path TEXT, kind TEXT, "
+                                   "name TEXT, value TEXT, PRIMARY KEY (path, kind, name))"
+                                   % FIELDS_TABLE)
+                connection.execute("create index if not exists %s_values on %s (kind, name, "
+                                   "value)" % (FIELDS_TABLE, FIELDS_TABLE))
+                connection.execute("create table if not exists %s (remote TEXT, url TEXT, "
+                                   "pattern TEXT, timestamp REAL, refs TEXT, "
+                                   "PRIMARY KEY (remote, pattern))" % REMOTE_LISTINGS_TABLE)
+                connection.execute("create table if not exists %s (url TEXT PRIMARY KEY, "
+                                   "timestamp REAL, capabilities TEXT)"
+                                   % REMOTE_CAPABILITIES_TABLE)
+        except Exception as e:
+            logger.error("Could not initialize the cache index %s: %s" % (dbfile, str(e)))
+        return index
+
+    @contextmanager
+    def _connect(self, readonly=False):
+        if readonly:
+            uri = "file:%s?mode=ro" % pathname2url(self._dbfile)
+            connection = sqlite3.connect(uri, timeout=10, uri=True)
+        else:
+            connection = sqlite3.connect(self._dbfile, timeout=10)
+        connection.text_factory = str
+        try:
+            with connection:  # A transaction, committed if there are no errors
+                yield connection
+        finally:
+            connection.close()
+
+    def list_subdirs(self, basedir, level, first_level_filter=None):
+        """ same result as list_folder_subdirs(), the relative paths of the folders at the given
+        level, using the indexed listings of the unchanged folders. If defined,
+        first_level_filter(name) selects the folders of the first level to be walked
+        """
+        refresh = {}
+        try:
+            with self._connect(readonly=True) as connection:
+                result = self._list_subdirs(connection, basedir, level, first_level_filter,
+                                            refresh)
+        except (sqlite3.Error, ValueError) as e:
+            logger.error("Cache index error, listing the store folders: %s" % str(e))
+            return self._list_subdirs(None, basedir, level, first_level_filter, {})
+        self._refresh(folders=refresh)
+        return result
+
+    def _list_subdirs(self, connection, basedir, level, first_level_filter, refresh):
+        result = []
+        pending = [(basedir, [])]
+        while pending:
+            folder, tokens = pending.pop()
+            subdirs = self._folder_subdirs(connection, folder, refresh)
+            if not tokens and first_level_filter is not None:
+                subdirs = [d for d in subdirs if first_level_filter(d)]
+            for subdir in subdirs:
+                subdir_tokens = tokens + [subdir]
+                if len(subdir_tokens) == level:
+                    result.append("/".join(subdir_tokens))
+                else:
+                    pending.append((os.path.join(folder, subdir), subdir_tokens))
+        return sorted(result)
+
+    @staticmethod
+    def _folder_subdirs(connection, folder, refresh):
+        """ the subdirs of the folder, from the index if it is up to date. Otherwise they are
+        read from the store, and added to refresh if they can be trusted
+        """
+        try:
+            mtime = _mtime_key(os.stat(folder))
+        except OSError:
+            return []
+        indexed = time.time()
+        if connection is not None:
+            row = connection.execute("select mtime, racy, entries from %s where path=?"
+                                     % FOLDERS_TABLE, (folder,)).fetchone()
+            if row and row[0] == mtime and not row[1]:
+                return json.loads(row[2])
+        subdirs = _list_dirs(folder)
+        if not _racy(mtime, indexed):
+            refresh[folder] = (mtime, indexed, subdirs)
+        return subdirs
+
+    def package_infos(self, info_paths, condition=None):
+        """ returns a {info_path: info} dict, with the serialize_min() of the existing
+        conaninfo.txt files in info_paths, read from the store if they changed since they were
+        indexed. The indexed ones not matching the optional sql condition, built with
+        field_condition(), are excluded, the ones read from the store are not filtered
+        """
+        refresh = {}
+        try:
+            with self._connect(readonly=True) as connection:
+                result = self._package_infos(connection, info_paths, condition, refresh)
+        except (sqlite3.Error, ValueError) as e:
+            logger.error("Cache index error, reading the packages info: %s" % str(e))
+            return self._package_infos(None, info_paths, condition, {})
+        self._refresh(infos=refresh)
+        return result
+
+    @staticmethod
+    def _package_infos(connection, info_paths, condition, refresh):
+        sql_condition, params = condition or ("1", [])
+        query = ("select mtime, size, racy, recipe_hash, full_requires, %s from %s where path=?"
+                 % (sql_condition, INFOS_TABLE))
+        result = {}
+        for info_path in info_paths:
+            try:
+                stat_result = os.stat(info_path)
+            except OSError:
+                continue
+            indexed = time.time()
+            if connection is not None:
+                row = connection.execute(query, params + [info_path]).fetchone()
+                if (row and row[0] == _mtime_key(stat_result) and row[1] == stat_result.st_size
+                        and not row[2]):
+                    if row[5]:
+                        info = {"settings": {}, "options": {}, "recipe_hash": row[3],
+                                "full_requires": json.loads(row[4])}
+                        for kind, name, value in connection.execute(
+                                "select kind, name, value from %s where path=?" % FIELDS_TABLE,
+                                (info_path,)):
+                            info[kind][name] = value
+                        result[info_path] = info
+                    continue
+            try:
+                info = _load_info_min(info_path)
+            except (IOError, OSError):  # Removed concurrently
+                continue
+            result[info_path] = info
+            if not _racy(_mtime_key(stat_result), indexed):
+                refresh[info_path] = (stat_result, indexed, info)
+        return result
+
+    def _refresh(self, folders=None, infos=None):
+        """ stores the entries that were read from the store, so the next reads use them
+        """
+        if not folders and not infos:
+            return
+        try:
+            with self._connect() as connection:
+                for folder, (mtime, indexed, subdirs) in (folders or {}).items():
+                    self._store_folder(connection, folder, mtime, indexed, subdirs)
+                for info_path, (stat_result, indexed, info) in (infos or {}).items():
+                    self._store_info(connection, info_path, stat_result, indexed, info)
+        except sqlite3.Error as e:  # A read-only cache, for example
+            logger.debug("Cache index not refreshed: %s" % str(e))
+
+    def update(self, folders=(), info_paths=()):
+        """ stores the listings of the folders and the info of the conaninfo.txt info_paths, to
+        be called by the operations that modify them. The racy entries, too recent to be trusted
+        when they were stored, are refreshed too
+        """
+        try:
+            with self._connect() as connection:
+                folders = set(folders)
+                info_paths = set(info_paths)
+                for table, paths in ((FOLDERS_TABLE, folders), (INFOS_TABLE, info_paths)):
+                    rows = connection.execute("select path from %s where racy=1" % table)
+                    paths.update(row[0] for row in rows)
+                for folder in folders:
+                    self._update_folder(connection, folder)
+                for info_path in info_paths:
+                    self._update_info(connection, info_path)
+        except sqlite3.Error as e:
+            logger.error("Cache index error, updating it: %s" % str(e))
+
+    @staticmethod
+    def _update_folder(connection, folder):
+        try:
+            mtime = _mtime_key(os.stat(folder))
+        except OSError:
+            connection.execute("delete from %s where path=?" % FOLDERS_TABLE, (folder,))
+            return
+        indexed = time.time()
+        CacheIndex._store_folder(connection, folder, mtime, indexed, _list_dirs(folder))
+
+    @staticmethod
+    def _store_folder(connection, folder, mtime, indexed, subdirs):
+        connection.execute("insert or replace into %s (path, mtime, racy, entries) "
+                           "values (?, ?, ?, ?)" % FOLDERS_TABLE,
+                           (folder, mtime, int(_racy(mtime, indexed)), json.dumps(subdirs)))
+
+    @staticmethod
+    def _update_info(connection, info_path):
+        try:
+            stat_result = os.stat(info_path)
+            indexed = time.time()
+            info = _load_info_min(info_path)
+        except (IOError, OSError):
+            connection.execute("delete from %s where path=?" % FIELDS_TABLE, (info_path,))
+            connection.execute("delete from %s where path=?" % INFOS_TABLE, (info_path,))
+            return
+        CacheIndex._store_info(connection, info_path, stat_result, indexed, info)
+
+    @staticmethod
+    def _store_info(connection, info_path, stat_result, indexed, info):
+        mtime = _mtime_key(stat_result)
+        connection.execute("delete from %s where path=?" % FIELDS_TABLE, (info_path,))
+        connection.execute("insert or replace into %s (path, mtime, size, racy, recipe_hash, "
+                           "full_requires) values (?, ?, ?, ?, ?, ?)" % INFOS_TABLE,
+                           (info_path, mtime, stat_result.st_size, int(_racy(mtime, indexed)),
+                            info["recipe_hash"], json.dumps(info["full_requires"])))
+        connection.executemany("insert into %s (path, kind, name, value) values (?, ?, ?, ?)"
+                               % FIELDS_TABLE,
+                               [(info_path, kind, name, value)
+                                for kind in ("settings", "options")
+                                for name, value in info[kind].items()])
+
+    def forget(self, folder):
+        """ removes the entries of the folder and all its contents, for removed recipes
+        """
+        pattern = os.path.join(folder, "").replace("%", r"\%").replace("_", r"\_") + "%"
+        try:
+            with self._connect() as connection:
+                for table in (FOLDERS_TABLE, INFOS_TABLE, FIELDS_TABLE):
+                    connection.execute("delete from %s where path=? or path like ? escape '\\'"
+                                       % table, (folder, pattern))
+        except sqlite3.Error as e:
+            logger.error("Cache index error, removing %s: %s" % (folder, str(e)))
+
+    def remote_listing(self, remote, pattern, ttl):
+        """ returns the list of references found in the remote for the search pattern, if they
+        were stored less than ttl seconds ago, or None
+        """
+        try:
+            with self._connect(readonly=True) as connection:
+                row = connection.execute("select url, timestamp, refs from %s where remote=? "
+                                         "and pattern=?" % REMOTE_LISTINGS_TABLE,
+                                         (remote.name, pattern)).fetchone()
+        except sqlite3.Error as e:
+            logger.error("Cache index error, reading the remote %s search: %s"
+                         % (remote.name, str(e)))
+            return None
+        if row and row[0] == remote.url and 0 <= time.time() - row[1] < ttl:
+            return json.loads(row[2])
+        return None
+
+    def store_remote_listing(self, remote, pattern, refs):
+        try:
+            with self._connect() as connection:
+                connection.execute("insert or replace into %s (remote, url, pattern, timestamp, "
+                                   "refs) values (?, ?, ?, ?, ?)" % REMOTE_LISTINGS_TABLE,
+                                   (remote.name, remote.url, pattern, time.time(),
+                                    json.dumps(refs)))
+        except sqlite3.Error as e:
+            logger.error("Cache index error, storing the remote %s search: %s"
+                         % (remote.name, str(e)))
+
+    def forget_remote_listings(self, remote):
+        """ removes the stored searches of the remote, after its recipes change
+        """
+        try:
+            with self._connect() as connection:
+                connection.execute("delete from %s where remote=?" % REMOTE_LISTINGS_TABLE,
+                                   (remote.name,))
+        except sqlite3.Error as e:
+            logger.error("Cache index error, removing the remote %s searches: %s"
+                         % (remote.name, str(e)))
+
+    def remote_capabilities(self, url, ttl):
+        """ returns the capabilities of the server, if they were stored less than ttl seconds
+        ago, or None
+        """
+        try:
+            with self._connect(readonly=True) as connection:
+                row = connection.execute("select timestamp, capabilities from %s where url=?"
+                                         % REMOTE_CAPABILITIES_TABLE, (url,)).fetchone()
+        except sqlite3.Error as e:
+            logger.error("Cache index error, reading the %s capabilities: %s" % (url, str(e)))
+            return None
+        if row and 0 <= time.time() - row[0] < ttl:
+            return json.loads(row[1])
+        return None
+
+    def store_remote_capabilities(self, url, capabilities):
+        try:
+            with self._connect() as connection:
+                connection.execute("insert or replace into %s (url, timestamp, capabilities) "
+                                   "values (?, ?, ?)" % REMOTE_CAPABILITIES_TABLE,
+                                   (url, time.time(), json.dumps(capabilities)))
+        except sqlite3.Error as e:
+            logger.error("Cache index error, storing the %s capabilities: %s" % (url, str(e)))
+
+
+def _list_dirs(folder):
+    try:
+        return sorted(d for d in os.listdir(folder) if os.path.isdir(os.path.join(folder, d)))
+    except OSError:
+        return []
@@ -14,7 +14,7 @@ from patch_ng import fromfile, fromstring
 from conans.client.output import ConanOutput
 from conans.errors import ConanException
 from conans.util.fallbacks import default_output
-from conans.util.files import (_generic_algorithm_sum, load, save)
+from conans.util.files import file_checksums, load, save
 
 UNIT_SIZE = 1000.0
 # Library extensions supported by collect_libs
@@ -186,14 +186,23 @@ def untargz(filename, destination=".", pattern=None, strip_root=False):
 
 
 def check_with_algorithm_sum(algorithm_name, file_path, signature):
-    real_signature = _generic_algorithm_sum(file_path, algorithm_name)
-    if real_signature != signature.lower():
-        raise ConanException("%s signature failed for '%s' file. \n"
-                             " Provided signature: %s  \n"
-                             " Computed signature: %s" % (algorithm_name,
-                                                          os.path.basename(file_path),
-                                                          signature,
-                                                          real_signature))
+    check_checksums(file_path, [(algorithm_name, signature)])
+
+
+def check_checksums(file_path, signatures):
+    """ checks several signatures of a file, reading it only once
+    :param signatures: list of (algorithm_name, signature), checked in that order
+    """
+    real_signatures = file_checksums(file_path, [name for name, _ in signatures])
+    for algorithm_name, signature in signatures:
+        real_signature = real_signatures[algorithm_name]
+        if real_signature != signature.lower():
+            raise ConanException("%s signature failed for '%s' file. \n"
+                                 " Provided signature: %s  \n"
+                                 " Computed signature: %s" % (algorithm_name,
+                                                              os.path.basename(file_path),
+                                                              signature,
+                                                              real_signature))
 
 
 def check_sha1(file_path, signature):
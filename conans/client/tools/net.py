@@ -88,11 +88,15 @@ def download(url, filename, verify=True, out=None, retry=None, retry_wait=None,
 
     checksum = sha256 or sha1 or md5
     download_cache = config.download_cache if checksum else None
+    download_cache_max_size = config.download_cache_max_size if download_cache else None
+    download_ranges = config.download_ranges if config else None
 
     def _download_file(file_url):
         # The download cache is only used if a checksum is provided, otherwise, a normal download
         run_downloader(requester=requester, output=out, verify=verify,
-                       user_download=True, download_cache=download_cache, url=file_url,
+                       user_download=True, download_cache=download_cache,
+                       download_cache_max_size=download_cache_max_size,
+                       download_ranges=download_ranges, url=file_url,
                        file_path=filename, retry=retry, retry_wait=retry_wait, overwrite=overwrite,
                        auth=auth, headers=headers, md5=md5, sha1=sha1, sha256=sha256)
         out.writeln("")
@@ -17,6 +17,34 @@ LOCKFILE = "conan.lock"
 LOCKFILE_VERSION = "0.4"
 
 
+def topological_levels(dependencies):
+    """ Kahn topological sort, by levels
+
+    :param dependencies: {id: [ids it depends on]}, other ids in the lists are ignored
+    :return: list of lists of ids, sorted, each level only depends on the previous ones
+    """
+    pending = {}  # {id: number of dependencies not in a level yet}
+    dependants = {}  # {id: [ids that depend on it]}
+    for id_, deps in dependencies.items():
+        deps = set(d for d in deps if d in dependencies)
+        pending[id_] = len(deps)
+        for dep in deps:
+            dependants.setdefault(dep, []).append(id_)
+
+    levels = []
+    current_level = sorted(id_ for id_, count in pending.items() if count == 0)
+    while current_level:
+        levels.append(current_level)
+        next_level = []
+        for id_ in current_level:
+            for dependant in dependants.get(id_, []):
+                pending[dependant] -= 1
+                if not pending[dependant]:
+                    next_level.append(dependant)
+        current_level = sorted(next_level)
+    return levels
+
+
 class GraphLockFile(object):
 
     def __init__(self, profile_host, profile_build, graph_lock):
@@ -282,6 +310,7 @@ class GraphLock(object):
         self._nodes = {}  # {id: GraphLockNode}
         self._revisions_enabled = revisions_enabled
         self._relaxed = False  # If True, the lock can be expanded with new Nodes
+        self._index = None  # {(field, value): [id]}, lazily computed by _node_index()
 
         if deps_graph is None:
             return
@@ -357,24 +386,8 @@ class GraphLock(object):
                  reference (as string), possibly including revision, of the node
         """
         # First do a topological order by levels, the ids of the nodes are stored
-        levels = []
-        opened = list(self._nodes.keys())
-        while opened:
-            current_level = []
-            for o in opened:
-                node = self._nodes[o]
-                requires = node.requires
-                if node.python_requires:
-                    requires += node.python_requires
-                if node.build_requires:
-                    requires += node.build_requires
-                if not any(n in opened for n in requires):
-                    current_level.append(o)
-
-            current_level.sort()
-            levels.append(current_level)
-            # now initialize new level
-            opened = set(opened).difference(current_level)
+        levels = topological_levels({id_: (node.requires or []) + (node.build_requires or [])
+                                     for id_, node in self._nodes.items()})
 
         # Now compute the list of list with prev=None, and prepare them with the right
         # references to be used in cmd line
@@ -597,11 +610,12 @@ class GraphLock(object):
             version_range = version[1:-1]
 
         if version_range:
+            candidates = set(self._node_index().get(("name", ref.name), []))
             for id_, node in self._nodes.items():
+                if id_ not in candidates:
+                    continue
                 root_ref = node.ref
-                if (root_ref is not None and ref.name == root_ref.name and
-                        ref.user == root_ref.user and
-                        ref.channel == root_ref.channel):
+                if ref.user == root_ref.user and ref.channel == root_ref.channel:
                     output = []
                     result = satisfying([str(root_ref.version)], version_range, output)
                     if result:
@@ -609,16 +623,33 @@ class GraphLock(object):
         else:
             search_ref = repr(ref)
             if ref.revision:  # Search by exact ref (with RREV)
-                node_id = self._find_first(lambda n: n.ref and repr(n.ref) == search_ref)
+                node_id = self._find_first("repr", search_ref)
             else:  # search by ref without RREV
-                node_id = self._find_first(lambda n: n.ref and str(n.ref) == search_ref)
+                node_id = self._find_first("str", search_ref)
             if node_id:
                 return node_id
 
-    def _find_first(self, predicate):
-        """ find the first node in the graph matching the predicate"""
-        for id_, node in sorted(self._nodes.items()):
-            if predicate(node):
+    def _node_index(self):
+        """ the ids of the nodes, sorted, by the name, repr and str of their references. The
+        consumers without reference are indexed with name None
+        """
+        if self._index is None:
+            index = {}
+            for id_, node in sorted(self._nodes.items()):
+                ref = node.ref
+                if ref:
+                    keys = ("name", ref.name), ("repr", repr(ref)), ("str", str(ref))
+                else:
+                    keys = ("name", None),
+                for key in set(keys):
+                    index.setdefault(key, []).append(id_)
+            self._index = index
+        return self._index
+
+    def _find_first(self, field, value, predicate=None):
+        """ find the first node in the graph with the given ref field, matching the predicate"""
+        for id_ in self._node_index().get((field, value), []):
+            if predicate is None or predicate(self._nodes[id_]):
                 return id_
 
     def get_consumer(self, ref):
@@ -632,7 +663,7 @@ class GraphLock(object):
         # None reference
         if ref is None or ref.name is None:
             # Is a conanfile.txt consumer
-            node_id = self._find_first(lambda n: not n.ref and n.path)
+            node_id = self._find_first("name", None, lambda n: n.path)
             if node_id:
                 return node_id
         else:
@@ -641,11 +672,11 @@ class GraphLock(object):
             repr_ref = repr(ref)
             str_ref = str(ref)
             node_id = (  # First search by exact ref with RREV
-                       self._find_first(lambda n: n.ref and repr(n.ref) == repr_ref) or
+                       self._find_first("repr", repr_ref) or
                        # If not mathing, search by exact ref without RREV
-                       self._find_first(lambda n: n.ref and str(n.ref) == str_ref) or
+                       self._find_first("str", str_ref) or
                        # Or it could be a local consumer (n.path defined), search only by name
-                       self._find_first(lambda n: n.ref and n.ref.name == ref.name and n.path))
+                       self._find_first("name", ref.name, lambda n: n.path))
             if node_id:
                 return node_id
 
@@ -685,9 +716,9 @@ class GraphLock(object):
         # removing the revision, but it still should match
         search_ref = repr(ref)
         if ref.revision:  # Match should be exact (with RREV)
-            node_id = self._find_first(lambda n: n.ref and repr(n.ref) == search_ref)
+            node_id = self._find_first("repr", search_ref)
         else:
-            node_id = self._find_first(lambda n: n.ref and str(n.ref) == search_ref)
+            node_id = self._find_first("str", search_ref)
         if node_id:
             return node_id
 
@@ -700,3 +731,4 @@ class GraphLock(object):
         """
         lock_node = self._nodes[node_id]
         lock_node.ref = ref
+        self._index = None
@@ -2,7 +2,7 @@ import json
 import os
 
 from conans.errors import ConanException
-from conans.model.graph_lock import GraphLockFile
+from conans.model.graph_lock import GraphLockFile, topological_levels
 from conans.util.files import load, save
 
 
@@ -95,27 +95,13 @@ class LockBundle(object):
 
     def build_order(self):
         # First do a topological order by levels, the ids of the nodes are stored
-        levels = []
-        opened = list(self._nodes.keys())
-        while opened:
-            current_level = []
-            closed = []
-            for o in opened:
-                node = self._nodes[o]
-                requires = node.get("requires", [])
-                if not any(n in opened for n in requires):  # Doesn't have an open requires
-                    # iterate all packages to see if some has prev=null
-                    if any(pkg["prev"] is None for pkg in node["packages"]):
-                        current_level.append(o)
-                    closed.append(o)
-
-            if current_level:
-                current_level.sort()
-                levels.append(current_level)
-            # now initialize new level
-            opened = set(opened).difference(closed)
-
-        return levels
+        levels = topological_levels({ref: node.get("requires", [])
+                                     for ref, node in self._nodes.items()})
+        # Only the references with some package to build, with prev=null
+        levels = [[ref for ref in level
+                   if any(pkg["prev"] is None for pkg in self._nodes[ref]["packages"])]
+                  for level in levels]
+        return [level for level in levels if level]
 
     @staticmethod
     def update_bundle(bundle_path, revisions_enabled):
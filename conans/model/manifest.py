@@ -1,7 +1,8 @@
 import os
 
 from conans.errors import ConanException
-from conans.paths import CONAN_MANIFEST, EXPORT_SOURCES_TGZ_NAME, EXPORT_TGZ_NAME, PACKAGE_TGZ_NAME
+from conans.paths import (CONAN_MANIFEST, EXPORT_SOURCES_TGZ_NAME, EXPORT_TGZ_NAME,
+                          PACKAGE_TGZ_NAME, compressed_file_names)
 from conans.util.dates import timestamp_now, timestamp_to_str
 from conans.util.env_reader import get_env
 from conans.util.files import load, md5, md5sum, save, walk
@@ -121,7 +122,8 @@ class FileTreeManifest(object):
         from disk, and capturing current time
         """
         files, _ = gather_files(folder)
-        for f in (PACKAGE_TGZ_NAME, EXPORT_TGZ_NAME, CONAN_MANIFEST, EXPORT_SOURCES_TGZ_NAME):
+        for f in (compressed_file_names(PACKAGE_TGZ_NAME) + compressed_file_names(EXPORT_TGZ_NAME) +
+                  compressed_file_names(EXPORT_SOURCES_TGZ_NAME) + [CONAN_MANIFEST]):
             files.pop(f, None)
 
         file_dict = {}
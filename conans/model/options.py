@@ -349,7 +349,9 @@ class PackageOption(object):
             self._possible_values = sorted(str(v) for v in possible_values)
 
     def copy(self):
-        result = PackageOption(self._possible_values, self._name)
+        result = PackageOption("ANY", self._name)
+        # The possible values are never modified in place, they can be shared
+        result._possible_values = self._possible_values
         return result
 
     def __bool__(self):
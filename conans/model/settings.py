@@ -25,16 +25,29 @@ def undefined_value(name):
     return ConanException("'%s' value not defined" % name)
 
 
+def load_settings_yml(text):
+    try:
+        return yaml.safe_load(text) or {}
+    except yaml.YAMLError as ye:
+        raise ConanException("Invalid settings.yml format: {}".format(ye))
+
+
 class SettingsItem(object):
     """ represents a setting value and its child info, which could be:
     - A range of valid values: [Debug, Release] (for settings.compiler.runtime of VS)
     - "ANY", as string to accept any value
     - List ["None", "ANY"] to accept None or any value
     - A dict {subsetting: definition}, e.g. {version: [], runtime: []} for VS
+
+    The copies share the definition with the original until one of them modifies it, or returns
+    a child, that could be modified, so copying the settings for every conanfile does not copy
+    the whole settings.yml tree. The children obtained before a copy must not be modified after
+    it, as they can be shared with the copy.
     """
     def __init__(self, definition, name):
         self._name = name  # settings.compiler
         self._value = None  # gcc
+        self._shared = False  # The _definition is shared with a copy
         if isinstance(definition, dict):
             self._definition = {}
             # recursive
@@ -50,15 +63,25 @@ class SettingsItem(object):
     def __contains__(self, value):
         return value in (self._value or "")
 
+    def _own_definition(self):
+        """ the definition, copied first if it is shared, to be modified or to return a child
+        """
+        if self._shared:
+            if self.is_final:
+                if self._definition != "ANY":
+                    self._definition = self._definition[:]
+            else:
+                self._definition = {k: v.copy() for k, v in self._definition.items()}
+            self._shared = False
+        return self._definition
+
     def copy(self):
-        """ deepcopy, recursive
+        """ copy-on-write, same behavior as a deepcopy
         """
         result = SettingsItem({}, name=self._name)
         result._value = self._value
-        if self.is_final:
-            result._definition = self._definition[:]
-        else:
-            result._definition = {k: v.copy() for k, v in self._definition.items()}
+        result._definition = self._definition
+        result._shared = self._shared = True
         return result
 
     def copy_values(self):
@@ -68,7 +91,8 @@ class SettingsItem(object):
         result = SettingsItem({}, name=self._name)
         result._value = self._value
         if self.is_final:
-            result._definition = self._definition[:]
+            result._definition = self._definition
+            result._shared = self._shared = True
         else:
             result._definition = {k: v.copy_values() for k, v in self._definition.items()}
         return result
@@ -114,6 +138,7 @@ class SettingsItem(object):
     def remove(self, values):
         if not isinstance(values, (list, tuple, set)):
             values = [values]
+        self._own_definition()
         for v in values:
             v = str(v)
             if isinstance(self._definition, dict):
@@ -132,7 +157,7 @@ class SettingsItem(object):
             raise undefined_field(self._name, item, None, self._value)
         if self._value is None:
             raise undefined_value(self._name)
-        return self._definition[self._value]
+        return self._own_definition()[self._value]
 
     def __getattr__(self, item):
         item = str(item)
@@ -150,7 +175,7 @@ class SettingsItem(object):
     def __getitem__(self, value):
         value = str(value)
         try:
-            return self._definition[value]
+            return self._own_definition()[value]
         except Exception:
             raise ConanException(bad_value_msg(self._name, value, self.values_range))
 
@@ -193,6 +218,7 @@ class SettingsItem(object):
 
 
 class Settings(object):
+    """ The settings tree, defined by the settings.yml. Copy-on-write, like the SettingsItem """
     def __init__(self, definition=None, name="settings", parent_value=None):
         if parent_value == "None" and definition:
             raise ConanException("settings.yml: None setting can't have subsettings")
@@ -201,6 +227,14 @@ class Settings(object):
         self._parent_value = parent_value  # gcc, x86
         self._data = {str(k): SettingsItem(v, "%s.%s" % (name, k))
                       for k, v in definition.items()}
+        self._shared = False  # The _data is shared with a copy
+
+    def _own_data(self):
+        """ the items, copied first if they are shared, to be modified or returned """
+        if self._shared:
+            self._data = {k: v.copy() for k, v in self._data.items()}
+            self._shared = False
+        return self._data
 
     def get_safe(self, name, default=None):
         try:
@@ -227,11 +261,11 @@ class Settings(object):
             pass
 
     def copy(self):
-        """ deepcopy, recursive
+        """ copy-on-write, same behavior as a deepcopy
         """
         result = Settings({}, name=self._name, parent_value=self._parent_value)
-        for k, v in self._data.items():
-            result._data[k] = v.copy()
+        result._data = self._data
+        result._shared = self._shared = True
         return result
 
     def copy_values(self):
@@ -246,10 +280,15 @@ class Settings(object):
 
     @staticmethod
     def loads(text):
+        return Settings.from_definition(load_settings_yml(text))
+
+    @staticmethod
+    def from_definition(definition):
+        """ definition: the settings.yml already parsed by load_settings_yml() """
         try:
-            return Settings(yaml.safe_load(text) or {})
-        except (yaml.YAMLError, AttributeError) as ye:
-            raise ConanException("Invalid settings.yml format: {}".format(ye))
+            return Settings(definition)
+        except AttributeError as e:
+            raise ConanException("Invalid settings.yml format: {}".format(e))
 
     def validate(self):
         for field in self.fields:
@@ -263,12 +302,14 @@ class Settings(object):
     def remove(self, item):
         if not isinstance(item, (list, tuple, set)):
             item = [item]
+        data = self._own_data()
         for it in item:
             it = str(it)
-            self._data.pop(it, None)
+            data.pop(it, None)
 
     def clear(self):
         self._data = {}
+        self._shared = False
 
     def _check_field(self, field):
         if field not in self._data:
@@ -277,19 +318,19 @@ class Settings(object):
     def __getattr__(self, field):
         assert field[0] != "_", "ERROR %s" % field
         self._check_field(field)
-        return self._data[field]
+        return self._own_data()[field]
 
     def __delattr__(self, field):
         assert field[0] != "_", "ERROR %s" % field
         self._check_field(field)
-        del self._data[field]
+        del self._own_data()[field]
 
     def __setattr__(self, field, value):
         if field[0] == "_" or field.startswith("values"):
             return super(Settings, self).__setattr__(field, value)
 
         self._check_field(field)
-        self._data[field].value = value
+        self._own_data()[field].value = value
 
     @property
     def values(self):
@@ -338,7 +379,7 @@ class Settings(object):
             constraint_def = {str(k): v for k, v in constraint_def.items()}
 
         fields_to_remove = []
-        for field, config_item in self._data.items():
+        for field, config_item in self._own_data().items():
             if field not in constraint_def:
                 fields_to_remove.append(field)
                 continue
@@ -2,6 +2,7 @@
 
 import os
 import platform
+from collections import OrderedDict
 
 if platform.system() == "Windows":
     from conans.util.windows import conan_expand_user, rm_conandir
@@ -22,6 +23,14 @@ def get_conan_user_home():
     return os.path.abspath(tmp)
 
 
+def compressed_file_names(tgz_name):
+    """ all the supported names of a compressed artifact, like conan_package.tgz,
+    conan_package.txz..., in order of preference
+    """
+    bare_name = os.path.splitext(tgz_name)[0]
+    return [bare_name + extension for extension in COMPRESSION_EXTENSIONS.values()]
+
+
 # Files
 CONANFILE = 'conanfile.py'
 CONANFILE_TXT = "conanfile.txt"
@@ -43,6 +52,8 @@ ARTIFACTS_PROPERTIES_PUT_PREFIX = "artifact_property_"
 PACKAGE_TGZ_NAME = "conan_package.tgz"
 EXPORT_TGZ_NAME = "conan_export.tgz"
 EXPORT_SOURCES_TGZ_NAME = "conan_sources.tgz"
+# Formats of the compressed artifacts, the extension replaces the ".tgz" one of the names above
+COMPRESSION_EXTENSIONS = OrderedDict([("gzip", ".tgz"), ("xz", ".txz"), ("zstd", ".tzst")])
 RUN_LOG_NAME = "conan_run.log"
 DEFAULT_PROFILE_NAME = "default"
 PACKAGE_METADATA = "metadata.json"
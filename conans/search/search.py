@@ -3,11 +3,12 @@ import re
 from collections import OrderedDict
 from fnmatch import translate
 
+from conans.client.store.cache_index import field_condition
 from conans.errors import ConanException, RecipeNotFoundException
 from conans.model.info import ConanInfo
 from conans.model.ref import ConanFileReference, PackageReference
 from conans.paths import CONANINFO
-from conans.search.query_parse import evaluate_postfix, infix_to_postfix
+from conans.search.query_parse import evaluate_postfix, infix_to_postfix, is_operator
 from conans.util.files import load
 from conans.util.log import logger
 
@@ -81,30 +82,60 @@ def _evaluate(prop_name, prop_value, conan_vars_info):
 
     info_settings = conan_vars_info.get("settings", [])
     info_options = conan_vars_info.get("options", [])
-    properties = ["os", "os_build", "compiler", "arch", "arch_build", "build_type"]
-
-    def starts_with_common_settings(_prop_name):
-        return any(_prop_name.startswith(setting + '.') for setting in properties)
 
-    if prop_name in properties or starts_with_common_settings(prop_name):
+    if _is_setting(prop_name):
         return compatible_prop(info_settings.get(prop_name, None), prop_value)
     else:
         return compatible_prop(info_options.get(prop_name, None), prop_value)
 
 
+def _is_setting(prop_name):
+    properties = ["os", "os_build", "compiler", "arch", "arch_build", "build_type"]
+    return prop_name in properties or any(prop_name.startswith(setting + '.')
+                                          for setting in properties)
+
+
+def _query_condition(query):
+    """ the package query as a sql condition for the CacheIndex, None if there is no query or it
+    is not valid, filter_packages() will raise in that case
+    """
+    if not query or "!" in query or " not " in query or query.startswith("not "):
+        return None
+    try:
+        stack = []
+        for el in infix_to_postfix(query):
+            if is_operator(el):
+                condition1, params1 = stack.pop()
+                condition2, params2 = stack.pop()
+                operator = "and" if el == "&" else "or"
+                stack.append(("(%s %s %s)" % (condition2, operator, condition1),
+                              params2 + params1))
+            else:
+                name, value = el.split("=", 1)
+                value = value.replace("\"", "")
+                kind = "settings" if _is_setting(name) else "options"
+                stack.append(field_condition(kind, name, value))
+        condition, = stack
+        return condition
+    except Exception:
+        return None
+
+
 def search_recipes(cache, pattern=None, ignorecase=True):
     # Conan references in main storage
     no_user_channel = False
+    name_filter = None
     if pattern:
         if isinstance(pattern, ConanFileReference):
             pattern = repr(pattern)
         if pattern.endswith("@"):  # packages without user/channel:
             no_user_channel = True
             pattern = pattern[:-1]
+        name_filter = _name_filter(pattern, ignorecase)
         pattern = translate(pattern)
         pattern = re.compile(pattern, re.IGNORECASE) if ignorecase else re.compile(pattern)
 
-    refs = cache.all_refs()
+    refs = cache.all_refs(name_filter=name_filter)
     if no_user_channel:
         refs = [r for r in refs if r.user is None and r.channel is None]
     refs.extend(cache.editable_packages.edited_refs.keys())
@@ -114,6 +145,21 @@ def search_recipes(cache, pattern=None, ignorecase=True):
     return refs
 
 
+def _name_filter(pattern, ignorecase):
+    """ A pattern with a literal name, like "zlib/*@user/channel", can only match the references
+    of that name, so the other ones don't need to be listed
+    """
+    if "/" not in pattern:
+        return None
+    name = pattern.split("/", 1)[0]
+    if not name or any(c in name for c in "*?["):
+        return None
+    if ignorecase:
+        name = name.lower()
+        return lambda n: n.lower() == name
+    return lambda n: n == name
+
+
 def _partial_match(pattern, reference):
     """
     Finds if pattern matches any of partial sums of tokens of conan reference
@@ -129,42 +175,51 @@ def _partial_match(pattern, reference):
     return any(map(pattern.match, list(partial_sums(tokens))))
 
 
-def search_packages(package_layout, query):
+def search_packages(package_layout, query, cache_index=None):
     """ Return a dict like this:
 
             {package_ID: {name: "OpenCV",
                            version: "2.14",
                            settings: {os: Windows}}}
     param package_layout: Layout for the given reference
+    param cache_index: CacheIndex with the already parsed conaninfo.txt files, if available
     """
     if not os.path.exists(package_layout.base_folder()) or (
             package_layout.ref.revision and
             package_layout.recipe_revision() != package_layout.ref.revision):
         raise RecipeNotFoundException(package_layout.ref, print_rev=True)
-    infos = _get_local_infos_min(package_layout)
+    infos = _get_local_infos_min(package_layout, cache_index, query)
     return filter_packages(query, infos)
 
 
-def _get_local_infos_min(package_layout):
+def _get_local_infos_min(package_layout, cache_index=None, query=None):
     result = OrderedDict()
 
-    package_ids = package_layout.package_ids()
-    for package_id in package_ids:
-        # Read conaninfo
+    info_paths = OrderedDict()
+    for package_id in package_layout.package_ids():
         pref = PackageReference(package_layout.ref, package_id)
-        info_path = os.path.join(package_layout.package(pref), CONANINFO)
-        if not os.path.exists(info_path):
-            logger.error("There is no ConanInfo: %s" % str(info_path))
+        info_paths[package_id] = os.path.join(package_layout.package(pref), CONANINFO)
+    if cache_index is not None:
+        # The query is also applied by the index, not to return the not matching infos
+        infos = cache_index.package_infos(list(info_paths.values()), _query_condition(query))
+    else:
+        infos = {p: ConanInfo.loads(load(p)).serialize_min() for p in info_paths.values()
+                 if os.path.exists(p)}
+
+    metadata = None
+    for package_id, info_path in info_paths.items():
+        conan_vars_info = infos.get(info_path)
+        if conan_vars_info is None:  # Missing, or not matching the query
+            if not os.path.exists(info_path):
+                logger.error("There is no ConanInfo: %s" % str(info_path))
             continue
-        conan_info_content = load(info_path)
 
-        info = ConanInfo.loads(conan_info_content)
         if package_layout.ref.revision:
-            metadata = package_layout.load_metadata()
+            if metadata is None:  # Loaded only once, not for every package
+                metadata = package_layout.load_metadata()
             recipe_revision = metadata.packages[package_id].recipe_revision
             if recipe_revision and recipe_revision != package_layout.ref.revision:
                 continue
-        conan_vars_info = info.serialize_min()
         result[package_id] = conan_vars_info
 
     return result
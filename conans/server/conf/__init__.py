@@ -54,6 +54,8 @@ class ConanServerConfigParser(ConfigParser):
                            "host_name": get_env("CONAN_HOST_NAME", None, environment),
                            "custom_authenticator": get_env("CONAN_CUSTOM_AUTHENTICATOR", None, environment),
                            "custom_authorizer": get_env("CONAN_CUSTOM_AUTHORIZER", None, environment),
+                           "workers": get_env("CONAN_SERVER_WORKERS", None, environment),
+                           "keep_alive": get_env("CONAN_SERVER_KEEP_ALIVE", None, environment),
                            # "user:pass,user2:pass2"
                            "users": get_env("CONAN_SERVER_USERS", None, environment)}
 
@@ -108,6 +110,22 @@ class ConanServerConfigParser(ConfigParser):
         except ConanException:
             return self.port
 
+    @property
+    def workers(self):
+        """ number of threads serving the requests, 0 means that they are served one by one
+        """
+        try:
+            return int(self._get_conf_server_string("workers"))
+        except ConanException:
+            return 0
+
+    @property
+    def keep_alive(self):
+        try:
+            return int(self._get_conf_server_string("keep_alive"))
+        except ConanException:
+            return 5
+
     @property
     def host_name(self):
         try:
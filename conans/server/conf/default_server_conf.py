@@ -11,6 +11,11 @@ port: 9300
 public_port:
 host_name: localhost
 
+# Number of threads serving the requests concurrently. If empty or 0, they are served one by one
+workers:
+# Seconds an idle connection is kept open waiting for more requests, 0 closes it after every one
+keep_alive: 5
+
 # Authorize timeout are seconds the client has to upload/download files until authorization expires
 authorize_timeout: 1800
 
@@ -4,6 +4,7 @@ from unicodedata import normalize
 import six
 from bottle import FileUpload, cached_property, request, static_file
 
+from conans.paths import CONANINFO
 from conans.server.rest.bottle_routes import BottleRoutes
 from conans.server.service.mime import get_mime_type
 from conans.server.service.v1.upload_download_service import FileUploadDownloadService
@@ -37,6 +38,8 @@ class FileUploadDownloadController(object):
             abs_path = os.path.abspath(os.path.join(storage_path, os.path.normpath(the_path)))
             # Body is a stringIO (generator)
             service.put_file(file_saver, abs_path, token, request.content_length)
+            if os.path.basename(abs_path) == CONANINFO:
+                app.server_store.update_package_index(abs_path)
 
 
 class ConanFileUpload(FileUpload):
@@ -1,4 +1,10 @@
-from conans.model.ref import ConanFileReference
+import codecs
+import json
+
+from bottle import request
+
+from conans.errors import RequestErrorException
+from conans.model.ref import ConanFileReference, PackageReference
 from conans.server.rest.bottle_routes import BottleRoutes
 from conans.server.rest.controller.v2 import get_package_ref
 from conans.server.service.v2.service_v2 import ConanServiceV2
@@ -52,6 +58,23 @@ class RevisionsController(object):
             rev = conan_service.get_latest_package_revision(package_reference, auth_user)
             return _format_rev_return(rev)
 
+        @app.route(r.packages_info, method="POST")
+        def get_packages_info(auth_user):
+            """ Gets a JSON with the revision and conaninfo.txt of the "packages" of the request
+            (full package references, the latest revision if they have no PREV). The binaries
+            that do not exist are not returned.
+            """
+            reader = codecs.getreader("utf-8")
+            try:
+                packages = json.load(reader(request.body))["packages"]
+                prefs = {PackageReference.loads(p): p for p in packages}
+            except Exception as exc:
+                raise RequestErrorException("Invalid packages info request: %s" % str(exc))
+            conan_service = ConanServiceV2(app.authorizer, app.server_store)
+            infos = conan_service.get_packages_info(list(prefs), auth_user)
+            return {"packages": {prefs[pref]: {"revision": prev, "content": content}
+                                 for pref, (prev, content) in infos.items()}}
+
 
 def _format_rev_return(rev):
     return {"revision": rev[0],
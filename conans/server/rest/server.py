@@ -2,6 +2,7 @@ import bottle
 
 from conans.server.rest.api_v1 import ApiV1
 from conans.server.rest.api_v2 import ApiV2
+from conans.server.rest.threaded_server import ThreadedServer
 
 
 class ConanServer(object):
@@ -42,5 +43,10 @@ class ConanServer(object):
         port = kwargs.pop("port", self.run_port)
         debug_set = kwargs.pop("debug", False)
         host = kwargs.pop("host", "localhost")
-        bottle.Bottle.run(self.root_app, host=host,
+        workers = kwargs.pop("workers", None)
+        keep_alive = kwargs.pop("keep_alive", 5)
+        # Without workers, bottle default single threaded server is used
+        server = ThreadedServer(host=host, port=port, workers=workers,
+                                keep_alive=keep_alive) if workers else "wsgiref"
+        bottle.Bottle.run(self.root_app, server=server, host=host,
                           port=port, debug=debug_set, reloader=False)
@@ -0,0 +1,254 @@
+import selectors
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from wsgiref.simple_server import ServerHandler, WSGIRequestHandler, WSGIServer
+
+import bottle
+
+
+class _ServerHandler(ServerHandler):
+    http_version = "1.1"
+
+    def cleanup_headers(self):
+        super(_ServerHandler, self).cleanup_headers()
+        # Without a Content-Length the client reads the body until the connection is closed
+        if "Content-Length" not in self.headers:
+            self.request_handler.close_connection = True
+        if self.request_handler.close_connection:
+            self.headers["Connection"] = "close"
+
+    def handle_error(self):
+        # The response might be incomplete, the client cannot continue using the connection
+        self.request_handler.close_connection = True
+        super(_ServerHandler, self).handle_error()
+
+    def sendfile(self):
+        """ files with a known length are sent by the kernel directly from the file to the socket,
+        without copying them in user space
+        """
+        length = self.headers.get("Content-Length")
+        filelike = self.result.filelike
+        try:
+            offset = filelike.tell()
+            filelike.fileno()
+        except (AttributeError, OSError, ValueError):
+            return False
+        if length is None:
+            return False
+        self.send_headers()
+        self.request_handler.connection.sendfile(filelike, offset, int(length))
+        self.bytes_sent = int(length)
+        return True
+
+
+class _RequestHandler(WSGIRequestHandler):
+    """ serves the requests of a connection until the client closes it, or it stays idle more than
+    the keep-alive timeout of the server. It is not served from its constructor, the server calls
+    serve() every time the connection has a new request
+    """
+    protocol_version = "HTTP/1.1"
+
+    def __init__(self, request, client_address, server):
+        self.request = request
+        self.client_address = client_address
+        self.server = server
+        self.setup()
+
+    def serve(self):
+        """ returns True if the connection is kept open, waiting for more requests
+        """
+        try:
+            while True:
+                self._handle_request()
+                if self.close_connection:
+                    return False
+                if not self._has_buffered_request():
+                    return True
+        except socket.timeout:
+            return False
+
+    def close(self):
+        try:
+            self.finish()
+        finally:
+            self.server.shutdown_request(self.request)
+
+    def _has_buffered_request(self):
+        # A request already read from the socket would never make it readable again
+        self.connection.settimeout(0)
+        try:
+            return bool(self.rfile.peek(1))
+        except (OSError, ValueError):
+            return False
+        finally:
+            self.connection.settimeout(None)
+
+    def _handle_request(self):
+        self.close_connection = True
+        self.connection.settimeout(self.server.keep_alive or None)
+        self.raw_requestline = self.rfile.readline(65537)
+        self.connection.settimeout(None)
+        if not self.raw_requestline:
+            return
+        if len(self.raw_requestline) > 65536:
+            self.requestline = ""
+            self.request_version = ""
+            self.command = ""
+            self.send_error(414)
+            return
+        if not self.parse_request():
+            return
+        # A body not fully read by the application would be taken as the next request
+        if (self.headers.get("Content-Length", "0") != "0" or self.headers.get("Transfer-Encoding")
+                or not self.server.keep_alive):
+            self.close_connection = True
+
+        handler = _ServerHandler(self.rfile, self.wfile, self.get_stderr(), self.get_environ(),
+                                 multithread=True)
+        handler.request_handler = self
+        handler.run(self.server.get_app())
+
+    def log_request(self, *args, **kwargs):
+        if not self.server.quiet:
+            super(_RequestHandler, self).log_request(*args, **kwargs)
+
+
+class _IdleConnections(object):
+    """ the keep-alive connections waiting for their next request. A single thread watches them,
+    so they do not hold a worker each, and gives them back to the server when they are readable,
+    or closes them after "keep_alive" seconds
+    """
+
+    def __init__(self, keep_alive, resume):
+        self._keep_alive = keep_alive
+        self._resume = resume
+        self._selector = selectors.DefaultSelector()
+        self._deadlines = {}  # {handler: time to close it}
+        self._pending = []  # Handlers to be registered by the selector thread
+        self._lock = threading.Lock()
+        self._closed = False
+        self._wakeup_read, self._wakeup_write = socket.socketpair()
+        self._selector.register(self._wakeup_read, selectors.EVENT_READ)
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def add(self, handler):
+        with self._lock:
+            if self._closed:
+                handler.close()
+                return
+            self._pending.append(handler)
+        self._wakeup()
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+        self._wakeup()
+        self._thread.join()
+        for handler in list(self._deadlines) + self._pending:
+            handler.close()
+        self._selector.close()
+        self._wakeup_read.close()
+        self._wakeup_write.close()
+
+    def _wakeup(self):
+        try:
+            self._wakeup_write.send(b"\0")
+        except OSError:
+            pass
+
+    def _run(self):
+        while True:
+            timeout = None
+            if self._deadlines:
+                timeout = max(0, min(self._deadlines.values()) - time.time())
+            events = self._selector.select(timeout)
+            with self._lock:
+                if self._closed:
+                    return
+                pending, self._pending = self._pending, []
+            now = time.time()
+            for key, _ in events:
+                if key.fileobj is self._wakeup_read:
+                    self._wakeup_read.recv(4096)
+                    continue
+                self._forget(key.data)
+                self._resume(key.data)
+            for handler in pending:
+                self._selector.register(handler.connection, selectors.EVENT_READ, handler)
+                self._deadlines[handler] = now + self._keep_alive
+            for handler, deadline in list(self._deadlines.items()):
+                if deadline <= now:
+                    self._forget(handler)
+                    handler.close()
+
+    def _forget(self, handler):
+        self._selector.unregister(handler.connection)
+        del self._deadlines[handler]
+
+
+class _ThreadPoolWSGIServer(WSGIServer):
+    request_queue_size = 128
+
+    def __init__(self, server_address, handler_class, workers, keep_alive, quiet):
+        WSGIServer.__init__(self, server_address, handler_class)
+        self.keep_alive = keep_alive
+        self.quiet = quiet
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._idle = _IdleConnections(keep_alive, self._resume) if keep_alive else None
+
+    def process_request(self, request, client_address):
+        try:
+            handler = self.RequestHandlerClass(request, client_address, self)
+        except Exception:
+            self.handle_error(request, client_address)
+            self.shutdown_request(request)
+            return
+        self._resume(handler)
+
+    def _resume(self, handler):
+        self._executor.submit(self._serve, handler)
+
+    def _serve(self, handler):
+        try:
+            keep_open = handler.serve()
+        except Exception:
+            self.handle_error(handler.request, handler.client_address)
+            keep_open = False
+        if keep_open and self._idle is not None:
+            self._idle.add(handler)
+        else:
+            handler.close()
+
+    def server_close(self):
+        WSGIServer.server_close(self)
+        if self._idle is not None:
+            self._idle.close()
+        self._executor.shutdown(wait=False)
+
+
+class ThreadedServer(bottle.ServerAdapter):
+    """ bottle server that handles the requests concurrently in a pool of "workers" threads,
+    keeping the HTTP/1.1 connections open for "keep_alive" seconds between requests. The idle
+    connections do not hold a worker, so there can be many more of them than workers
+    """
+
+    def __init__(self, host="127.0.0.1", port=8080, workers=8, keep_alive=5, **options):
+        super(ThreadedServer, self).__init__(host, port, **options)
+        self.workers = workers
+        self.keep_alive = keep_alive
+        self.server = None
+
+    def run(self, handler):
+        self.server = _ThreadPoolWSGIServer((self.host, self.port), _RequestHandler,
+                                            workers=self.workers, keep_alive=self.keep_alive,
+                                            quiet=self.quiet)
+        self.server.set_app(handler)
+        self.port = self.server.server_port
+        try:
+            self.server.serve_forever()
+        finally:
+            self.server.server_close()
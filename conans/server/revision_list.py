@@ -34,16 +34,16 @@ class RevisionList(object):
         return json.dumps({"revisions": [{"revision": e.revision,
                                           "time": e.time} for e in self._data]})
 
-    def add_revision(self, revision_id):
+    def add_revision(self, revision_id, the_time=None):
         lt = self.latest_revision()
         if lt and lt.revision == revision_id:
             # Each uploaded file calls to update the revision
             return
         index = self._find_revision_index(revision_id)
-        if index:
+        if index is not None:
             self._data.pop(index)
 
-        self._data.append(_RevisionEntry(revision_id, self._now()))
+        self._data.append(_RevisionEntry(revision_id, the_time or self._now()))
 
     @staticmethod
     def _now():
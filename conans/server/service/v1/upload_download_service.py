@@ -3,6 +3,7 @@ import os
 import jwt
 
 from conans.errors import NotFoundException, RequestErrorException
+from conans.server.store.file_checksums import FileChecksums
 from conans.util.log import logger
 from conans.util.files import mkdir
 
@@ -13,6 +14,7 @@ class FileUploadDownloadService(object):
     def __init__(self, updown_auth_manager, base_store_folder):
         self.updown_auth_manager = updown_auth_manager
         self.base_store_folder = base_store_folder
+        self._checksums = FileChecksums(base_store_folder)
 
     def get_file_path(self, filepath, token):
         try:
@@ -42,9 +44,13 @@ class FileUploadDownloadService(object):
                 raise NotFoundException("File not found")
             logger.debug("Put file: %s: %s" % (user, abs_filepath))
             mkdir(os.path.dirname(abs_filepath))
-            if os.path.exists(abs_filepath):
+            try:
                 os.remove(abs_filepath)
+            except OSError:  # It did not exist, or a concurrent upload removed it
+                if os.path.exists(abs_filepath):
+                    raise
             file_saver.save(os.path.dirname(abs_filepath))
+            self._checksums.save(abs_filepath)
 
         except (jwt.ExpiredSignatureError, jwt.DecodeError, AttributeError):
             raise NotFoundException("File not found")
@@ -2,11 +2,13 @@ import os
 
 from bottle import FileUpload, static_file
 
-from conans.errors import RecipeNotFoundException, PackageNotFoundException, NotFoundException
+from conans.errors import RecipeNotFoundException, PackageNotFoundException, NotFoundException, \
+    ForbiddenException, AuthenticationException
+from conans.paths import CONANINFO
 from conans.server.service.common.common import CommonService
 from conans.server.service.mime import get_mime_type
 from conans.server.store.server_store import ServerStore
-from conans.util.files import mkdir
+from conans.util.files import load, mkdir
 
 
 class ConanServiceV2(CommonService):
@@ -40,10 +42,22 @@ class ConanServiceV2(CommonService):
         # FIXME: Check that reference contains revision (MANDATORY TO UPLOAD)
         path = self._server_store.get_conanfile_file_path(reference, filename)
         self._upload_to_path(body, headers, path)
+        self._server_store.save_file_checksums(path)
 
         # If the upload was ok, update the pointer to the latest
         self._server_store.update_last_revision(reference)
 
+    def deploy_recipe_file_checksum(self, headers, reference, filename, auth_user):
+        """ returns True, without receiving the file, if the server already has a file with the
+        same X-Checksum-Sha1 anywhere in the store, put in place as if it had been uploaded
+        """
+        self._authorizer.check_write_conan(auth_user, reference)
+        path = self._server_store.get_conanfile_file_path(reference, filename)
+        if not self._deploy_checksum(headers, path, auth_user):
+            return False
+        self._server_store.update_last_revision(reference)
+        return True
+
     def get_recipe_revisions(self, ref, auth_user):
         self._authorizer.check_read_conan(auth_user, ref)
         root = self._server_store.conan_revisions_root(ref.copy_clear_rev())
@@ -74,6 +88,25 @@ class ConanServiceV2(CommonService):
             raise PackageNotFoundException(pref, print_rev=True)
         return tmp
 
+    def get_packages_info(self, prefs, auth_user):
+        """ returns {pref: (prev, conaninfo.txt contents)} of the binaries that exist, the
+        latest revision of those without PREV
+        """
+        result = {}
+        for pref in prefs:
+            self._authorizer.check_read_conan(auth_user, pref.ref)
+            prev = pref.revision
+            if prev is None:
+                latest = self._server_store.get_last_package_revision(pref)
+                if not latest:
+                    continue
+                prev = latest.revision
+            path = self._server_store.get_package_file_path(
+                pref.copy_with_revs(pref.ref.revision, prev), CONANINFO)
+            if os.path.isfile(path):
+                result[pref] = prev, load(path)
+        return result
+
     # PACKAGE METHODS
     def get_package_file_list(self, pref, auth_user):
         self._authorizer.check_read_conan(auth_user, pref.ref)
@@ -99,9 +132,38 @@ class ConanServiceV2(CommonService):
             raise RecipeNotFoundException(pref.ref)
         path = self._server_store.get_package_file_path(pref, filename)
         self._upload_to_path(body, headers, path)
+        self._server_store.save_file_checksums(path)
 
         # If the upload was ok, update the pointer to the latest
         self._server_store.update_last_package_revision(pref)
+        if filename == CONANINFO:
+            self._server_store.update_package_index(path)
+
+    def deploy_package_file_checksum(self, headers, pref, filename, auth_user):
+        self._authorizer.check_write_conan(auth_user, pref.ref)
+        if not os.path.exists(self._server_store.export(pref.ref)):
+            raise RecipeNotFoundException(pref.ref)
+        path = self._server_store.get_package_file_path(pref, filename)
+        if not self._deploy_checksum(headers, path, auth_user):
+            return False
+        self._server_store.update_last_package_revision(pref)
+        if filename == CONANINFO:
+            self._server_store.update_package_index(path)
+        return True
+
+    def _deploy_checksum(self, headers, path, auth_user):
+        """ only the files of the references the user can read are deployed, otherwise the
+        checksums would give access to the files of any reference
+        """
+        def readable_ref(ref):
+            try:
+                self._authorizer.check_read_conan(auth_user, ref)
+            except (ForbiddenException, AuthenticationException):
+                return False
+            return True
+
+        sha1 = headers.get("X-Checksum-Sha1")
+        return bool(sha1) and self._server_store.deploy_file_checksum(path, sha1, readable_ref)
 
     # Misc
     @staticmethod
@@ -109,8 +171,11 @@ class ConanServiceV2(CommonService):
         file_saver = FileUpload(body, None,
                                 filename=os.path.basename(path),
                                 headers=headers)
-        if os.path.exists(path):
+        # Other uploads could be creating the folder or replacing the file concurrently
+        mkdir(os.path.dirname(path))
+        try:
             os.unlink(path)
-        if not os.path.exists(os.path.dirname(path)):
-            mkdir(os.path.dirname(path))
+        except OSError:
+            if os.path.exists(path):
+                raise
         file_saver.save(os.path.dirname(path))
@@ -1,10 +1,13 @@
 import os
+import shutil
 
 import fasteners
 
 from conans.client.tools.env import no_op
 from conans.errors import NotFoundException
-from conans.util.files import md5sum, path_exists, relative_dirs, rmdir
+from conans.server.store.file_checksums import FileChecksums
+from conans.util.files import mkdir, path_exists, relative_dirs, rmdir
+from conans.util.log import logger
 
 
 class ServerDiskAdapter(object):
@@ -18,6 +21,7 @@ class ServerDiskAdapter(object):
         # URLs are generated removing this base path
         self.updown_auth_manager = updown_auth_manager
         self._store_folder = base_storage_path
+        self._checksums = FileChecksums(base_storage_path)
 
     # ONLY USED BY APIV1
     def get_download_urls(self, paths, user=None):
@@ -68,7 +72,45 @@ class ServerDiskAdapter(object):
     def get_snapshot(self, absolute_path="", files_subset=None):
         """returns a dict with the filepaths and md5"""
         abs_paths = self._get_paths(absolute_path, files_subset)
-        return {filepath: md5sum(filepath) for filepath in abs_paths}
+        return {filepath: self._checksums.load(filepath)["md5"] for filepath in abs_paths}
+
+    def get_checksums(self, path):
+        """returns the md5 and sha1 of the file, or None if it does not exist"""
+        if not os.path.isfile(path):
+            return None
+        return self._checksums.load(path)
+
+    def save_checksums(self, path):
+        return self._checksums.save(path)
+
+    def deploy_checksum(self, path, sha1, readable=None):
+        """ puts in path any file of the store with the given sha1, returns False if there is
+        none. It is a hard link if possible, the files of the store are never modified, the
+        uploads replace them. The readable(candidate) callable filters the files that can be used
+        """
+        checksums = self.get_checksums(path)
+        if checksums and checksums["sha1"] == sha1:
+            return True
+        for candidate in self._checksums.find(sha1):
+            if candidate == path or (readable is not None and not readable(candidate)):
+                continue
+            checksums = self.get_checksums(candidate)
+            if not checksums or checksums["sha1"] != sha1:  # Changed or removed since stored
+                continue
+            mkdir(os.path.dirname(path))
+            try:
+                if os.path.lexists(path):
+                    os.remove(path)
+                try:
+                    os.link(candidate, path)
+                except OSError:
+                    shutil.copy2(candidate, path)
+            except (IOError, OSError) as e:  # The candidate could be removed concurrently
+                logger.debug("Cannot deploy %s to %s: %s" % (candidate, path, str(e)))
+                continue
+            self._checksums.save(path, checksums)
+            return True
+        return False
 
     def get_file_list(self, absolute_path="", files_subset=None):
         abs_paths = self._get_paths(absolute_path, files_subset)
@@ -79,12 +121,14 @@ class ServerDiskAdapter(object):
         if not path_exists(path, self._store_folder):
             raise NotFoundException("")
         rmdir(path)
+        self._checksums.forget(path)
 
     def delete_file(self, path):
         """Delete files from bucket. Path already contains base dir"""
         if not path_exists(path, self._store_folder):
             raise NotFoundException("")
         os.remove(path)
+        self._checksums.forget(path)
 
     def path_exists(self, path):
         return os.path.exists(path)
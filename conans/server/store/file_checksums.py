@@ -0,0 +1,94 @@
+import os
+import sqlite3
+from contextlib import contextmanager
+
+from conans.util.files import file_checksums
+from conans.util.log import logger
+
+CHECKSUMS_FILE = ".conan_server_checksums.db"
+CHECKSUMS_TABLE = "checksums"
+
+
+class FileChecksums(object):
+    """ md5 and sha1 of the files of the server store, kept in a sqlite database in the root of
+    the store, created the first time it is needed. They are computed when the files are
+    uploaded, so the snapshots and checksum deploys do not need to read the files again. Every
+    entry is stored with the size and modification time of the file, and computed again if the
+    file changes.
+    """
+
+    def __init__(self, store_folder):
+        self._store_folder = store_folder
+        self._dbfile = os.path.join(store_folder, CHECKSUMS_FILE)
+
+    @contextmanager
+    def _connect(self):
+        connection = sqlite3.connect(self._dbfile, timeout=30)
+        try:
+            with connection:  # A transaction, committed if there are no errors
+                connection.execute("create table if not exists %s (path TEXT PRIMARY KEY, "
+                                   "size INTEGER, mtime INTEGER, md5 TEXT, sha1 TEXT)"
+                                   % CHECKSUMS_TABLE)
+                connection.execute("create index if not exists %s_sha1 on %s (sha1)"
+                                   % (CHECKSUMS_TABLE, CHECKSUMS_TABLE))
+                yield connection
+        finally:
+            connection.close()
+
+    def _key(self, path):
+        return os.path.relpath(path, self._store_folder).replace("\\", "/")
+
+    def save(self, path, checksums=None):
+        """ stores the checksums of the file, computed if they are not given, returns
+        {"md5": ..., "sha1": ...}
+        """
+        checksums = checksums or file_checksums(path, ("md5", "sha1"))
+        stat = os.stat(path)
+        try:
+            with self._connect() as connection:
+                connection.execute("insert or replace into %s (path, size, mtime, md5, sha1) "
+                                   "values (?, ?, ?, ?, ?)" % CHECKSUMS_TABLE,
+                                   (self._key(path), stat.st_size, stat.st_mtime_ns,
+                                    checksums["md5"], checksums["sha1"]))
+        except sqlite3.Error as e:
+            logger.error("Could not store the checksums of %s: %s" % (path, str(e)))
+        return checksums
+
+    def load(self, path):
+        """ the stored checksums of the file, computed and stored only if they were not computed
+        before or the file has changed since then
+        """
+        try:
+            stat = os.stat(path)
+            with self._connect() as connection:
+                row = connection.execute("select size, mtime, md5, sha1 from %s where path=?"
+                                         % CHECKSUMS_TABLE, (self._key(path), )).fetchone()
+            if row and row[0] == stat.st_size and row[1] == stat.st_mtime_ns:
+                return {"md5": row[2], "sha1": row[3]}
+        except sqlite3.Error as e:
+            logger.error("Could not read the checksums of %s: %s" % (path, str(e)))
+        return self.save(path)
+
+    def find(self, sha1):
+        """ the files of the store that had the given sha1 when they were stored, they might
+        have changed since then
+        """
+        try:
+            with self._connect() as connection:
+                rows = connection.execute("select path from %s where sha1=?" % CHECKSUMS_TABLE,
+                                          (sha1, )).fetchall()
+        except sqlite3.Error as e:
+            logger.error("Could not search the checksums %s: %s" % (sha1, str(e)))
+            return []
+        return [os.path.join(self._store_folder, row[0]) for row in rows]
+
+    def forget(self, path):
+        """ removes the checksums of the file, or all the files in the folder
+        """
+        key = self._key(path)
+        try:
+            with self._connect() as connection:
+                connection.execute("delete from %s where path=? or substr(path, 1, ?)=?"
+                                   % CHECKSUMS_TABLE, (key, len(key) + 1, key + "/"))
+        except sqlite3.Error as e:
+            logger.error("Could not remove the checksums of %s: %s" % (path, str(e)))
@@ -0,0 +1,132 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import fasteners
+
+from conans.server.revision_list import RevisionList
+from conans.util.log import logger
+
+LOG_SUFFIX = ".log"
+# The log is merged into the revisions file when it grows over this size (around 50 revisions)
+_COMPACT_SIZE = 4096
+# Number of revisions files whose contents are kept in memory
+_CACHE_SIZE = 4096
+
+
+def _file_stat(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+class RevisionFiles(object):
+    """ The revisions.txt files of the store, with the RevisionList of a recipe or a package.
+
+    The new revisions are appended to a "revisions.txt.log" next to the file, one JSON line
+    each, instead of rewriting the whole list, and the log is merged into the revisions.txt when
+    it grows. The lists are kept in memory while the files do not change, so checking the latest
+    revision, as every uploaded file does, does not read nor lock any file. The writes still
+    lock the file, but just to append a line.
+    """
+
+    def __init__(self):
+        self._cache = OrderedDict()  # {path: (stats, RevisionList)}, least recently used first
+        self._cache_lock = threading.Lock()
+        # The file locks do not exclude the threads of the same process
+        self._write_lock = threading.Lock()
+
+    @staticmethod
+    def _stats(path):
+        return _file_stat(path), _file_stat(path + LOG_SUFFIX)
+
+    @contextmanager
+    def _lock(self, path):
+        with self._write_lock:
+            with fasteners.InterProcessLock(path + ".lock"):
+                yield
+
+    def load(self, path):
+        """ the RevisionList of the file, empty if it does not exist. It is shared, so it must
+        not be modified
+        """
+        stats = self._stats(path)
+        if stats == (None, None):
+            return RevisionList()
+        with self._cache_lock:
+            cached = self._cache.pop(path, None)
+            if cached is not None and cached[0] == stats:
+                self._cache[path] = cached
+                return cached[1]
+        with self._lock(path):
+            stats = self._stats(path)
+            rev_list = self._read(path)
+        with self._cache_lock:
+            self._cache[path] = stats, rev_list
+            while len(self._cache) > _CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return rev_list
+
+    def add(self, path, revision):
+        """ makes the revision the latest one, returns False if it was already """
+        latest = self.load(path).latest_revision()
+        if latest and latest.revision == revision:
+            return False
+        rev_list = RevisionList()
+        rev_list.add_revision(revision)
+        entry = rev_list.latest_revision()
+        log_path = path + LOG_SUFFIX
+        with self._lock(path):
+            with open(log_path, "a") as f:
+                f.write(json.dumps({"revision": entry.revision, "time": entry.time}) + "\n")
+            if os.path.getsize(log_path) >= _COMPACT_SIZE:
+                self._write(path, self._read(path))
+        return True
+
+    def remove(self, path, revision):
+        if self._stats(path) == (None, None):
+            return
+        with self._lock(path):
+            rev_list = self._read(path)
+            rev_list.remove_revision(revision)
+            self._write(path, rev_list)
+
+    @staticmethod
+    def _read(path):
+        """ the revisions of the file plus the ones of its log. Applying again a log already
+        merged in the file gives the same list, so a log left by an interrupted compaction is
+        harmless
+        """
+        try:
+            with open(path) as f:
+                rev_list = RevisionList.loads(f.read())
+        except (IOError, OSError):
+            rev_list = RevisionList()
+        try:
+            with open(path + LOG_SUFFIX) as f:
+                lines = f.read().splitlines()
+        except (IOError, OSError):
+            return rev_list
+        for line in lines:
+            try:
+                entry = json.loads(line)
+                rev_list.add_revision(entry["revision"], entry["time"])
+            except (ValueError, KeyError, TypeError):
+                logger.error("Invalid line in %s%s: %s" % (path, LOG_SUFFIX, line))
+        return rev_list
+
+    @staticmethod
+    def _write(path, rev_list):
+        """ replaces the file, without the log, atomically for the readers """
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.write(rev_list.dumps())
+        os.replace(tmp_path, path)
+        try:
+            os.remove(path + LOG_SUFFIX)
+        except OSError:
+            pass
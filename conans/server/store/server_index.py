@@ -0,0 +1,136 @@
+import json
+import os
+import sqlite3
+from contextlib import contextmanager
+
+from conans.util.log import logger
+
+RECIPES_TABLE = "recipes"
+PACKAGES_TABLE = "packages"
+
+
+class ServerIndex(object):
+    """ sqlite index of the server store, with the folders of all the recipe revisions
+    ("name/version/user/channel/rrev") and the search summaries of the latest revision of their
+    packages, so the searches do not need to walk the store and parse every conaninfo.txt.
+
+    The index is built walking the store the first time it is read, and then it is updated by
+    the ServerStore every time something is uploaded or removed. If the database cannot be used,
+    the read methods return None and the callers read the store directly. A failed update
+    removes the database, so it is built again instead of returning stale data. Removing the
+    database file is also the way to re-index a store modified by other means.
+    """
+
+    def __init__(self, dbfile, entries):
+        """ entries() returns the ([recipe_folder], [(recipe_folder, package_id, info)]) of the
+        store, to build the index
+        """
+        self._dbfile = dbfile
+        self._entries = entries
+
+    @contextmanager
+    def _connect(self, write=False):
+        connection = sqlite3.connect(self._dbfile, timeout=30, isolation_level=None)
+        try:
+            if not self._exists(connection):
+                with self._transaction(connection, write=True):
+                    if not self._exists(connection):
+                        self._build(connection)
+            with self._transaction(connection, write):
+                yield connection
+        finally:
+            connection.close()
+
+    @staticmethod
+    @contextmanager
+    def _transaction(connection, write):
+        connection.execute("begin immediate" if write else "begin")
+        try:
+            yield
+        except BaseException:
+            connection.execute("rollback")
+            raise
+        connection.execute("commit")
+
+    @staticmethod
+    def _exists(connection):
+        return connection.execute("select name from sqlite_master where type='table' and name=?",
+                                  (PACKAGES_TABLE, )).fetchone() is not None
+
+    def _build(self, connection):
+        connection.execute("create table %s (folder TEXT PRIMARY KEY)" % RECIPES_TABLE)
+        connection.execute("create table %s (folder TEXT, package_id TEXT, info TEXT, "
+                           "PRIMARY KEY (folder, package_id))" % PACKAGES_TABLE)
+        recipes, packages = self._entries()
+        connection.executemany("insert into %s (folder) values (?)" % RECIPES_TABLE,
+                               [(folder, ) for folder in recipes])
+        connection.executemany("insert into %s (folder, package_id, info) values (?, ?, ?)"
+                               % PACKAGES_TABLE,
+                               [(folder, package_id, json.dumps(info))
+                                for folder, package_id, info in packages])
+
+    def _update(self, *statements):
+        """ executes the (sql, parameters) statements in a transaction, if the index exists
+        """
+        if not os.path.isfile(self._dbfile):
+            return  # It will be built with the current contents of the store when it is read
+        try:
+            with self._connect(write=True) as connection:
+                for sql, parameters in statements:
+                    connection.execute(sql, parameters)
+        except Exception as e:
+            logger.error("Server index error, it will be created again: %s" % str(e))
+            self.reset()
+
+    def reset(self):
+        """ removes the index, it will be built again the next time it is read """
+        try:
+            os.remove(self._dbfile)
+        except OSError:
+            pass
+
+    def recipe_folders(self):
+        try:
+            with self._connect() as connection:
+                rows = connection.execute("select folder from %s" % RECIPES_TABLE).fetchall()
+                return [row[0] for row in rows]
+        except Exception as e:
+            logger.error("Server index error, listing the store folders: %s" % str(e))
+            return None
+
+    def package_infos(self, folder):
+        """ the {package_id: info} of the packages of the recipe revision folder """
+        try:
+            with self._connect() as connection:
+                rows = connection.execute("select package_id, info from %s where folder=? "
+                                          "order by package_id" % PACKAGES_TABLE,
+                                          (folder, )).fetchall()
+                return {package_id: json.loads(info) for package_id, info in rows}
+        except Exception as e:
+            logger.error("Server index error, reading the packages info: %s" % str(e))
+            return None
+
+    def add_recipe(self, folder):
+        self._update(("insert or ignore into %s (folder) values (?)" % RECIPES_TABLE, (folder, )))
+
+    def remove_recipes(self, prefix):
+        """ removes the recipe revisions, and their packages, whose folder starts with prefix
+        """
+        self._update(*[("delete from %s where substr(folder, 1, ?)=?" % table,
+                        (len(prefix), prefix)) for table in (RECIPES_TABLE, PACKAGES_TABLE)])
+
+    def set_package(self, folder, package_id, info):
+        """ info None removes the package """
+        if info is None:
+            self._update(("delete from %s where folder=? and package_id=?" % PACKAGES_TABLE,
+                          (folder, package_id)))
+        else:
+            self._update(("insert or replace into %s (folder, package_id, info) values (?, ?, ?)"
+                          % PACKAGES_TABLE, (folder, package_id, json.dumps(info))))
+
+    def remove_packages(self, folder, package_ids=None):
+        if package_ids is None:
+            self._update(("delete from %s where folder=?" % PACKAGES_TABLE, (folder, )))
+        else:
+            self._update(*[("delete from %s where folder=? and package_id=?" % PACKAGES_TABLE,
+                            (folder, package_id)) for package_id in package_ids])
@@ -3,11 +3,17 @@ from os.path import join, normpath, relpath
 
 from conans import DEFAULT_REVISION_V1
 from conans.errors import ConanException, PackageNotFoundException, RecipeNotFoundException
+from conans.model.info import ConanInfo
 from conans.model.ref import ConanFileReference, PackageReference
-from conans.paths import EXPORT_FOLDER, PACKAGES_FOLDER
+from conans.paths import CONANINFO, EXPORT_FOLDER, PACKAGES_FOLDER
 from conans.server.revision_list import RevisionList
+from conans.server.store.revision_files import LOG_SUFFIX, RevisionFiles
+from conans.server.store.server_index import ServerIndex
+from conans.util.files import list_folder_subdirs, load
+from conans.util.log import logger
 
 REVISIONS_FILE = "revisions.txt"
+INDEX_FILE = ".conan_server_index.db"
 
 
 class ServerStore(object):
@@ -15,6 +21,8 @@ class ServerStore(object):
     def __init__(self, storage_adapter):
         self._storage_adapter = storage_adapter
         self._store_folder = storage_adapter._store_folder
+        self._index = ServerIndex(join(self._store_folder, INDEX_FILE), self._index_entries)
+        self._revision_files = RevisionFiles()
 
     @property
     def store(self):
@@ -61,6 +69,123 @@ class ServerStore(object):
     def path_exists(self, path):
         return self._storage_adapter.path_exists(path)
 
+    def get_file_checksums(self, path):
+        """Returns the {"md5": ..., "sha1": ...} of the file, None if it doesn't exist"""
+        return self._storage_adapter.get_checksums(path)
+
+    def save_file_checksums(self, path):
+        return self._storage_adapter.save_checksums(path)
+
+    def deploy_file_checksum(self, path, sha1, readable_ref=None):
+        """Puts in path a file of the store with that sha1, False if there is none. Only the
+        files of the references accepted by readable_ref(ref) are used"""
+        readable = None
+        if readable_ref is not None:
+            def readable(candidate):
+                tokens = relpath(candidate, self.store).replace("\\", "/").split("/")
+                try:
+                    ref = ConanFileReference(*tokens[:5])
+                except (ConanException, TypeError):  # Not a file of a recipe revision
+                    return False
+                return readable_ref(ref)
+        return self._storage_adapter.deploy_checksum(path, sha1, readable)
+
+    # ############ SEARCH INDEX
+    def _index_entries(self):
+        recipes = list_folder_subdirs(basedir=self.store, level=5)
+        packages = []
+        for folder in recipes:
+            ref = ConanFileReference(*folder.split("/"))
+            for package_id in list_folder_subdirs(self.packages(ref), level=1):
+                info = self._package_search_info(PackageReference(ref, package_id))
+                if info is not None:
+                    packages.append((folder, package_id, info))
+        return recipes, packages
+
+    @staticmethod
+    def _index_folder(ref):
+        return "%s/%s" % (ref.dir_repr(), ref.revision)
+
+    def _package_search_info(self, pref):
+        """ the search summary of the latest revision of the package, None if it has no
+        revisions or conaninfo.txt
+        """
+        try:
+            revision_entry = self.get_last_package_revision(pref)
+            if not revision_entry:
+                return None
+            pref = PackageReference(pref.ref, pref.id, revision_entry.revision)
+            info_path = os.path.join(self.package(pref), CONANINFO)
+            if not os.path.exists(info_path):
+                return None
+            return self._load_search_info(info_path)
+        except Exception as exc:  # FIXME: Too wide
+            logger.error("Package %s has no ConanInfo file" % str(pref))
+            if str(exc):
+                logger.error(str(exc))
+            return None
+
+    @staticmethod
+    def _load_search_info(info_path):
+        content = load(info_path)
+        info = ConanInfo.loads(content)
+        # From Conan 1.48 the conaninfo.txt is sent raw.
+        result = {"content": content}
+        # FIXME: This could be removed in the conan_server, Artifactory should keep it
+        #        to guarantee compatibility with old conan clients.
+        result.update(info.serialize_min())
+        return result
+
+    def list_recipe_folders(self):
+        """Returns the "name/version/user/channel/rrev" folders of all the recipe revisions"""
+        folders = self._index.recipe_folders()
+        if folders is None:
+            folders = list_folder_subdirs(basedir=self.store, level=5)
+        return folders
+
+    def get_package_search_infos(self, ref):
+        """Returns the {package_id: info} of the latest revisions of the packages of the
+        recipe revision"""
+        assert ref.revision is not None, "BUG: server store needs RREV to search packages"
+        infos = self._index.package_infos(self._index_folder(ref))
+        if infos is None:
+            infos = {}
+            for package_id in list_folder_subdirs(self.packages(ref), level=1):
+                info = self._package_search_info(PackageReference(ref, package_id))
+                if info is not None:
+                    infos[package_id] = info
+        return infos
+
+    def update_package_index(self, info_path):
+        """Updates the search index with the conaninfo.txt of a package that has just been
+        uploaded. The uploads never remove packages from the index"""
+        tokens = relpath(info_path, self.store).replace("\\", "/").split("/")
+        if len(tokens) != 9 or tokens[5] != PACKAGES_FOLDER or tokens[8] != CONANINFO:
+            return
+        ref = ConanFileReference(*tokens[:5])
+        try:
+            info = self._load_search_info(info_path)
+        except Exception as exc:
+            logger.error("Package %s:%s has an invalid ConanInfo file: %s"
+                         % (ref.full_str(), tokens[6], str(exc)))
+            return
+        self._index.set_package(self._index_folder(ref), tokens[6], info)
+
+    def update_index(self, path):
+        """Updates the search index after the file or folder of the store has been modified"""
+        tokens = relpath(path, self.store).replace("\\", "/").split("/")
+        if len(tokens) < 5 or tokens[0] == "..":
+            return
+        ref = ConanFileReference(*tokens[:5])
+        if os.path.isdir(self.base_folder(ref)):
+            self._index.add_recipe(self._index_folder(ref))
+        else:
+            self._index.remove_recipes(self._index_folder(ref))
+            return
+        if len(tokens) > 6 and tokens[5] == PACKAGES_FOLDER:
+            info = self._package_search_info(PackageReference(ref, tokens[6]))
+            self._index.set_package(self._index_folder(ref), tokens[6], info)
+
     # ############ SNAPSHOTS (APIv1)
     def get_recipe_snapshot(self, ref):
         """Returns a {filepath: md5} """
@@ -95,15 +220,16 @@ class ServerStore(object):
         return file_list
 
     def _delete_empty_dirs(self, ref):
-        lock_files = set([REVISIONS_FILE, "%s.lock" % REVISIONS_FILE])
+        lock_files = set([REVISIONS_FILE, "%s.lock" % REVISIONS_FILE, REVISIONS_FILE + LOG_SUFFIX])
 
         ref_path = normpath(join(self.store, ref.dir_repr()))
         if ref.revision:
             ref_path = join(ref_path, ref.revision)
         for _ in range(4 if not ref.revision else 5):
             if os.path.exists(ref_path):
-                if set(os.listdir(ref_path)) == lock_files:
-                    for lock_file in lock_files:
+                files = set(os.listdir(ref_path))
+                if files and files.issubset(lock_files):
+                    for lock_file in files:
                         os.unlink(os.path.join(ref_path, lock_file))
                 try:  # Take advantage that os.rmdir does not delete non-empty dirs
                     os.rmdir(ref_path)
@@ -116,9 +242,11 @@ class ServerStore(object):
         assert isinstance(ref, ConanFileReference)
         if not ref.revision:
             self._storage_adapter.delete_folder(self.conan_revisions_root(ref))
+            self._index.remove_recipes("%s/" % ref.dir_repr())
         else:
             self._storage_adapter.delete_folder(self.base_folder(ref))
             self._remove_revision_from_index(ref)
+            self._index.remove_recipes(self._index_folder(ref))
         self._delete_empty_dirs(ref)
 
     def remove_packages(self, ref, package_ids_filter):
@@ -128,12 +256,14 @@ class ServerStore(object):
         if not package_ids_filter:  # Remove all packages
             packages_folder = self.packages(ref)
             self._storage_adapter.delete_folder(packages_folder)
+            self._index.remove_packages(self._index_folder(ref))
         else:
             for package_id in package_ids_filter:
                 pref = PackageReference(ref, package_id)
                 # Remove all package revisions
                 package_folder = self.package_revisions_root(pref)
                 self._storage_adapter.delete_folder(package_folder)
+            self._index.remove_packages(self._index_folder(ref), package_ids_filter)
         self._delete_empty_dirs(ref)
 
     def remove_package(self, pref):
@@ -143,24 +273,28 @@ class ServerStore(object):
         package_folder = self.package(pref)
         self._storage_adapter.delete_folder(package_folder)
         self._remove_package_revision_from_index(pref)
+        self.update_index(package_folder)
 
     def remove_all_packages(self, ref):
         assert ref.revision is not None, "BUG: server store needs RREV remove_all_packages"
         assert isinstance(ref, ConanFileReference)
         packages_folder = self.packages(ref)
         self._storage_adapter.delete_folder(packages_folder)
+        self._index.remove_packages(self._index_folder(ref))
 
     def remove_conanfile_files(self, ref, files):
         subpath = self.export(ref)
         for filepath in files:
             path = join(subpath, filepath)
             self._storage_adapter.delete_file(path)
+        self.update_index(subpath)
 
     def remove_package_files(self, pref, files):
         subpath = self.package(pref)
         for filepath in files:
             path = join(subpath, filepath)
             self._storage_adapter.delete_file(path)
+        self.update_index(subpath)
 
     # ONLY APIv1 URLS
     # ############ DOWNLOAD URLS
@@ -247,24 +381,22 @@ class ServerStore(object):
         assert(isinstance(ref, ConanFileReference))
         rev_file_path = self._recipe_revisions_file(ref)
         self._update_last_revision(rev_file_path, ref)
+        self._index.add_recipe(self._index_folder(ref))
 
     def update_last_package_revision(self, pref):
         assert(isinstance(pref, PackageReference))
         rev_file_path = self._package_revisions_file(pref)
-        self._update_last_revision(rev_file_path, pref)
+        if self._update_last_revision(rev_file_path, pref):
+            # Only a package revision not stored by an upload has its conaninfo.txt already
+            info_path = os.path.join(self.package(pref), CONANINFO)
+            if os.path.exists(info_path):
+                self.update_package_index(info_path)
 
     def _update_last_revision(self, rev_file_path, ref):
-        if self._storage_adapter.path_exists(rev_file_path):
-            rev_file = self._storage_adapter.read_file(rev_file_path,
-                                                       lock_file=rev_file_path + ".lock")
-            rev_list = RevisionList.loads(rev_file)
-        else:
-            rev_list = RevisionList()
+        """ returns True if the revision was not the latest one """
         if ref.revision is None:
             raise ConanException("Invalid revision for: %s" % ref.full_str())
-        rev_list.add_revision(ref.revision)
-        self._storage_adapter.write_file(rev_file_path, rev_list.dumps(),
-                                         lock_file=rev_file_path + ".lock")
+        return self._revision_files.add(rev_file_path, ref.revision)
 
     def get_package_revisions(self, pref):
         """Returns a RevisionList"""
@@ -281,13 +413,7 @@ class ServerStore(object):
         return ret
 
     def _get_revisions_list(self, rev_file_path):
-        if self._storage_adapter.path_exists(rev_file_path):
-            rev_file = self._storage_adapter.read_file(rev_file_path,
-                                                       lock_file=rev_file_path + ".lock")
-            rev_list = RevisionList.loads(rev_file)
-            return rev_list
-        else:
-            return RevisionList()
+        return self._revision_files.load(rev_file_path)
 
     def _get_latest_revision(self, rev_file_path):
         rev_list = self._get_revisions_list(rev_file_path)
@@ -295,11 +421,8 @@ class ServerStore(object):
             # FIXING BREAK MIGRATION NOT CREATING INDEXES
             # BOTH FOR RREV AND PREV THE FILE SHOULD BE CREATED WITH "0" REVISION
             if self.path_exists(os.path.join(os.path.dirname(rev_file_path), DEFAULT_REVISION_V1)):
-                rev_list = RevisionList()
-                rev_list.add_revision(DEFAULT_REVISION_V1)
-                self._storage_adapter.write_file(rev_file_path, rev_list.dumps(),
-                                                 lock_file=rev_file_path + ".lock")
-                return rev_list.latest_revision()
+                self._revision_files.add(rev_file_path, DEFAULT_REVISION_V1)
+                return self._get_revisions_list(rev_file_path).latest_revision()
             else:
                 return None
         return rev_list.latest_revision()
@@ -315,44 +438,15 @@ class ServerStore(object):
         return join(p_folder, REVISIONS_FILE)
 
     def get_revision_time(self, ref):
-        try:
-            rev_list = self._load_revision_list(ref)
-        except IOError:
-            return None
+        rev_list = self._get_revisions_list(self._recipe_revisions_file(ref))
         return rev_list.get_time(ref.revision)
 
     def get_package_revision_time(self, pref):
-        try:
-            rev_list = self._load_package_revision_list(pref)
-        except (IOError, OSError):
-            return None
-
+        rev_list = self._get_revisions_list(self._package_revisions_file(pref))
         return rev_list.get_time(pref.revision)
 
     def _remove_revision_from_index(self, ref):
-        rev_list = self._load_revision_list(ref)
-        rev_list.remove_revision(ref.revision)
-        self._save_revision_list(rev_list, ref)
+        self._revision_files.remove(self._recipe_revisions_file(ref), ref.revision)
 
     def _remove_package_revision_from_index(self, pref):
-        rev_list = self._load_package_revision_list(pref)
-        rev_list.remove_revision(pref.revision)
-        self._save_package_revision_list(rev_list, pref)
-
-    def _load_revision_list(self, ref):
-        path = self._recipe_revisions_file(ref)
-        rev_file = self._storage_adapter.read_file(path, lock_file=path + ".lock")
-        return RevisionList.loads(rev_file)
-
-    def _save_revision_list(self, rev_list, ref):
-        path = self._recipe_revisions_file(ref)
-        self._storage_adapter.write_file(path, rev_list.dumps(), lock_file=path + ".lock")
-
-    def _save_package_revision_list(self, rev_list, pref):
-        path = self._package_revisions_file(pref)
-        self._storage_adapter.write_file(path, rev_list.dumps(), lock_file=path + ".lock")
-
-    def _load_package_revision_list(self, pref):
-        path = self._package_revisions_file(pref)
-        rev_file = self._storage_adapter.read_file(path, lock_file=path + ".lock")
-        return RevisionList.loads(rev_file)
+        self._revision_files.remove(self._package_revisions_file(pref), pref.revision)
@@ -6,9 +6,11 @@ from collections import Counter
 from threading import Thread
 
 from bottle import static_file, request
+from mock import patch
 import pytest
 
 from conans.client.downloaders.cached_file_downloader import CachedFileDownloader
+from conans.model.ref import ConanFileReference
 from conans.test.assets.genconanfile import GenConanfile
 from conans.test.utils.test_files import temp_folder
 from conans.test.utils.tools import TestClient, StoppableThreadBottle
@@ -68,6 +70,41 @@ class DownloadCacheTest(unittest.TestCase):
         content = load(log_trace_file)
         self.assertEqual(0, content.count('"_action": "DOWNLOAD"'))
 
+    def test_cache_command(self):
+        client = TestClient(default_server_user=True)
+        client.save({"conanfile.py": GenConanfile()})
+        client.run("create . mypkg/0.1@user/testing")
+        client.run("upload * --all --confirm")
+        cache_folder = temp_folder()
+        client.run('config set storage.download_cache="%s"' % cache_folder)
+        client.run("remove * -f")
+        client.run("install mypkg/0.1@user/testing")
+        client.run("remove * -f")
+        client.run("install mypkg/0.1@user/testing")
+        client.run("cache stats")
+        entries = len([f for f in os.listdir(cache_folder) if f != "locks"])
+        self.assertIn("Entries: %s" % entries, client.out)
+        self.assertNotIn("Hits: 0", client.out)
+        self.assertNotIn("Misses: 0", client.out)
+
+        client.run("cache prune", assert_error=True)
+        self.assertIn("Specify the maximum size of the download cache", client.out)
+        client.run("cache prune --max-size=0")
+        self.assertIn("Removed %s entries from the download cache" % entries, client.out)
+        # The lock files are kept, other processes could be waiting for them
+        self.assertEqual(entries, len([f for f in os.listdir(os.path.join(cache_folder, "locks"))
+                                       if f not in ("stats", "stats.json")]))
+        client.run("cache stats")
+        self.assertIn("Entries: 0", client.out)
+        self.assertIn("Size: 0", client.out)
+
+        client.run("config set storage.download_cache_max_size=1KB")
+        client.run("cache stats")
+        self.assertIn("Max size: 1024", client.out)
+        client.run("config rm storage.download_cache")
+        client.run("cache stats", assert_error=True)
+        self.assertIn("The download cache is not enabled", client.out)
+
     @pytest.mark.skipif(get_env("TESTING_REVISIONS_ENABLED", False), reason="No sense with revs")
     def test_corrupted_cache(self):
         # This test only works without revisions, because v1 has md5 file checksums, but v2 nop
@@ -387,3 +424,115 @@ class CachedDownloaderUnitTest(unittest.TestCase):
         self.cached_downloader.download("testurl", file_path)
         self.assertEqual(self.file_downloader.calls["testurl"], 1)
         self.assertEqual("testurl", load(file_path))
+
+
+    def test_stats_and_prune(self):
+        folder = temp_folder()
+        for url in ("testurl1", "testurl2", "testurl3"):
+            self.cached_downloader.download(url, os.path.join(folder, url))
+        self.cached_downloader.download("testurl1", os.path.join(folder, "testurl1"))
+        stats = self.cached_downloader.stats()
+        self.assertEqual(3, stats["entries"])
+        self.assertEqual(len("testurl1") * 3, stats["size"])
+        self.assertEqual(1, stats["hits"])
+        self.assertEqual(3, stats["misses"])
+
+        # Make testurl2 the least recently used
+        cache_folder = self.cached_downloader._cache_folder
+        h2 = self.cached_downloader._get_hash("testurl2")
+        os.utime(os.path.join(cache_folder, "locks", h2), (1, 1))
+        removed = self.cached_downloader.prune(len("testurl1") * 2)
+        self.assertEqual([h2], removed)
+        self.assertTrue(os.path.exists(os.path.join(cache_folder, "locks", h2)))
+        self.assertEqual(2, self.cached_downloader.stats()["entries"])
+        self.cached_downloader.download("testurl2", os.path.join(folder, "testurl2"))
+        self.assertEqual(2, self.file_downloader.calls["testurl2"])
+
+    def test_max_size(self):
+        cache_folder = temp_folder()
+        cached_downloader = CachedFileDownloader(cache_folder, self.file_downloader,
+                                                 max_size=len("testurl1") * 2)
+        folder = temp_folder()
+        for url in ("testurl1", "testurl2", "testurl3"):
+            cached_downloader.download(url, os.path.join(folder, url))
+            time.sleep(0.01)  # Different access times
+        stats = cached_downloader.stats()
+        self.assertEqual(2, stats["entries"])
+        self.assertEqual(len("testurl1") * 2, stats["size"])
+        # The least recently used was evicted, the others are still cached
+        cached_downloader.download("testurl3", os.path.join(folder, "testurl3"))
+        cached_downloader.download("testurl2", os.path.join(folder, "testurl2"))
+        cached_downloader.download("testurl1", os.path.join(folder, "testurl1"))
+        self.assertEqual(1, self.file_downloader.calls["testurl3"])
+        self.assertEqual(1, self.file_downloader.calls["testurl2"])
+        self.assertEqual(2, self.file_downloader.calls["testurl1"])
+
+    def test_max_size_not_listed_every_miss(self):
+        cached_downloader = CachedFileDownloader(temp_folder(), self.file_downloader,
+                                                 max_size=len("testurl1") * 3)
+        folder = temp_folder()
+        with patch.object(CachedFileDownloader, "_entries",
+                          wraps=cached_downloader._entries) as entries_mock:
+            for url in ("testurl1", "testurl2", "testurl3"):
+                cached_downloader.download(url, os.path.join(folder, url))
+            # Listed once to know the initial size, the new entries are counted
+            self.assertEqual(1, entries_mock.call_count)
+            cached_downloader.download("testurl4", os.path.join(folder, "testurl4"))
+            # Over the maximum size, the cache is listed to be pruned
+            self.assertEqual(2, entries_mock.call_count)
+        self.assertEqual(3, cached_downloader.stats()["entries"])
+
+
+class CachedDownloadsLinkTest(unittest.TestCase):
+
+    def test_materialized_files_are_not_linked(self):
+        client = TestClient(default_server_user=True)
+        client.save({"conanfile.py": GenConanfile().with_exports("*"),
+                     "header.h": "header"})
+        client.run("create . mypkg/0.1@user/testing")
+        client.run("upload * --all --confirm")
+        cache_folder = temp_folder()
+        client.run('config set storage.download_cache="%s"' % cache_folder)
+        client.run("remove * -f")
+        client.run("install mypkg/0.1@user/testing")
+
+        layout = client.cache.package_layout(ConanFileReference.loads("mypkg/0.1@user/testing"))
+        export_tgz = os.path.join(layout.download_export(), "conan_export.tgz")
+        cached = [os.path.join(cache_folder, f) for f in os.listdir(cache_folder)
+                  if os.path.isfile(os.path.join(cache_folder, f)) and
+                  load(os.path.join(cache_folder, f), binary=True) == load(export_tgz, binary=True)]
+        self.assertEqual(1, len(cached))
+        # A reflink or a copy, never a hard link that could be modified from the Conan cache
+        self.assertFalse(os.path.samefile(cached[0], export_tgz))
+        self.assertEqual(1, os.stat(export_tgz).st_nlink)
+
+        # Removing the package from the Conan cache doesn't affect the download cache
+        client.run("remove * -f")
+        self.assertTrue(os.path.exists(cached[0]))
+        client.run("install mypkg/0.1@user/testing")
+        self.assertIn("mypkg/0.1@user/testing: Package installed", client.out)
+
+    def test_user_downloads_are_not_hard_linked(self):
+        http_server = StoppableThreadBottle()
+        file_path = os.path.join(temp_folder(), "myfile.txt")
+        save(file_path, "some content")
+
+        @http_server.server.get("/myfile.txt")
+        def get_file():
+            return static_file(os.path.basename(file_path), os.path.dirname(file_path))
+
+        http_server.run_server()
+        client = TestClient()
+        cache_folder = temp_folder()
+        client.run('config set storage.download_cache="%s"' % cache_folder)
+        conanfile = textwrap.dedent("""
+            from conans import ConanFile, tools
+            class Pkg(ConanFile):
+                def source(self):
+                    tools.download("http://localhost:%s/myfile.txt", "myfile.txt",
+                                   md5="9893532233caff98cd083a116b013c0b")
+            """ % http_server.port)
+        client.save({"conanfile.py": conanfile})
+        client.run("source .")
+        self.assertEqual(1, os.stat(os.path.join(client.current_folder, "myfile.txt")).st_nlink)
+        http_server.stop()
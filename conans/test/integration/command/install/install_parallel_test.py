@@ -1,6 +1,9 @@
+import os
 import unittest
+from collections import OrderedDict
 
-from conans.test.utils.tools import GenConanfile, TestClient
+from conans.model.ref import ConanFileReference
+from conans.test.utils.tools import GenConanfile, TestClient, TestServer
 
 
 class InstallParallelTest(unittest.TestCase):
@@ -28,3 +31,76 @@ class InstallParallelTest(unittest.TestCase):
         self.assertIn("Downloading binary packages in %s parallel threads" % threads, client.out)
         for i in range(counter):
             self.assertIn("pkg%s/0.1@user/testing: Package installed" % i, client.out)
+
+    def test_parallel_sources_retrieval(self):
+        client = TestClient(default_server_user=True)
+        client.save({"conanfile.py": GenConanfile().with_exports_sources("*.h"),
+                     "header.h": "header"})
+        for i in range(3):
+            client.run("create . pkg%s/0.1@user/testing" % i)
+        client.run("upload * --confirm")
+        client.run("remove * -f")
+
+        client.run("config set general.parallel_sources_retrieval=4")
+        conanfile_txt = "[requires]\n" + "\n".join("pkg%s/0.1@user/testing" % i for i in range(3))
+        client.save({"conanfile.txt": conanfile_txt}, clean_first=True)
+        client.run("install . --build")
+        self.assertIn("Retrieving the sources of the packages to build in 4 parallel threads",
+                      client.out)
+        for i in range(3):
+            self.assertIn("pkg%s/0.1@user/testing: Package '" % i, client.out)
+            layout = client.cache.package_layout(ConanFileReference.loads("pkg%s/0.1@user/testing"
+                                                                         % i))
+            self.assertTrue(os.path.isfile(os.path.join(layout.export_sources(), "header.h")))
+
+    def test_parallel_sources_retrieval_error(self):
+        client = TestClient()
+        client.run("config set general.parallel_sources_retrieval=4")
+        client.save({"conanfile.py": GenConanfile().with_build_msg("BUILDING")})
+        client.run("export . pkg0/0.1@user/testing")
+        client.save({"conanfile.py": "from conans import ConanFile\n"
+                                     "class Pkg(ConanFile):\n"
+                                     "    def build(self):\n"
+                                     "        raise Exception('Build broken')\n"})
+        client.run("export . broken/0.1@user/testing")
+        client.save({"conanfile.py": GenConanfile().with_require("broken/0.1@user/testing")})
+        client.run("export . consumer/0.1@user/testing")
+
+        conanfile_txt = "[requires]\nconsumer/0.1@user/testing\npkg0/0.1@user/testing"
+        client.save({"conanfile.txt": conanfile_txt}, clean_first=True)
+        client.run("install . --build=missing", assert_error=True)
+        self.assertIn("Build broken", client.out)
+        self.assertNotIn("consumer/0.1@user/testing: Calling build()", client.out)
+
+    def test_parallel_remote_binaries_check(self):
+        servers = OrderedDict([("r1", TestServer(users={"user": "password"})),
+                               ("r2", TestServer(users={"user": "password"}))])
+        users = {"r1": [("user", "password")], "r2": [("user", "password")]}
+        client = TestClient(servers=servers, users=users)
+        client.run("config set general.revisions_enabled=1")
+        client.save({"conanfile.py": GenConanfile()})
+        for i in range(4):
+            client.run("create . pkg%s/0.1@user/testing" % i)
+            client.run("upload pkg%s/0.1@user/testing -r=r1" % i)
+        # Only the binaries of half of the packages are in the recipes remote
+        client.run("upload pkg0/0.1@user/testing --all -r=r1")
+        client.run("upload pkg1/0.1@user/testing --all -r=r1")
+        client.run("upload pkg2/0.1@user/testing --all -r=r2")
+        client.run("remove * -f")
+
+        client.run("config set general.parallel_download=4")
+        conanfile_txt = ["[requires]"]
+        for i in range(4):
+            conanfile_txt.append("pkg%s/0.1@user/testing" % i)
+        client.save({"conanfile.txt": "\n".join(conanfile_txt)}, clean_first=True)
+        client.run("install .", assert_error=True)
+        self.assertIn("pkg0/0.1@user/testing:5ab84d6acfe1f23c4fae0ab88f26e3a396351ac9 - Download",
+                      client.out)
+        self.assertIn("pkg2/0.1@user/testing:5ab84d6acfe1f23c4fae0ab88f26e3a396351ac9 - Download",
+                      client.out)
+        self.assertIn("pkg3/0.1@user/testing:5ab84d6acfe1f23c4fae0ab88f26e3a396351ac9 - Missing",
+                      client.out)
+        client.run("install . --build=missing")
+        for i in range(3):
+            self.assertIn("pkg%s/0.1@user/testing: Package installed" % i, client.out)
+        self.assertIn("pkg3/0.1@user/testing: Package '", client.out)
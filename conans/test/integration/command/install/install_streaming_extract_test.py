@@ -0,0 +1,59 @@
+import os
+import textwrap
+
+import pytest
+
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.paths import PACKAGE_TGZ_NAME
+from conans.test.utils.tools import TestClient
+from conans.util.files import md5sum, sha1sum
+
+
+@pytest.mark.parametrize("revisions", [True, False])
+@pytest.mark.parametrize("keep_tgz", [True, False])
+@pytest.mark.parametrize("download_cache", [True, False])
+def test_streaming_extract(revisions, keep_tgz, download_cache):
+    client = TestClient(default_server_user=True)
+    if not download_cache:
+        client.run("config rm storage.download_cache")
+    client.run("config set general.revisions_enabled=%s" % revisions)
+    conanfile = textwrap.dedent("""
+        from conans import ConanFile
+        class Pkg(ConanFile):
+            exports_sources = "*.h"
+            def package(self):
+                self.copy("*.h", dst="include")
+        """)
+    client.save({"conanfile.py": conanfile,
+                 "header.h": "// my header\n" * 1000})
+    client.run("create . pkg/0.1@user/testing")
+    client.run("upload * --all --confirm")
+    client.run("remove * -f")
+
+    client.run("config set general.streaming_extract=True")
+    client.run("config set general.keep_package_tgz=%s" % keep_tgz)
+    client.run("install pkg/0.1@user/testing")
+    assert "pkg/0.1@user/testing: Package installed" in client.out
+    # The second time it is extracted from the download cache, if enabled
+    client.run("remove * -f")
+    client.run("install pkg/0.1@user/testing")
+    assert "pkg/0.1@user/testing: Package installed" in client.out
+
+    ref = ConanFileReference.loads("pkg/0.1@user/testing")
+    pref = PackageReference(ref, "5ab84d6acfe1f23c4fae0ab88f26e3a396351ac9")
+    layout = client.cache.package_layout(ref)
+    package_folder = layout.package(pref)
+    assert client.load(os.path.join(package_folder, "include", "header.h")) == \
+        "// my header\n" * 1000
+    assert os.path.exists(os.path.join(package_folder, "conaninfo.txt"))
+    assert os.path.exists(os.path.join(package_folder, "conanmanifest.txt"))
+
+    checksums = layout.load_metadata().packages[pref.id].checksums
+    tgz_path = os.path.join(layout.download_package(pref), PACKAGE_TGZ_NAME)
+    assert os.path.exists(tgz_path) == keep_tgz
+    if keep_tgz:
+        assert checksums[PACKAGE_TGZ_NAME] == {"md5": md5sum(tgz_path), "sha1": sha1sum(tgz_path)}
+
+    # The package can be uploaded again, compressing it again if necessary
+    client.run("upload * --all --confirm --force")
+    assert "Uploaded conan recipe 'pkg/0.1@user/testing'" in client.out
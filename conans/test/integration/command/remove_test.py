@@ -402,7 +402,8 @@ class RemoveTest(unittest.TestCase):
                             build_folders={"H1": [1, 2], "H2": [1, 2], "B": [1, 2], "O": [1, 2]},
                             src_folders={"H1": True, "H2": True, "B": True, "O": True})
         remote_folder = os.path.join(self.server_folder, ".conan_server/data")
-        folders = os.listdir(remote_folder)
+        folders = [f for f in os.listdir(remote_folder)
+                   if os.path.isdir(os.path.join(remote_folder, f))]
         six.assertCountEqual(self, ["Other", "Bye"], folders)
 
     def test_remove_specific_package(self):
@@ -11,6 +11,7 @@ from mock import patch
 import pytest
 
 from conans import DEFAULT_REVISION_V1
+from conans.client.store import cache_index
 from conans.model.manifest import FileTreeManifest
 from conans.model.package_metadata import PackageMetadata
 from conans.model.ref import ConanFileReference, PackageReference
@@ -1666,3 +1667,24 @@ def test_no_user_channel_error():
     assert "Uploading pkg/1.0 to remote 'default'" in c.out
     assert "user/channel" not in c.out
 
+
+
+def test_search_served_from_index():
+    c = TestClient()
+    c.save({"conanfile.py": GenConanfile("pkg", "0.1").with_settings("os")})
+    c.run("create . user/channel -s os=Linux")
+    c.run("create . user/channel -s os=Windows")
+    time.sleep(0.2)  # Out of the racy window of the entries
+    # The first searches store the entries that were too recent to be trusted after the create
+    c.run("search pkg*")
+    c.run("search pkg/0.1@user/channel -q os=Windows")
+    assert "os: Windows" in c.out
+    with patch.object(cache_index, "_list_dirs") as list_dirs, \
+            patch.object(cache_index, "_load_info_min") as load_info:
+        c.run("search pkg*")
+        assert "pkg/0.1@user/channel" in c.out
+        c.run("search pkg/0.1@user/channel -q os=Windows")
+        assert "os: Windows" in c.out
+        assert "os: Linux" not in c.out
+        list_dirs.assert_not_called()
+        load_info.assert_not_called()
@@ -0,0 +1,80 @@
+from conans.model.ref import ConanFileReference
+from conans.test.assets.genconanfile import GenConanfile
+from conans.test.utils.tools import TestClient, TestRequester, TestServer
+from conans.util.files import load
+
+
+class UploadRecorderRequester(TestRequester):
+    uploaded = []
+
+    def put(self, url, **kwargs):
+        if "X-Checksum-Deploy" not in (kwargs.get("headers") or {}):
+            UploadRecorderRequester.uploaded.append(url.split("?")[0].rsplit("/", 1)[-1])
+        return super(UploadRecorderRequester, self).put(url, **kwargs)
+
+
+def test_upload_checksum_deploy():
+    client = TestClient(default_server_user=True, requester_class=UploadRecorderRequester)
+    client.run("config set general.revisions_enabled=1")
+    client.save({"conanfile.py": GenConanfile().with_package_file("lib.a", "mylib")})
+    client.run("create . pkg/0.1@user/testing")
+    UploadRecorderRequester.uploaded = []
+    client.run("upload * --all --confirm")
+    assert sorted(UploadRecorderRequester.uploaded) == sorted(["conanfile.py",
+                                                               "conanmanifest.txt",
+                                                               "conan_package.tgz",
+                                                               "conaninfo.txt",
+                                                               "conanmanifest.txt"])
+
+    # The server already has the files with the same checksums, they are not sent again
+    UploadRecorderRequester.uploaded = []
+    client.run("upload * --all --confirm --force")
+    assert "Uploading conan_package.tgz" in client.out
+    assert UploadRecorderRequester.uploaded == []
+    client.run("remove * -f")
+    client.run("install pkg/0.1@user/testing")
+    assert "pkg/0.1@user/testing: Downloaded package revision" in client.out
+
+
+def test_upload_checksum_deploy_from_other_reference():
+    client = TestClient(default_server_user=True, requester_class=UploadRecorderRequester)
+    client.run("config set general.revisions_enabled=1")
+    client.save({"conanfile.py": GenConanfile()})
+    client.run("export . pkg/0.1@user/testing")
+    client.run("upload * --confirm")
+
+    # The same conanfile.py in other reference is taken from the one the server already has
+    client.run("export . other/0.1@user/testing")
+    UploadRecorderRequester.uploaded = []
+    client.run("upload other* --confirm")
+    assert "Uploaded conan recipe 'other/0.1@user/testing'" in client.out
+    assert "conanfile.py" not in UploadRecorderRequester.uploaded
+
+    client2 = TestClient(servers=client.servers)
+    client2.run("config set general.revisions_enabled=1")
+    client2.run("download other/0.1@user/testing --recipe")
+    layout = client2.cache.package_layout(ConanFileReference.loads("other/0.1@user/testing"))
+    assert client.load("conanfile.py") == load(layout.conanfile())
+
+
+def test_upload_checksum_deploy_not_from_unreadable_reference():
+    server = TestServer(read_permissions=[("secret/*@team/testing", "owner"), ("*/*@*/*", "*")],
+                        write_permissions=[("*/*@*/*", "*")],
+                        users={"owner": "password", "other": "password"})
+    servers = {"default": server}
+    owner = TestClient(servers=servers, users={"default": [("owner", "password")]})
+    owner.run("config set general.revisions_enabled=1")
+    owner.save({"conanfile.py": GenConanfile().with_class_attribute("secret = 'mysecret'")})
+    owner.run("export . secret/0.1@team/testing")
+    owner.run("upload * --confirm")
+
+    # The other user cannot read the recipe, its conanfile.py is not used for the upload
+    other = TestClient(servers=servers, users={"default": [("other", "password")]},
+                       requester_class=UploadRecorderRequester)
+    other.run("config set general.revisions_enabled=1")
+    other.save({"conanfile.py": owner.load("conanfile.py")})
+    other.run("export . pkg/0.1@team/testing")
+    UploadRecorderRequester.uploaded = []
+    other.run("upload * --confirm")
+    assert "Uploaded conan recipe 'pkg/0.1@team/testing'" in other.out
+    assert "conanfile.py" in UploadRecorderRequester.uploaded
@@ -0,0 +1,50 @@
+import os
+
+import pytest
+
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.test.assets.genconanfile import GenConanfile
+from conans.test.utils.tools import TestClient, NO_SETTINGS_PACKAGE_ID
+
+
+def _formats():
+    formats = [("gzip", ".tgz"), ("xz", ".txz")]
+    try:
+        import zstandard  # noqa - optional dependency
+        formats.append(("zstd", ".tzst"))
+    except ImportError:
+        pass
+    return formats
+
+
+@pytest.mark.parametrize("compression_format, extension", _formats())
+@pytest.mark.parametrize("streaming_extract", [True, False])
+def test_upload_compression_format(compression_format, extension, streaming_extract):
+    client = TestClient(default_server_user=True)
+    client.run("config set general.compression_format=%s" % compression_format)
+    client.save({"conanfile.py": GenConanfile().with_exports("*.h")
+                                               .with_exports_sources("*.cpp")
+                                               .with_package_file("lib.a", "mylib"),
+                 "header.h": "header", "source.cpp": "source"})
+    client.run("create . pkg/0.1@user/testing")
+    client.run("upload * --all --confirm")
+
+    ref = ConanFileReference.loads("pkg/0.1@user/testing")
+    pref = PackageReference(ref, NO_SETTINGS_PACKAGE_ID)
+    layout = client.cache.package_layout(ref)
+    download_export = layout.download_export()
+    assert os.path.isfile(os.path.join(download_export, "conan_export" + extension))
+    assert os.path.isfile(os.path.join(download_export, "conan_sources" + extension))
+    download_package = layout.download_package(pref)
+    assert os.listdir(download_package) == ["conan_package" + extension]
+
+    # Any client can install them, whatever its compression format
+    client2 = TestClient(servers=client.servers, users=client.users)
+    client2.run("config set general.streaming_extract=%s" % streaming_extract)
+    client2.run("install pkg/0.1@user/testing")
+    layout2 = client2.cache.package_layout(ref)
+    assert "header" == open(os.path.join(layout2.export(), "header.h")).read()
+    assert "mylib" == open(os.path.join(layout2.package(pref), "lib.a")).read()
+    client2.run("install pkg/0.1@user/testing --build")
+    assert "source" == open(os.path.join(layout2.export_sources(), "source.cpp")).read()
+
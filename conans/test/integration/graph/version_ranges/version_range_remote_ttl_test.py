@@ -0,0 +1,59 @@
+from conans.test.assets.genconanfile import GenConanfile
+from conans.test.utils.tools import TestClient
+
+
+def test_remote_listing_ttl():
+    client = TestClient(default_server_user=True)
+    client.save({"conanfile.py": GenConanfile()})
+    client.run("create . pkg/1.0@")
+    client.run("create . pkg/1.1@")
+    client.run("upload pkg* --all --confirm")
+
+    consumer = TestClient(servers=client.servers, users=client.users)
+    consumer.run("config set general.version_ranges_remote_ttl=1h")
+    consumer.save({"conanfile.py": GenConanfile().with_require("pkg/[>=1.0]")})
+    consumer.run("install .")
+    assert "resolved to 'pkg/1.1' in remote 'default'" in consumer.out
+
+    client.run("create . pkg/1.2@")
+    client.run("upload pkg/1.2 --all --confirm")
+
+    # The search done in the previous command is reused
+    consumer.run("remove * -f")
+    consumer.run("install .")
+    assert "resolved to 'pkg/1.1' in remote 'default'" in consumer.out
+
+    # Unless it is updated
+    consumer.run("install . --update")
+    assert "resolved to 'pkg/1.2' in remote 'default'" in consumer.out
+    consumer.run("remove * -f")
+    consumer.run("install .")
+    assert "resolved to 'pkg/1.2' in remote 'default'" in consumer.out
+
+    # Without TTL, the remote is always searched
+    consumer.run("config rm general.version_ranges_remote_ttl")
+    client.run("create . pkg/1.3@")
+    client.run("upload pkg/1.3 --all --confirm")
+    consumer.run("remove * -f")
+    consumer.run("install .")
+    assert "resolved to 'pkg/1.3' in remote 'default'" in consumer.out
+
+
+def test_remote_listing_invalidated_by_upload():
+    client = TestClient(default_server_user=True)
+    client.run("config set general.version_ranges_remote_ttl=1h")
+    client.save({"conanfile.py": GenConanfile()})
+    client.run("create . pkg/1.0@")
+    client.run("upload pkg* --all --confirm")
+    client.run("remove * -f")
+
+    consumer = GenConanfile().with_require("pkg/[>=1.0]")
+    client.save({"consumer/conanfile.py": consumer})
+    client.run("install consumer")
+    assert "resolved to 'pkg/1.0' in remote 'default'" in client.out
+
+    client.run("create . pkg/1.1@")
+    client.run("upload pkg/1.1 --all --confirm")
+    client.run("remove * -f")
+    client.run("install consumer")
+    assert "resolved to 'pkg/1.1' in remote 'default'" in client.out
@@ -0,0 +1,103 @@
+from collections import OrderedDict
+
+from conans import REVISIONS
+from conans.test.assets.genconanfile import GenConanfile
+from conans.test.utils.tools import TestClient, TestRequester, TestServer
+
+
+class RecorderRequester(TestRequester):
+    requests = []
+
+    def get(self, url, **kwargs):
+        RecorderRequester.requests.append(("GET", url.split("?")[0]))
+        return super(RecorderRequester, self).get(url, **kwargs)
+
+    def post(self, url, **kwargs):
+        RecorderRequester.requests.append(("POST", url.split("?")[0]))
+        return super(RecorderRequester, self).post(url, **kwargs)
+
+
+def _client(servers):
+    users = {name: [("user", "password")] for name in servers}
+    client = TestClient(servers=servers, users=users, requester_class=RecorderRequester)
+    client.run("config set general.revisions_enabled=1")
+    client.save({"conanfile.py": GenConanfile()})
+    for i in range(4):
+        client.run("create . pkg%s/0.1@user/testing" % i)
+    remote = list(servers)[0]
+    client.run("upload * -r=%s --confirm" % remote)
+    for i in range(3):
+        client.run("upload pkg%s/0.1@user/testing --all -r=%s" % (i, remote))
+    client.run("remove * -f")
+    client.save({"conanfile.txt": "[requires]\n" + "\n".join("pkg%s/0.1@user/testing" % i
+                                                             for i in range(4))},
+                clean_first=True)
+    return client
+
+
+def test_packages_info_single_request():
+    servers = OrderedDict([("r1", TestServer(users={"user": "password"}))])
+    client = _client(servers)
+    RecorderRequester.requests = []
+    client.run("install . --build=missing")
+    for i in range(3):
+        assert "pkg%s/0.1@user/testing: Package installed" % i in client.out
+    assert "pkg3/0.1@user/testing: Package '" in client.out
+    # The 4 binaries are checked in one request, the found ones are not requested again
+    posts = [url for method, url in RecorderRequester.requests if method == "POST"]
+    assert len(posts) == 1 and posts[0].endswith("/v2/conans/packages/info")
+    package_gets = [url for method, url in RecorderRequester.requests
+                    if method == "GET" and "/packages/" in url]
+    assert not any(url.endswith("/latest") for url in package_gets)
+    # Only the downloads of the packages
+    assert len([url for url in package_gets if url.endswith("conaninfo.txt")]) == 3
+
+
+def test_packages_info_not_supported():
+    servers = OrderedDict([("r1", TestServer(users={"user": "password"},
+                                             server_capabilities=[REVISIONS]))])
+    client = _client(servers)
+    RecorderRequester.requests = []
+    client.run("install . --build=missing")
+    for i in range(3):
+        assert "pkg%s/0.1@user/testing: Package installed" % i in client.out
+    assert "pkg3/0.1@user/testing: Package '" in client.out
+    assert not any(method == "POST" for method, _ in RecorderRequester.requests)
+    latest = [url for _, url in RecorderRequester.requests
+              if "/packages/" in url and url.endswith("/latest")]
+    assert len(latest) == 4
+
+
+def test_packages_info_next_remote():
+    """ the binaries not found in the recipe remote are checked in the others, in one request
+    """
+    servers = OrderedDict([("r1", TestServer(users={"user": "password"})),
+                           ("r2", TestServer(users={"user": "password"}))])
+    client = _client(servers)
+    client.run("install pkg3/0.1@user/testing --build")
+    client.run("upload pkg3/0.1@user/testing --all -r=r2")
+    client.run("remove * -f")
+    RecorderRequester.requests = []
+    client.run("install .")
+    for i in range(4):
+        assert "pkg%s/0.1@user/testing: Package installed" % i in client.out
+    posts = [url for method, url in RecorderRequester.requests if method == "POST"]
+    assert len(posts) == 2
+    assert posts[0].startswith(servers["r1"].fake_url)
+    assert posts[1].startswith(servers["r2"].fake_url)
+
+
+def test_packages_info_forced_build():
+    """ the binaries that will be built from sources, forced by pattern, are not looked for
+    """
+    servers = OrderedDict([("r1", TestServer(users={"user": "password"},
+                                             server_capabilities=[REVISIONS]))])
+    client = _client(servers)
+    client.run("config set general.parallel_download=4")
+    RecorderRequester.requests = []
+    client.run("install . --build=pkg0 --build=missing")
+    assert "pkg0/0.1@user/testing: Forced build from source" in client.out
+    latest = [url for _, url in RecorderRequester.requests
+              if "/packages/" in url and url.endswith("/latest")]
+    assert len(latest) == 3
+    assert not any("/pkg0/" in url for url in latest)
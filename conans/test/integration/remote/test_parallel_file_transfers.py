@@ -0,0 +1,63 @@
+import os
+
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.test.assets.genconanfile import GenConanfile
+from conans.test.utils.tools import TestClient, TestRequester, NO_SETTINGS_PACKAGE_ID
+
+
+def _client(**kwargs):
+    if "servers" not in kwargs:
+        kwargs["default_server_user"] = True
+    client = TestClient(**kwargs)
+    client.run("config set general.revisions_enabled=1")
+    client.run("config set general.parallel_file_transfers=4")
+    return client
+
+
+def test_parallel_file_transfers():
+    client = _client()
+    client.save({"conanfile.py": GenConanfile().with_exports("*.h")
+                                               .with_exports_sources("*.cpp")
+                                               .with_package_file("lib.a", "mylib"),
+                 "header.h": "header", "source.cpp": "source"})
+    client.run("create . pkg/0.1@user/testing")
+    client.run("upload * --all --confirm")
+    assert "Uploaded conan recipe 'pkg/0.1@user/testing' to 'default'" in client.out
+
+    client2 = _client(servers=client.servers, users=client.users)
+    client2.run("install pkg/0.1@user/testing --build")
+    ref = ConanFileReference.loads("pkg/0.1@user/testing")
+    pref = PackageReference(ref, NO_SETTINGS_PACKAGE_ID)
+    layout = client2.cache.package_layout(ref)
+    assert "header" == open(os.path.join(layout.export(), "header.h")).read()
+    assert "source" == open(os.path.join(layout.export_sources(), "source.cpp")).read()
+    assert "mylib" == open(os.path.join(layout.package(pref), "lib.a")).read()
+
+
+class FailPackageTgzRequester(TestRequester):
+    uploaded = []
+
+    def put(self, url, **kwargs):
+        if "/packages/" in url and "conan_package.tgz" in url:
+            raise Exception("Network failure")
+        FailPackageTgzRequester.uploaded.append(url)
+        return super(FailPackageTgzRequester, self).put(url, **kwargs)
+
+
+def test_failed_compressed_file_stops_upload():
+    FailPackageTgzRequester.uploaded = []
+    client = _client(requester_class=FailPackageTgzRequester)
+    client.run("config set general.retry=0")
+    client.save({"conanfile.py": GenConanfile().with_package_file("lib.a", "mylib")})
+    client.run("create . pkg/0.1@user/testing")
+    client.run("upload * --all --confirm", assert_error=True)
+    assert "Uploaded conan recipe 'pkg/0.1@user/testing' to 'default'" in client.out
+    assert "Execute upload again to retry upload the failed files: conan_package.tgz, " \
+           "conaninfo.txt, conanmanifest.txt" in client.out
+    package_uploads = [url for url in FailPackageTgzRequester.uploaded if "/packages/" in url]
+    assert package_uploads == []
+    # The recipe manifest is uploaded once all the other recipe files are there, every file is
+    # tried first with a checksum deploy
+    recipe_files = [url.split("?")[0].rsplit("/", 1)[1] for url in FailPackageTgzRequester.uploaded]
+    assert recipe_files == ["conanfile.py", "conanfile.py",
+                            "conanmanifest.txt", "conanmanifest.txt"]
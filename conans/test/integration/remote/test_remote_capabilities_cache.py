@@ -0,0 +1,39 @@
+from conans.test.assets.genconanfile import GenConanfile
+from conans.test.utils.tools import TestClient, TestRequester
+
+
+class PingCounterRequester(TestRequester):
+    pings = 0
+
+    def get(self, url, **kwargs):
+        if url.endswith("/ping"):
+            PingCounterRequester.pings += 1
+        return super(PingCounterRequester, self).get(url, **kwargs)
+
+
+def _pings(client, command):
+    PingCounterRequester.pings = 0
+    client.run(command)
+    return PingCounterRequester.pings
+
+
+def test_capabilities_ttl():
+    client = TestClient(default_server_user=True, requester_class=PingCounterRequester)
+    client.save({"conanfile.py": GenConanfile()})
+    client.run("create . pkg/0.1@user/testing")
+    # The capabilities are requested once for all the calls of the command
+    assert 1 == _pings(client, "upload pkg/0.1@user/testing --all --confirm")
+
+    client.run("remove * -f")
+    assert 1 == _pings(client, "install pkg/0.1@user/testing")
+
+    client.run("config set general.remote_capabilities_ttl=1h")
+    client.run("remove * -f")
+    assert 1 == _pings(client, "install pkg/0.1@user/testing")
+    client.run("remove * -f")
+    assert 0 == _pings(client, "install pkg/0.1@user/testing")
+    assert "pkg/0.1@user/testing: Retrieving package" in client.out
+
+    client.run("config rm general.remote_capabilities_ttl")
+    client.run("remove * -f")
+    assert 1 == _pings(client, "install pkg/0.1@user/testing")
@@ -109,3 +109,13 @@ class TestTokenRefresh(unittest.TestCase):
         self.assertEqual(self.localdb.user, "myuser")
         self.assertEqual(self.localdb.access_token, "refreshed_access_token")
         self.assertEqual(self.localdb.refresh_token, "refresh_token")
+
+    def test_clients_reused_with_same_credentials(self):
+        headers = {"X-Client-Id": "myuser"}
+        client = self.rest_client_factory.new(self.remote, "token", None, headers)
+        self.assertIs(client, self.rest_client_factory.new(self.remote, "token", None, headers))
+        # Other threads might be using the client, new credentials don't modify it
+        new_client = self.rest_client_factory.new(self.remote, "new_token", None, headers)
+        self.assertIsNot(client, new_client)
+        self.assertEqual("token", client._token)
+        self.assertEqual("new_token", new_client._token)
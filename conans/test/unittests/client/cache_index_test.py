@@ -0,0 +1,169 @@
+import os
+import sqlite3
+import textwrap
+import time
+import unittest
+
+from mock import patch
+
+from conans.client.store import cache_index
+from conans.client.store.cache_index import CacheIndex, field_condition
+from conans.test.utils.test_files import temp_folder
+from conans.util.files import list_folder_subdirs, mkdir, save, rmdir
+
+
+def _age(*paths):
+    """ Make the paths old enough to be trusted by the index
+    """
+    old = time.time() - 100
+    for path in paths:
+        os.utime(path, (old, old))
+
+
+def _conaninfo(os_, shared):
+    return textwrap.dedent("""
+        [settings]
+            arch=x86
+            os=%s
+        [options]
+            shared=%s
+        [full_requires]
+            dep/1.0@user/channel:123
+        [recipe_hash]
+            abc
+        """ % (os_, shared))
+
+
+class CacheIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dbfile = os.path.join(temp_folder(), "index.db")
+        self.index = CacheIndex.create(self.dbfile)
+        self.store = temp_folder()
+
+    def _age_store(self):
+        for root, dirs, files in os.walk(self.store):
+            _age(root, *[os.path.join(root, f) for f in dirs + files])
+
+    def _rows(self, table):
+        connection = sqlite3.connect(self.dbfile)
+        try:
+            return connection.execute("select count(*) from %s" % table).fetchone()[0]
+        finally:
+            connection.close()
+
+    def _racy_rows(self, table):
+        connection = sqlite3.connect(self.dbfile)
+        try:
+            return connection.execute("select count(*) from %s where racy=1"
+                                      % table).fetchone()[0]
+        finally:
+            connection.close()
+
+    def _folders(self):
+        return [root for root, _, _ in os.walk(self.store)]
+
+    def test_list_subdirs(self):
+        for ref in ("zlib/1.2/_/_", "zlib/1.3/user/stable", "bzip2/1.0/user/testing"):
+            mkdir(os.path.join(self.store, ref, "export"))
+        self._age_store()
+
+        expected = sorted(list_folder_subdirs(self.store, level=4))
+        self.assertEqual(expected, self.index.list_subdirs(self.store, level=4))
+        # Reading stores the entries that can be trusted, the next reads use them
+        self.assertEqual(9, self._rows(cache_index.FOLDERS_TABLE))
+        with patch.object(cache_index, "_list_dirs") as list_dirs:
+            self.assertEqual(expected, self.index.list_subdirs(self.store, level=4))
+            self.assertEqual(["zlib/1.2/_/_", "zlib/1.3/user/stable"],
+                             self.index.list_subdirs(self.store, level=4,
+                                                     first_level_filter=lambda n: n == "zlib"))
+            list_dirs.assert_not_called()
+
+        # Changes in the store are detected
+        mkdir(os.path.join(self.store, "zlib/1.3/other/stable"))
+        rmdir(os.path.join(self.store, "bzip2"))
+        self.assertEqual(["zlib/1.2/_/_", "zlib/1.3/other/stable", "zlib/1.3/user/stable"],
+                         self.index.list_subdirs(self.store, level=4))
+
+    def test_racy_entries(self):
+        mkdir(os.path.join(self.store, "zlib/1.2/_/_"))
+        # Too recent to be trusted, they are stored but read from the store
+        self.index.update(self._folders())
+        self.assertEqual(5, self._rows(cache_index.FOLDERS_TABLE))
+        with patch.object(cache_index, "_list_dirs", wraps=cache_index._list_dirs) as list_dirs:
+            self.assertEqual(["zlib/1.2/_/_"], self.index.list_subdirs(self.store, level=4))
+            self.assertEqual(4, list_dirs.call_count)
+        self.assertEqual(5, self._racy_rows(cache_index.FOLDERS_TABLE))
+
+        # Any later update refreshes them
+        self._age_store()
+        self.index.update()
+        self.assertEqual(0, self._racy_rows(cache_index.FOLDERS_TABLE))
+        with patch.object(cache_index, "_list_dirs") as list_dirs:
+            self.assertEqual(["zlib/1.2/_/_"], self.index.list_subdirs(self.store, level=4))
+            list_dirs.assert_not_called()
+
+    def test_package_infos(self):
+        info_paths = [os.path.join(self.store, "pkg%s" % i, "conaninfo.txt") for i in range(3)]
+        for i, info_path in enumerate(info_paths):
+            save(info_path, _conaninfo("Windows" if i else "Linux", i == 2))
+        self._age_store()
+        missing = os.path.join(self.store, "missing", "conaninfo.txt")
+
+        infos = self.index.package_infos(info_paths + [missing])
+        self.assertEqual(info_paths, sorted(infos))
+        self.assertEqual({"settings": {"arch": "x86", "os": "Linux"},
+                          "options": {"shared": "False"},
+                          "full_requires": ["dep/1.0@user/channel:123"],
+                          "recipe_hash": "abc"}, infos[info_paths[0]])
+        self.assertEqual(3, self._rows(cache_index.INFOS_TABLE))
+
+        with patch.object(cache_index, "_load_info_min") as load_info:
+            self.assertEqual(infos, self.index.package_infos(info_paths))
+            # The settings and options can be queried
+            windows = field_condition("settings", "os", "Windows")
+            self.assertEqual([info_paths[1], info_paths[2]],
+                             sorted(self.index.package_infos(info_paths, windows)))
+            shared = field_condition("options", "shared", "True")
+            self.assertEqual([info_paths[2]],
+                             list(self.index.package_infos(info_paths, shared)))
+            self.assertEqual([], list(self.index.package_infos(
+                info_paths, field_condition("options", "missing", "True"))))
+            self.assertEqual(info_paths, sorted(self.index.package_infos(
+                info_paths, field_condition("options", "missing", "None"))))
+            load_info.assert_not_called()
+
+        # A modified file is parsed again, and it is not filtered
+        save(info_paths[1], _conaninfo("Linux", False))
+        with patch.object(cache_index, "_load_info_min",
+                          return_value=infos[info_paths[0]]) as load_info:
+            self.assertEqual([info_paths[1], info_paths[2]],
+                             sorted(self.index.package_infos(info_paths, windows)))
+            load_info.assert_called_once_with(info_paths[1])
+
+        # Forgotten entries are parsed again
+        self.index.forget(os.path.join(self.store, "pkg0"))
+        self.assertEqual(2, self._rows(cache_index.INFOS_TABLE))
+        self.assertEqual(6, self._rows(cache_index.FIELDS_TABLE))
+        with patch.object(cache_index, "_load_info_min",
+                          return_value=infos[info_paths[0]]) as load_info:
+            self.index.package_infos(info_paths)
+            self.assertEqual(2, load_info.call_count)
+
+    def test_broken_database(self):
+        dbfile = os.path.join(temp_folder(), "index.db")
+        save(dbfile, "this is not a sqlite database")
+        index = CacheIndex.create(dbfile)
+        mkdir(os.path.join(self.store, "zlib/1.2/_/_"))
+        index.update(self._folders())
+        self.assertEqual(["zlib/1.2/_/_"], index.list_subdirs(self.store, level=4))
+        save(os.path.join(self.store, "conaninfo.txt"), _conaninfo("Linux", True))
+        infos = index.package_infos([os.path.join(self.store, "conaninfo.txt")])
+        self.assertEqual(["Linux"], [info["settings"]["os"] for info in infos.values()])
+
+    def test_missing_database(self):
+        # Reading never creates the database
+        index = CacheIndex(os.path.join(temp_folder(), "index.db"))
+        mkdir(os.path.join(self.store, "zlib/1.2/_/_"))
+        self.assertEqual(["zlib/1.2/_/_"], index.list_subdirs(self.store, level=4))
+        self.assertFalse(os.path.exists(index._dbfile))
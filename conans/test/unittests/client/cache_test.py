@@ -3,6 +3,7 @@
 import os
 import unittest
 
+from mock import patch
 from six import StringIO
 
 from conans.client.cache.cache import ClientCache
@@ -10,8 +11,9 @@ from conans.client.output import ConanOutput
 from conans.client.tools import environment_append
 from conans.model.package_metadata import PackageMetadata
 from conans.model.ref import ConanFileReference, PackageReference
+from conans.model.settings import load_settings_yml
 from conans.test.utils.test_files import temp_folder
-from conans.util.files import mkdir
+from conans.util.files import load, mkdir
 from conans.util.files import save
 
 
@@ -78,3 +80,22 @@ class CacheTest(unittest.TestCase):
             localdb = self.cache.localdb
             self.assertIsNotNone(localdb.encryption_key)
             self.assertEqual(localdb.encryption_key, "key")
+
+    def test_settings_cached(self):
+        with patch("conans.client.cache.cache.load_settings_yml",
+                   side_effect=load_settings_yml) as parse_mock:
+            settings = self.cache.settings
+            settings.os = "Windows"
+            self.assertEqual(1, parse_mock.call_count)
+            # The same instance reuses the Settings, but returns copies
+            self.assertIsNone(self.cache.settings.os.value)
+            # Other instances reuse the parsed file
+            cache = ClientCache(self.cache.cache_folder, self.cache._output)
+            self.assertIn("Windows", cache.settings.os.values_range)
+            self.assertEqual(1, parse_mock.call_count)
+
+            # Modifying the settings.yml parses it again
+            save(self.cache.settings_path, load(self.cache.settings_path) + "\nnew_setting: [1]")
+            self.assertIn("new_setting", self.cache.settings.fields)
+            self.assertIn("new_setting", cache.settings.fields)
+            self.assertEqual(2, parse_mock.call_count)
@@ -5,12 +5,13 @@ import unittest
 from collections import OrderedDict
 
 import six
-from mock import Mock, call
+from mock import Mock, call, patch
 from parameterized import parameterized
 import pytest
 
 from conans.client.graph.python_requires import ConanPythonRequire
-from conans.client.loader import ConanFileLoader, ConanFileTextLoader, _parse_conanfile
+from conans.client.loader import ConanFileLoader, ConanFileTextLoader, _parse_conanfile, \
+    _CachedSourceLoader
 from conans.client.tools.files import chdir
 from conans.errors import ConanException
 from conans.model.options import OptionsValues
@@ -379,3 +380,39 @@ def append(data):
             self.assertIs(loaded1.myconanlogger.value, loaded2.myconanlogger.value)
         finally:
             sys.path.remove(temp)
+
+    def test_bytecode_cache(self):
+        tmp = temp_folder()
+        bytecode_folder = os.path.join(temp_folder(), "bytecode")
+        conanfile_path = os.path.join(tmp, "conanfile.py")
+        save(conanfile_path, "def conanfile_func():\n    return 1\n")
+
+        with patch.object(_CachedSourceLoader, "source_to_code",
+                          side_effect=_CachedSourceLoader.source_to_code,
+                          autospec=True) as compile_mock:
+            loaded1, module_id1 = _parse_conanfile(conanfile_path, bytecode_folder)
+            self.assertEqual(1, compile_mock.call_count)
+            self.assertEqual(1, len(os.listdir(bytecode_folder)))
+            # The same file is not compiled again, but it is a different module
+            loaded2, module_id2 = _parse_conanfile(conanfile_path, bytecode_folder)
+            self.assertEqual(1, compile_mock.call_count)
+            self.assertNotEqual(module_id1, module_id2)
+            self.assertIsNot(loaded1, loaded2)
+            self.assertEqual(1, loaded2.conanfile_func())
+            self.assertEqual(conanfile_path, loaded2.conanfile_func.__code__.co_filename)
+
+            # A modified file replaces the entry of its path
+            save(conanfile_path, "def conanfile_func():\n    return 2\n")
+            loaded3, _ = _parse_conanfile(conanfile_path, bytecode_folder)
+            self.assertEqual(2, compile_mock.call_count)
+            self.assertEqual(2, loaded3.conanfile_func())
+            self.assertEqual(1, len(os.listdir(bytecode_folder)))
+            _parse_conanfile(conanfile_path, bytecode_folder)
+            self.assertEqual(2, compile_mock.call_count)
+
+            # Invalid entries are compiled again
+            for f in os.listdir(bytecode_folder):
+                save(os.path.join(bytecode_folder, f), "corrupted")
+            loaded4, _ = _parse_conanfile(conanfile_path, bytecode_folder)
+            self.assertEqual(3, compile_mock.call_count)
+            self.assertEqual(2, loaded4.conanfile_func())
@@ -112,3 +112,29 @@ class DepsGraphTest(unittest.TestCase):
         deps.add_edge(n2, n32, None)
         deps.add_edge(n32, n5, None)
         self.assertEqual([[n5, n31], [n32], [n2], [n1]], deps.by_levels())
+
+    def test_levels_cached(self):
+        ref1 = ConanFileReference.loads("Hello/1.0@user/stable")
+        ref2 = ConanFileReference.loads("Hello/2.0@user/stable")
+        ref3 = ConanFileReference.loads("Hello/3.0@user/stable")
+
+        deps = DepsGraph()
+        n1 = Node(ref1, Mock(), context=CONTEXT_HOST)
+        n2 = Node(ref2, Mock(), context=CONTEXT_HOST)
+        n3 = Node(ref3, Mock(), context=CONTEXT_HOST)
+        deps.add_node(n1)
+        deps.add_node(n2)
+        deps.add_edge(n1, n2, None)
+        self.assertEqual([[n2], [n1]], deps.by_levels())
+        self.assertEqual([[n1], [n2]], deps.inverse_levels())
+
+        # The levels are computed again when the graph changes
+        deps.add_node(n3)
+        self.assertEqual([[n2, n3], [n1]], deps.by_levels())
+        deps.add_edge(n2, n3, None)
+        self.assertEqual([[n3], [n2], [n1]], deps.by_levels())
+        self.assertEqual([[n1], [n2], [n3]], deps.inverse_levels())
+        self.assertEqual([[n3], [n2]], deps.by_levels(nodes_subset={n2, n3}))
+        # The returned levels can be modified
+        deps.by_levels()[0].append(n1)
+        self.assertEqual([[n3], [n2], [n1]], deps.by_levels())
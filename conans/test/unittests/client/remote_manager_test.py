@@ -1,10 +1,20 @@
 import os
+import random
+import tarfile
 import unittest
+from io import BytesIO
+
+import six
+from mock import patch
 
 from conans.client.cmd.uploader import compress_files
+from conans.client.tools.env import environment_append
+from conans.client.remote_manager import StreamingTgzExtractor, check_compressed_files, \
+    uncompress_file
+from conans.errors import ConanException
 from conans.paths import PACKAGE_TGZ_NAME
 from conans.test.utils.test_files import temp_folder
-from conans.util.files import save
+from conans.util.files import save, load, md5sum, open_compressed_tar, sha1sum
 
 
 class RemoteManagerTest(unittest.TestCase):
@@ -23,3 +33,107 @@ class RemoteManagerTest(unittest.TestCase):
         self.assertTrue(os.path.exists(path))
         expected_path = os.path.join(folder, PACKAGE_TGZ_NAME)
         self.assertEqual(path, expected_path)
+
+    def test_streaming_tgz_extractor(self):
+        for tgz_name in _compressed_names():
+            folder = temp_folder()
+            save(os.path.join(folder, "one_file.txt"), b"The contents")
+            save(os.path.join(folder, "sub", "Two_file.txt"), b"Two contents" * 10000)
+            files = {"one_file.txt": os.path.join(folder, "one_file.txt"),
+                     "sub/Two_file.txt": os.path.join(folder, "sub", "Two_file.txt")}
+            tgz_path = compress_files(files, {}, tgz_name, dest_dir=folder)
+            tgz_contents = load(tgz_path, binary=True)
+
+            def chunks(size):
+                return (tgz_contents[i:i + size] for i in range(0, len(tgz_contents), size))
+
+            for keep_tgz in (True, False):
+                dest_folder = temp_folder()
+                kept_folder = temp_folder() if keep_tgz else None
+                extractor = StreamingTgzExtractor(dest_folder, kept_folder).for_file(tgz_name)
+                # A retried download calls the handler again, it must start from scratch
+                extractor(chunks(1000))
+                extractor(chunks(7))
+                self.assertEqual(extractor.checksums, {"md5": md5sum(tgz_path),
+                                                       "sha1": sha1sum(tgz_path)})
+                self.assertEqual(load(os.path.join(dest_folder, "one_file.txt")), "The contents")
+                self.assertEqual(load(os.path.join(dest_folder, "sub", "Two_file.txt")),
+                                 "Two contents" * 10000)
+                if keep_tgz:
+                    self.assertEqual(load(os.path.join(kept_folder, tgz_name), binary=True),
+                                     tgz_contents)
+
+    def test_compression_formats(self):
+        folder = temp_folder()
+        save(os.path.join(folder, "one_file.txt"), b"The contents")
+        files = {"one_file.txt": os.path.join(folder, "one_file.txt")}
+        for tgz_name in _compressed_names():
+            tgz_path = compress_files(files, {}, tgz_name, dest_dir=temp_folder())
+            # Deterministic, same contents produce the same file
+            self.assertEqual(md5sum(tgz_path),
+                             md5sum(compress_files(files, {}, tgz_name, dest_dir=temp_folder())))
+            dest_folder = temp_folder()
+            uncompress_file(tgz_path, dest_folder, output=None)
+            self.assertEqual(load(os.path.join(dest_folder, "one_file.txt")), "The contents")
+
+    def test_compression_level(self):
+        folder = temp_folder()
+        words = ["conan", "package", "build", "header", "library", "alpha", "beta", "gamma"]
+        rand = random.Random(1)
+        contents = "".join(" ".join(rand.choice(words) for _ in range(10)) + "\n"
+                           for _ in range(5000))
+        save(os.path.join(folder, "one_file.txt"), contents)
+        files = {"one_file.txt": os.path.join(folder, "one_file.txt")}
+        for tgz_name in _compressed_names():
+            sizes = []
+            for level in ("1", "9"):
+                with environment_append({"CONAN_COMPRESSION_LEVEL": level,
+                                         "CONAN_COMPRESSION_FORMAT_LEVEL": level}):
+                    tgz_path = compress_files(files, {}, tgz_name, dest_dir=temp_folder())
+                sizes.append(os.path.getsize(tgz_path))
+                dest_folder = temp_folder()
+                uncompress_file(tgz_path, dest_folder, output=None)
+                self.assertEqual(load(os.path.join(dest_folder, "one_file.txt")), contents)
+            self.assertGreater(sizes[0], sizes[1], tgz_name)
+
+    def test_compression_format_default_levels(self):
+        # The gzip level of the conan.conf does not change the levels of xz and zstd
+        fileobj = BytesIO()
+        with environment_append({"CONAN_COMPRESSION_LEVEL": "9"}):
+            with patch("tarfile.open", wraps=tarfile.open) as open_mock:
+                open_compressed_tar("conan_package.txz", fileobj).close()
+            self.assertEqual(6, open_mock.call_args[1]["preset"])
+            with environment_append({"CONAN_COMPRESSION_FORMAT_LEVEL": "2"}):
+                with patch("tarfile.open", wraps=tarfile.open) as open_mock:
+                    open_compressed_tar("conan_package.txz", fileobj).close()
+                self.assertEqual(2, open_mock.call_args[1]["preset"])
+        try:
+            import zstandard
+        except ImportError:
+            return
+        with environment_append({"CONAN_COMPRESSION_LEVEL": "9"}):
+            with patch.object(zstandard, "ZstdCompressor",
+                              wraps=zstandard.ZstdCompressor) as compressor_mock:
+                open_compressed_tar("conan_package.tzst", BytesIO()).close()
+                self.assertEqual(3, compressor_mock.call_args[1]["level"])
+                with environment_append({"CONAN_COMPRESSION_FORMAT_LEVEL": "19"}):
+                    open_compressed_tar("conan_package.tzst", BytesIO()).close()
+                self.assertEqual(19, compressor_mock.call_args[1]["level"])
+
+    def test_check_compressed_files(self):
+        files = ["conaninfo.txt", "conan_package.txz", "conan_package.tzst"]
+        self.assertEqual("conan_package.txz", check_compressed_files(PACKAGE_TGZ_NAME, files))
+        self.assertIsNone(check_compressed_files(PACKAGE_TGZ_NAME, ["conaninfo.txt"]))
+        with six.assertRaisesRegex(self, ConanException, "not prepared to handle "
+                                                         "'conan_package.tbz2'"):
+            check_compressed_files(PACKAGE_TGZ_NAME, ["conan_package.tbz2"])
+
+
+def _compressed_names():
+    names = [PACKAGE_TGZ_NAME, "conan_package.txz"]
+    try:
+        import zstandard  # noqa - optional dependency
+        names.append("conan_package.tzst")
+    except ImportError:
+        pass
+    return names
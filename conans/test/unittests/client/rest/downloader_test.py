@@ -4,11 +4,17 @@ import tempfile
 import unittest
 
 import pytest
+from mock import patch
 
+from conans.client.cmd.uploader import compress_files
 from conans.client.downloaders.file_downloader import FileDownloader
+from conans.client.downloaders.range_downloader import range_state_path
+from conans.client.remote_manager import StreamingTgzExtractor
 from conans.errors import ConanException
+from conans.paths import PACKAGE_TGZ_NAME
 from conans.test.utils.mocks import TestBufferConanOutput
-from conans.util.files import load
+from conans.test.utils.test_files import temp_folder
+from conans.util.files import load, md5sum, save
 
 
 class _ConfigMock:
@@ -42,20 +48,24 @@ class MockRequester(object):
         self._chunk_size = chunk_size if chunk_size is not None else len(data)
         self._accept_ranges = accept_ranges
         self._echo_header = echo_header.copy() if echo_header else {}
+        self.ranges = []
 
     def get(self, *_args, **kwargs):
         start = 0
+        end = len(self._data) - 1
         headers = kwargs.get("headers") or {}
         transfer_range = headers.get("range", "")
-        match = re.match(r"bytes=([0-9]+)-", transfer_range)
+        self.ranges.append(transfer_range)
+        match = re.match(r"bytes=([0-9]+)-([0-9]*)", transfer_range)
         status = 200
         headers = {"Content-Length": len(self._data), "Accept-Ranges": "bytes"}
         if match and self._accept_ranges:
-            start = int(match.groups()[0])
+            start = int(match.group(1))
+            end = min(int(match.group(2)), end) if match.group(2) else end
             if start < len(self._data):
                 status = 206
-                headers.update({"Content-Length": str(len(self._data) - start),
-                                "Content-Range": "bytes {}-{}/{}".format(start, len(self._data) - 1,
+                headers.update({"Content-Length": str(end + 1 - start),
+                                "Content-Range": "bytes {}-{}/{}".format(start, end,
                                                                          len(self._data))})
             else:
                 status = 416
@@ -63,8 +73,8 @@ class MockRequester(object):
                                 "Content-Range": "bytes */{}".format(len(self._data))})
         else:
             headers.update(self._echo_header)
-        response = MockResponse(self._data[start:start + self._chunk_size], status_code=status,
-                                headers=headers)
+        response = MockResponse(self._data[start:min(end + 1, start + self._chunk_size)],
+                                status_code=status, headers=headers)
         return response
 
 
@@ -143,3 +153,75 @@ class DownloaderUnitTest(unittest.TestCase):
         downloader.download("fake_url", file_path=self.target)
         actual_content = load(self.target, binary=True)
         self.assertEqual(expected_content, actual_content)
+
+    def test_streamed_download_checksum(self):
+        folder = temp_folder()
+        save(os.path.join(folder, "file.txt"), b"contents")
+        tgz_path = compress_files({"file.txt": os.path.join(folder, "file.txt")}, {},
+                                  PACKAGE_TGZ_NAME, dest_dir=folder)
+        requester = MockRequester(load(tgz_path, binary=True))
+        downloader = FileDownloader(requester=requester, output=self.out, verify=None,
+                                    config_retry=0, config_retry_wait=0)
+        dest_folder = os.path.join(temp_folder(), "package")
+        kept_folder = temp_folder()
+        extractor = StreamingTgzExtractor(dest_folder, kept_folder)
+        with pytest.raises(ConanException, match=r"md5 signature failed for "
+                                                 r"'conan_package.tgz' file"):
+            downloader.download("http://fake/conan_package.tgz", md5="wrong",
+                                chunks_handler=extractor)
+        # Nothing of the corrupted download is left
+        self.assertFalse(os.path.exists(dest_folder))
+        self.assertFalse(os.path.exists(os.path.join(kept_folder, PACKAGE_TGZ_NAME)))
+
+        downloader.download("http://fake/conan_package.tgz", md5=md5sum(tgz_path),
+                            chunks_handler=extractor)
+        self.assertEqual("contents", load(os.path.join(dest_folder, "file.txt")))
+
+
+@patch("conans.client.downloaders.range_downloader.RANGE_MIN_SIZE", 4)
+class RangesDownloaderUnitTest(unittest.TestCase):
+    def setUp(self):
+        d = tempfile.mkdtemp()
+        self.target = os.path.join(d, "target")
+        self.out = TestBufferConanOutput()
+        self.content = b"".join(str(i).encode() * 10 for i in range(4))
+
+    def _downloader(self, requester):
+        return FileDownloader(requester=requester, output=self.out, verify=None,
+                              config_retry=0, config_retry_wait=0, ranges=4)
+
+    def test_download_ranges(self):
+        requester = MockRequester(self.content)
+        self._downloader(requester).download("fake_url", file_path=self.target)
+        self.assertEqual(self.content, load(self.target, binary=True))
+        self.assertEqual(["", "bytes=0-9", "bytes=10-19", "bytes=20-29", "bytes=30-39"],
+                         sorted(requester.ranges))
+        self.assertFalse(os.path.exists(range_state_path(self.target)))
+
+    def test_resume_interrupted_ranges(self):
+        requester = MockRequester(self.content, chunk_size=6)
+        with pytest.raises(ConanException, match=r"interrupted at"):
+            self._downloader(requester).download("fake_url", file_path=self.target)
+        self.assertTrue(os.path.exists(range_state_path(self.target)))
+        self.assertIn("it will be resumed the next time", self.out)
+
+        # Only the missing bytes of every range are downloaded
+        requester = MockRequester(self.content)
+        self._downloader(requester).download("fake_url", file_path=self.target)
+        self.assertEqual(self.content, load(self.target, binary=True))
+        self.assertEqual(["", "bytes=16-19", "bytes=26-29", "bytes=36-39", "bytes=6-9"],
+                         sorted(requester.ranges))
+        self.assertFalse(os.path.exists(range_state_path(self.target)))
+
+    def test_server_not_accepting_ranges(self):
+        requester = MockRequester(self.content, accept_ranges=False,
+                                  echo_header={"Accept-Ranges": "none"})
+        self._downloader(requester).download("fake_url", file_path=self.target)
+        self.assertEqual(self.content, load(self.target, binary=True))
+        self.assertEqual([""], requester.ranges)
+
+    def test_small_file_single_request(self):
+        requester = MockRequester(b"data")
+        self._downloader(requester).download("fake_url", file_path=self.target)
+        self.assertEqual(b"data", load(self.target, binary=True))
+        self.assertEqual([""], requester.ranges)
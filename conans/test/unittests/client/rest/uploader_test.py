@@ -1,3 +1,4 @@
+import os
 import tempfile
 import unittest
 from collections import namedtuple
@@ -7,7 +8,7 @@ import six
 from conans.client.rest.file_uploader import FileUploader
 from conans.errors import AuthenticationException, ForbiddenException, InternalErrorException
 from conans.test.utils.mocks import TestBufferConanOutput
-from conans.util.files import save
+from conans.util.files import save, sha1sum
 
 
 class _ConfigMock:
@@ -62,3 +63,24 @@ class UploaderUnitTest(unittest.TestCase):
         save(f, "some contents")
         with six.assertRaisesRegex(self, InternalErrorException, "tururu"):
             uploader.upload("fake_url", self.f, dedup=True)
+
+    def test_upload_blocks_and_checksum(self):
+        class CaptureRequester(object):
+            def put(self, url, data, headers, **kwargs):
+                self.headers = headers
+                self.blocks = [block for block in data]
+                return namedtuple("response", "status_code raise_for_status")(200, lambda: None)
+
+        contents = os.urandom(2 * 1024 * 1024 + 1)
+        with open(self.f, "wb") as f:
+            f.write(contents)
+        requester = CaptureRequester()
+        uploader = FileUploader(requester, self.out, verify=False, config=_ConfigMock())
+        uploader.upload("fake_url", self.f)
+        self.assertEqual(3, len(requester.blocks))
+        self.assertEqual(contents, b"".join(requester.blocks))
+        self.assertEqual(sha1sum(self.f), requester.headers["X-Checksum-Sha1"])
+
+        # The already computed checksum is reused
+        uploader.upload("fake_url", self.f, sha1="known_sha1")
+        self.assertEqual("known_sha1", requester.headers["X-Checksum-Sha1"])
@@ -1,12 +1,16 @@
+import gzip
 import os
 import sys
+import tarfile
 import time
 import unittest
+from io import BytesIO
 
 from conans.client.cmd.uploader import compress_files
+from conans.client.tools.env import environment_append
 from conans.paths import PACKAGE_TGZ_NAME
 from conans.test.utils.test_files import temp_folder
-from conans.util.files import md5sum, mkdir, path_exists, save
+from conans.util.files import md5sum, mkdir, path_exists, save, ParallelGzipWriter
 
 
 class FilesTest(unittest.TestCase):
@@ -45,6 +49,42 @@ class FilesTest(unittest.TestCase):
 
         self.assertEqual(md5_a, md5_b)
 
+    def test_parallel_compress(self):
+        folder = temp_folder()
+        files = {}
+        for i in range(10):
+            name = "file%s.txt" % i
+            save(os.path.join(folder, name), os.urandom(300 * 1024))
+            files[name] = os.path.join(folder, name)
+
+        checksums = []
+        for threads in (2, 8):
+            dest_folder = temp_folder()
+            with environment_append({"CONAN_COMPRESSION_THREADS": str(threads)}):
+                tgz_path = compress_files(files, {}, PACKAGE_TGZ_NAME, dest_dir=dest_folder)
+            checksums.append(md5sum(tgz_path))
+            with tarfile.open(tgz_path, "r:gz") as tgz:
+                self.assertEqual(sorted(files), sorted(tgz.getnames()))
+                for name, abs_path in files.items():
+                    with open(abs_path, "rb") as f:
+                        self.assertEqual(f.read(), tgz.extractfile(name).read())
+        # The output doesn't depend on the number of threads
+        self.assertEqual(checksums[0], checksums[1])
+
+    def test_parallel_gzip_writer(self):
+        data = os.urandom(10000) + b"a" * 20000
+        output = BytesIO()
+        writer = ParallelGzipWriter(output, 9, threads=3, block_size=1000)
+        for i in range(0, len(data), 700):
+            writer.write(data[i:i + 700])
+        self.assertEqual(len(data), writer.tell())
+        writer.close()
+        self.assertEqual(data, gzip.GzipFile(fileobj=BytesIO(output.getvalue())).read())
+
+        empty_output = BytesIO()
+        ParallelGzipWriter(empty_output, 9, threads=3).close()
+        self.assertEqual(b"", gzip.GzipFile(fileobj=BytesIO(empty_output.getvalue())).read())
+
     def test_path_exists(self):
         """
         Unit test of path_exists
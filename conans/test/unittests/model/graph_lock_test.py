@@ -0,0 +1,53 @@
+import unittest
+
+from conans.model.graph_lock import GraphLock, topological_levels
+from conans.model.ref import ConanFileReference
+
+
+class TopologicalLevelsTest(unittest.TestCase):
+
+    def test_levels(self):
+        deps = {"1": ["2", "3"], "2": ["4"], "3": ["4", "5"], "4": [], "5": ["4", "other"],
+                "6": []}
+        self.assertEqual([["4", "6"], ["2", "5"], ["3"], ["1"]], topological_levels(deps))
+
+    def test_cycle(self):
+        self.assertEqual([["3"]], topological_levels({"1": ["2"], "2": ["1"], "3": []}))
+
+
+class GraphLockTest(unittest.TestCase):
+
+    def setUp(self):
+        nodes = {"0": {"path": "conanfile.txt", "requires": ["3", "10"]},
+                 "3": {"ref": "pkg/0.1#rev1", "package_id": "id1", "requires": ["2"],
+                       "python_requires": ["tool/0.1#rev"]},
+                 "2": {"ref": "dep/0.1", "package_id": "id2"},
+                 "10": {"ref": "pkg/0.1#rev1", "package_id": "id1", "build_requires": ["2"],
+                        "context": "build"}}
+        self.lock = GraphLock.deserialize({"nodes": nodes, "revisions_enabled": True}, True)
+
+    def test_build_order(self):
+        self.assertEqual([[("dep/0.1", "id2", None, "2")],
+                          [("pkg/0.1@#rev1", "id1", "build", "10"),
+                           ("pkg/0.1@#rev1", "id1", None, "3")]],
+                         self.lock.build_order())
+        # The python_requires are not added to the requires
+        self.assertEqual(["2"], self.lock.nodes["3"].requires)
+
+    def test_find(self):
+        self.assertEqual("0", self.lock.get_consumer(None))
+        # The first node, comparing the ids as strings
+        self.assertEqual("10", self.lock.get_consumer(ConanFileReference.loads("pkg/0.1")))
+        ref = ConanFileReference.loads("pkg/0.1#rev1")
+        self.assertEqual("10", self.lock._find_node_by_requirement(ref))
+        self.lock.relax()
+        self.assertIsNone(self.lock._find_node_by_requirement(ref.copy_with_rev("rev3")))
+        # The version ranges match the first node in the order of the lockfile
+        self.assertEqual("3", self.lock._match_relaxed_require(
+            ConanFileReference.loads("pkg/[>0.0]")))
+
+        # The index is updated when the references change
+        ref = ConanFileReference.loads("dep/0.1#rev2")
+        self.assertIsNone(self.lock._find_node_by_requirement(ref))
+        self.lock.update_exported_ref("2", ref)
+        self.assertEqual("2", self.lock._find_node_by_requirement(ref))
@@ -306,6 +306,34 @@ os: [Windows, Linux]
         self.sut.update_values([("compiler.arch.speed", "A")])
         self.assertEqual(self.sut.compiler.arch.speed, "A")
 
+    def test_copy(self):
+        self.sut.compiler = "gcc"
+        self.sut.compiler.arch = "x86"
+        copied = self.sut.copy()
+        # The definitions are shared until they are modified
+        self.assertIs(self.sut._data, copied._data)
+
+        copied.compiler.arch = "x64"
+        copied.compiler.arch.speed = "C"
+        copied.compiler.version.remove("4.8")
+        copied.constraint({"compiler": None})
+        self.assertEqual(self.sut.compiler.arch, "x86")
+        self.assertIsNone(self.sut.compiler.arch.speed.value)
+        self.assertEqual(self.sut.compiler.version.values_range, ["4.8", "4.9"])
+        self.assertEqual(self.sut.fields, ["compiler", "os"])
+        self.assertEqual(copied.values_list, [("compiler", "gcc"), ("compiler.arch", "x64"),
+                                              ("compiler.arch.speed", "C")])
+        self.assertEqual(copied.compiler.version.values_range, ["4.9"])
+        self.assertEqual(copied.fields, ["compiler"])
+
+        # Modifying the original does not change the copies either
+        copied = self.sut.copy()
+        self.sut.compiler = "Visual Studio"
+        self.sut.compiler.remove("gcc")
+        self.assertEqual(copied.compiler, "gcc")
+        self.assertEqual(copied.compiler.arch, "x86")
+        self.assertEqual(copied.compiler.values_range, ["Visual Studio", "gcc"])
+
     def test_constraint(self):
         s2 = {"os": None}
         self.sut.constraint(s2)
@@ -1,7 +1,11 @@
 import os
+import time
 import unittest
 
+from mock import patch
+
 from conans.client.cache.cache import ClientCache
+from conans.client.store import cache_index
 from conans.client.tools import chdir
 from conans.model.info import ConanInfo
 from conans.model.ref import ConanFileReference
@@ -37,6 +41,33 @@ class SearchTest(unittest.TestCase):
             all_artif = [_artif for _artif in sorted(packages)]
             self.assertEqual(all_artif, artifacts)
 
+    def test_query_index(self):
+        ref = ConanFileReference.loads("opencv/2.4.10@lasote/testing")
+        layout = self.cache.package_layout(ref)
+        os.makedirs(layout.export())
+        for package_id, os_, shared in (("a", "Linux", "True"), ("b", "Windows", "True"),
+                                        ("c", "Windows", "False")):
+            info = ConanInfo.loads("[settings]\n    os=%s\n[options]\n    shared=%s"
+                                   % (os_, shared))
+            save(os.path.join(layout.packages(), package_id, CONANINFO), info.dumps())
+        old = time.time() - 100
+        for root, dirs, files in os.walk(self.cache.store):
+            for path in [root] + [os.path.join(root, f) for f in dirs + files]:
+                os.utime(path, (old, old))
+        self.cache.update_index(ref)
+
+        # The index answers the queries, without parsing the conaninfo.txt files
+        with patch.object(cache_index, "_load_info_min") as load_info:
+            for query, expected in (("os=Windows", ["b", "c"]),
+                                    ("os=Windows AND shared=True", ["b"]),
+                                    ('os="Linux" OR (os=Windows AND shared=False)', ["a", "c"]),
+                                    ("compiler=None", ["a", "b", "c"])):
+                packages = search_packages(layout, query, cache_index=self.cache.index)
+                self.assertEqual(expected, sorted(packages))
+                self.assertEqual(sorted(search_packages(layout, query)), sorted(packages))
+            self.assertEqual([ref], search_recipes(self.cache, "opencv/*"))
+            load_info.assert_not_called()
+
     def test_pattern(self):
         with chdir(self.cache.store):
             references = ["opencv/2.4.%s@lasote/testing" % ref for ref in ("1", "2", "3")]
@@ -0,0 +1,79 @@
+import os
+import unittest
+
+from mock import patch
+
+from conans.server.revision_list import RevisionList
+from conans.server.store.revision_files import LOG_SUFFIX, RevisionFiles
+from conans.test.utils.test_files import temp_folder
+from conans.util.files import load, mkdir
+
+
+class RevisionFilesTest(unittest.TestCase):
+
+    def setUp(self):
+        folder = temp_folder()
+        mkdir(folder)
+        self.path = os.path.join(folder, "revisions.txt")
+        self.files = RevisionFiles()
+
+    def _revisions(self, files=None):
+        return [r.revision for r in (files or self.files).load(self.path).as_list()]
+
+    def test_append(self):
+        self.assertEqual([], self._revisions())
+        self.files.add(self.path, "rev1")
+        self.files.add(self.path, "rev2")
+        self.files.add(self.path, "rev1")
+        # The revisions are appended to the log, the list is not written
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(3, len(load(self.path + LOG_SUFFIX).splitlines()))
+        self.assertEqual(["rev1", "rev2"], self._revisions())
+        # Other instances, or processes, read the same
+        self.assertEqual(["rev1", "rev2"], self._revisions(RevisionFiles()))
+
+    def test_cached(self):
+        self.files.add(self.path, "rev1")
+        with patch.object(RevisionFiles, "_read", side_effect=RevisionFiles._read) as read_mock:
+            self.assertEqual(["rev1"], self._revisions())
+            self.assertEqual(1, read_mock.call_count)
+            # Adding the latest revision again does not read nor write anything
+            self.files.add(self.path, "rev1")
+            self.assertEqual(["rev1"], self._revisions())
+            self.assertEqual(1, read_mock.call_count)
+            # Changes of other processes are detected
+            RevisionFiles().add(self.path, "rev2")
+            read_mock.reset_mock()
+            self.assertEqual(["rev2", "rev1"], self._revisions())
+            self.assertEqual(1, read_mock.call_count)
+
+    def test_compaction(self):
+        with patch("conans.server.store.revision_files._COMPACT_SIZE", 150):
+            for i in range(10):
+                self.files.add(self.path, "rev%s" % i)
+        # Every 3 revisions the log is merged into the file
+        compacted = [r.revision for r in RevisionList.loads(load(self.path)).as_list()]
+        self.assertEqual(["rev%s" % i for i in reversed(range(9))], compacted)
+        self.assertEqual(1, len(load(self.path + LOG_SUFFIX).splitlines()))
+        self.assertEqual(["rev%s" % i for i in reversed(range(10))], self._revisions())
+
+    def test_interrupted_compaction(self):
+        self.files.add(self.path, "rev1")
+        self.files.add(self.path, "rev2")
+        self.files.add(self.path, "rev1")
+        log = load(self.path + LOG_SUFFIX)
+        self.files.remove(self.path, "rev3")  # Compacts
+        self.assertFalse(os.path.exists(self.path + LOG_SUFFIX))
+        # A log already merged in the file does not change it
+        with open(self.path + LOG_SUFFIX, "w") as f:
+            f.write(log)
+        self.assertEqual(["rev1", "rev2"], self._revisions(RevisionFiles()))
+
+    def test_remove(self):
+        self.files.add(self.path, "rev1")
+        self.files.add(self.path, "rev2")
+        self.files.remove(self.path, "rev2")
+        self.assertEqual(["rev1"], self._revisions())
+        self.assertFalse(os.path.exists(self.path + LOG_SUFFIX))
+        self.files.remove(self.path, "rev1")
+        self.assertEqual([], self._revisions())
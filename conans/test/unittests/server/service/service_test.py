@@ -3,6 +3,8 @@ import unittest
 from datetime import timedelta
 from time import sleep
 
+from mock import patch
+
 from conans import DEFAULT_REVISION_V1
 from conans.errors import NotFoundException, RequestErrorException
 from conans.model.manifest import FileTreeManifest
@@ -17,7 +19,7 @@ from conans.server.store.disk_adapter import ServerDiskAdapter
 from conans.server.store.server_store import ServerStore
 from conans.test.assets.genconanfile import GenConanfile
 from conans.test.utils.test_files import temp_folder
-from conans.util.files import load, md5sum, mkdir, save, save_files
+from conans.util.files import file_checksums, load, md5sum, mkdir, save, save_files
 
 
 class MockFileSaver(object):
@@ -114,6 +116,24 @@ class ConanServiceTest(unittest.TestCase):
 
         self.assertEqual(snap, snap_expected)
 
+    def test_snapshot_checksums_stored(self):
+        base_path = self.server_store.export(self.ref)
+        conanfile_path = os.path.join(base_path, "conanfile.py")
+        with patch("conans.server.store.file_checksums.file_checksums",
+                   side_effect=file_checksums) as checksums_mock:
+            snap = self.service.get_recipe_snapshot(self.ref)
+            self.assertEqual(2, checksums_mock.call_count)
+            # The stored checksums are used, and not returned as files of the recipe
+            self.assertEqual(snap, self.service.get_recipe_snapshot(self.ref))
+            self.assertEqual(2, checksums_mock.call_count)
+
+            save(conanfile_path, "new content")
+            snap = self.service.get_recipe_snapshot(self.ref)
+            self.assertEqual(3, checksums_mock.call_count)
+            self.assertEqual(md5sum(conanfile_path), snap["conanfile.py"])
+            self.assertEqual(file_checksums(conanfile_path),
+                             self.server_store.get_file_checksums(conanfile_path))
+
     def test_get_conanfile_download_urls(self):
         urls = self.service.get_conanfile_download_urls(self.ref)
         # Remove parameters
@@ -231,6 +251,51 @@ class ConanServiceTest(unittest.TestCase):
                                                 'settings': {}}
                                 })
 
+    def test_search_index(self):
+        conan_vars = "[options]\n    use_Qt=%s\n"
+        save_files(self.server_store.package(self.pref), {CONANINFO: conan_vars % "True"})
+        self.server_store.update_last_package_revision(self.pref)
+
+        # The index is built the first time it is used
+        self.assertEqual([self.ref.copy_clear_rev()], self.search_service.search())
+        info = self.search_service.search_packages(self.ref, None)
+        self.assertEqual({"use_Qt": "True"}, info["123123123"]["options"])
+
+        # The uploads update the index, and the searches do not read the store anymore
+        ref2 = ConanFileReference("zlib", "1.2", "lasote", "stable", DEFAULT_REVISION_V1)
+        pref2 = PackageReference(ref2, "456", DEFAULT_REVISION_V1)
+        save_files(self.server_store.export(ref2), {"conanfile.py": str(GenConanfile())})
+        self.server_store.update_last_revision(ref2)
+        save_files(self.server_store.package(pref2), {CONANINFO: conan_vars % "False"})
+        self.server_store.update_last_package_revision(pref2)
+        self.server_store.update_package_index(os.path.join(self.server_store.package(pref2),
+                                                            CONANINFO))
+        # A new revision without its conaninfo.txt yet does not remove the package
+        self.server_store.update_last_package_revision(pref2.copy_with_revs(ref2.revision,
+                                                                            "newprev"))
+        with patch("conans.server.store.server_store.list_folder_subdirs") as list_mock, \
+                patch("conans.server.store.server_store.load") as load_mock:
+            self.assertEqual([self.ref.copy_clear_rev(), ref2.copy_clear_rev()],
+                             self.search_service.search())
+            info = self.search_service.search_packages(ref2, None)
+            self.assertEqual({"use_Qt": "False"}, info["456"]["options"])
+            self.assertFalse(list_mock.called)
+            self.assertFalse(load_mock.called)
+
+        # The removals too
+        self.service.remove_packages(self.ref, ["123123123"])
+        self.assertEqual({}, self.search_service.search_packages(self.ref, None))
+        self.service.remove_conanfile(ref2)
+        self.assertEqual([self.ref.copy_clear_rev()], self.search_service.search())
+
+        # A removed index is built again from the store
+        os.remove(os.path.join(self.server_store.store, ".conan_server_index.db"))
+        save_files(self.server_store.package(pref2), {CONANINFO: conan_vars % "False"})
+        self.server_store.update_last_package_revision(pref2)
+        self.assertEqual([self.ref.copy_clear_rev(), ref2.copy_clear_rev()],
+                         self.search_service.search())
+        self.assertIn("456", self.search_service.search_packages(ref2, None))
+
     def test_remove(self):
         ref2 = ConanFileReference("OpenCV", "3.0", "lasote", "stable", DEFAULT_REVISION_V1)
         ref3 = ConanFileReference("Assimp", "1.10", "lasote", "stable", DEFAULT_REVISION_V1)
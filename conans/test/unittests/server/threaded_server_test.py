@@ -0,0 +1,94 @@
+import os
+import threading
+import time
+import unittest
+
+import bottle
+import requests
+from six.moves import http_client
+
+from conans.server.rest.threaded_server import ThreadedServer
+from conans.test.utils.test_files import temp_folder
+from conans.util.files import save
+
+
+class ThreadedServerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = temp_folder()
+        self.content = b"0123456789" * 100000
+        save(os.path.join(self.folder, "file.bin"), self.content)
+        self.release = threading.Event()
+        app = bottle.Bottle()
+
+        @app.route("/slow")
+        def slow():
+            self.release.wait(10)
+            return "slow"
+
+        @app.route("/fast")
+        def fast():
+            return "fast"
+
+        @app.route("/file")
+        def get_file():
+            return bottle.static_file("file.bin", root=self.folder)
+
+        self.server = ThreadedServer(port=0, workers=4, keep_alive=2, quiet=True)
+        thread = threading.Thread(target=bottle.run,
+                                  kwargs={"app": app, "server": self.server, "quiet": True})
+        thread.daemon = True
+        thread.start()
+        for _ in range(100):
+            if self.server.server is not None:
+                break
+            time.sleep(0.05)
+        self.url = "http://127.0.0.1:%s" % self.server.port
+
+    def tearDown(self):
+        self.release.set()
+        self.server.server.shutdown()
+
+    def test_concurrent_requests(self):
+        slow_response = []
+        slow = threading.Thread(target=lambda: slow_response.append(requests.get(self.url +
+                                                                                 "/slow")))
+        slow.start()
+        # The blocked request does not prevent serving the others
+        self.assertEqual("fast", requests.get(self.url + "/fast", timeout=5).text)
+        self.release.set()
+        slow.join()
+        self.assertEqual("slow", slow_response[0].text)
+
+    def test_files(self):
+        response = requests.get(self.url + "/file")
+        self.assertEqual(self.content, response.content)
+        response = requests.get(self.url + "/file", headers={"Range": "bytes=10-29"})
+        self.assertEqual(206, response.status_code)
+        self.assertEqual(self.content[10:30], response.content)
+
+    def test_keep_alive(self):
+        connection = http_client.HTTPConnection("127.0.0.1", self.server.port, timeout=5)
+        connection.request("GET", "/file")
+        self.assertEqual(self.content, connection.getresponse().read())
+        sock = connection.sock
+        connection.request("GET", "/fast")
+        self.assertEqual(b"fast", connection.getresponse().read())
+        self.assertIs(sock, connection.sock)
+        connection.close()
+
+    def test_idle_connections_release_workers(self):
+        connections = []
+        for _ in range(8):
+            connection = http_client.HTTPConnection("127.0.0.1", self.server.port, timeout=5)
+            connection.request("GET", "/fast")
+            self.assertEqual(b"fast", connection.getresponse().read())
+            connections.append(connection)
+        # More idle connections than workers, the new requests are still served
+        self.assertEqual("fast", requests.get(self.url + "/fast", timeout=1).text)
+        for connection in connections:
+            sock = connection.sock
+            connection.request("GET", "/fast")
+            self.assertEqual(b"fast", connection.getresponse().read())
+            self.assertIs(sock, connection.sock)
+            connection.close()
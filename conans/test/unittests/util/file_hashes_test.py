@@ -1,12 +1,13 @@
+import hashlib
 import os
 import unittest
 
 import six
 
-from conans.client.tools.files import check_md5, check_sha1, check_sha256
+from conans.client.tools.files import check_md5, check_sha1, check_sha256, check_checksums
 from conans.errors import ConanException
 from conans.test.utils.test_files import temp_folder
-from conans.util.files import save
+from conans.util.files import save, file_checksums
 
 
 class HashesTest(unittest.TestCase):
@@ -29,3 +30,23 @@ class HashesTest(unittest.TestCase):
 
         with six.assertRaisesRegex(self, ConanException, "sha256 signature failed for 'file.txt' file."):
             check_sha256(filepath, "invalid")
+
+    def test_multiple_checksums(self):
+        folder = temp_folder()
+        filepath = os.path.join(folder, "file.bin")
+        # Bigger than the read buffer, and not a multiple of it
+        file_content = os.urandom(3 * 1024 * 1024 + 123)
+        save(filepath, file_content)
+
+        checksums = file_checksums(filepath, ("md5", "sha1", "sha256"))
+        self.assertEqual(checksums, {"md5": hashlib.md5(file_content).hexdigest(),
+                                     "sha1": hashlib.sha1(file_content).hexdigest(),
+                                     "sha256": hashlib.sha256(file_content).hexdigest()})
+        empty = os.path.join(folder, "empty.txt")
+        save(empty, "")
+        self.assertEqual(file_checksums(empty), {"md5": hashlib.md5(b"").hexdigest(),
+                                                 "sha1": hashlib.sha1(b"").hexdigest()})
+
+        check_checksums(filepath, [("md5", checksums["md5"]), ("sha1", checksums["sha1"])])
+        with six.assertRaisesRegex(self, ConanException, "sha1 signature failed for 'file.bin'"):
+            check_checksums(filepath, [("md5", checksums["md5"]), ("sha1", "invalid")])
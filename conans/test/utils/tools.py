@@ -97,7 +97,7 @@ class TestingResponse(object):
 
     @property
     def ok(self):
-        return self.test_response.status_code == 200
+        return 200 <= self.test_response.status_code < 300
 
     def raise_for_status(self):
         """Raises stored :class:`HTTPError`, if one occurred."""
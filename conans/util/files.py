@@ -7,12 +7,16 @@ import re
 import shutil
 import stat
 import sys
+import struct
 import tarfile
 import tempfile
+import zlib
 
 
 from os.path import abspath, join as joinpath, realpath
+from collections import deque
 from contextlib import contextmanager
+from multiprocessing.pool import ThreadPool
 
 import six
 
@@ -154,18 +158,38 @@ def sha256sum(file_path):
 
 
 def _generic_algorithm_sum(file_path, algorithm_name):
+    return file_checksums(file_path, (algorithm_name, ))[algorithm_name]
 
+
+_CHECKSUM_BUFFER_SIZE = 1024 * 1024
+
+
+def _new_hash(algorithm_name):
+    try:
+        return hashlib.new(algorithm_name)
+    except ValueError:  # FIPS error https://github.com/conan-io/conan/issues/7800
+        return hashlib.new(algorithm_name, usedforsecurity=False)
+
+
+def file_checksums(file_path, algorithms=("md5", "sha1")):
+    """ computes several hashes of a file reading it only once, with a large reused buffer
+    :param algorithms: iterable of hashlib algorithm names
+    :return: {algorithm_name: hexdigest}
+    """
+    hashes = [(name, _new_hash(name)) for name in algorithms]
     with open(file_path, 'rb') as fh:
-        try:
-            m = hashlib.new(algorithm_name)
-        except ValueError:  # FIPS error https://github.com/conan-io/conan/issues/7800
-            m = hashlib.new(algorithm_name, usedforsecurity=False)
+        # Small files (most of them) do not need to allocate the whole buffer
+        buffer_size = min(max(os.fstat(fh.fileno()).st_size, 1), _CHECKSUM_BUFFER_SIZE)
+        buffer = bytearray(buffer_size)
+        view = memoryview(buffer)
         while True:
-            data = fh.read(8192)
-            if not data:
+            size = fh.readinto(buffer)
+            if not size:
                 break
-            m.update(data)
-        return m.hexdigest()
+            data = view[:size] if size < buffer_size else view
+            for _, m in hashes:
+                m.update(data)
+    return {name: m.hexdigest() for name, m in hashes}
 
 
 def save_append(path, content, encoding="utf-8"):
@@ -286,7 +310,11 @@ def mkdir(path):
     """Recursive mkdir, doesnt fail if already existing"""
     if os.path.exists(path):
         return
-    os.makedirs(path)
+    try:
+        os.makedirs(path)
+    except OSError:
+        if not os.path.isdir(path):  # It could have been created concurrently
+            raise
 
 
 def path_exists(path, basedir):
@@ -309,18 +337,100 @@ def path_exists(path, basedir):
     return True
 
 
+_GZIP_BLOCK_SIZE = 1024 * 1024
+
+
+def _deflate_block(data, compresslevel):
+    compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, -zlib.MAX_WBITS)
+    # The sync flush ends the block at a byte boundary, without marking it as the last one
+    return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+
+class ParallelGzipWriter(object):
+    """ write-only file object producing a gzip stream, like pigz: the data is split in
+    blocks that are deflated independently in a pool of threads, and written in order.
+    The output only depends on the data and the compression level, not on the number of threads
+    """
+
+    def __init__(self, fileobj, compresslevel, threads, block_size=_GZIP_BLOCK_SIZE):
+        self._fileobj = fileobj
+        self._compresslevel = compresslevel
+        self._block_size = block_size
+        self._pool = ThreadPool(threads)
+        self._max_pending = threads * 2  # Bounds the memory used by the compressed blocks
+        self._pending = deque()
+        self._buffer = bytearray()
+        self._crc = 0
+        self._size = 0
+        self.closed = False
+        # header without file name nor timestamp (mtime=0), so the output is reproducible
+        xfl = 2 if compresslevel == 9 else (4 if compresslevel == 1 else 0)
+        self._fileobj.write(struct.pack("<BBBBIBB", 0x1f, 0x8b, zlib.DEFLATED, 0, 0, xfl, 255))
+
+    def tell(self):
+        return self._size
+
+    def write(self, data):
+        self._crc = zlib.crc32(data, self._crc)
+        self._size += len(data)
+        view = memoryview(data)
+        start = 0
+        if self._buffer:
+            start = self._block_size - len(self._buffer)
+            self._buffer.extend(view[:start])
+            if len(self._buffer) < self._block_size:
+                return len(data)
+            self._submit(bytes(self._buffer))
+            self._buffer = bytearray()
+        while len(view) - start >= self._block_size:
+            self._submit(view[start:start + self._block_size].tobytes())
+            start += self._block_size
+        self._buffer.extend(view[start:])
+        return len(data)
+
+    def _submit(self, block):
+        self._pending.append(self._pool.apply_async(_deflate_block,
+                                                    (block, self._compresslevel)))
+        while len(self._pending) >= self._max_pending:
+            self._fileobj.write(self._pending.popleft().get())
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            if self._buffer:
+                self._submit(bytes(self._buffer))
+                self._buffer = bytearray()
+            while self._pending:
+                self._fileobj.write(self._pending.popleft().get())
+            # An empty final block closes the deflate stream
+            self._fileobj.write(zlib.compressobj(self._compresslevel, zlib.DEFLATED,
+                                                 -zlib.MAX_WBITS).flush())
+            self._fileobj.write(struct.pack("<II", self._crc & 0xffffffff,
+                                            self._size & 0xffffffff))
+        finally:
+            self._pool.terminate()
+            self._pool.join()
+
+
 def gzopen_without_timestamps(name, mode="r", fileobj=None, **kwargs):
     """ !! Method overrided by laso to pass mtime=0 (!=None) to avoid time.time() was
         setted in Gzip file causing md5 to change. Not possible using the
         previous tarfile open because arguments are not passed to GzipFile constructor
     """
     compresslevel = int(os.getenv("CONAN_COMPRESSION_LEVEL", 9))
+    # More than 1 thread uses the block compressor, its output is different from GzipFile one
+    threads = int(os.getenv("CONAN_COMPRESSION_THREADS", 1))
 
     if mode not in ("r", "w"):
         raise ValueError("mode must be 'r' or 'w'")
 
     try:
-        fileobj = gzip.GzipFile(name, mode, compresslevel, fileobj, mtime=0)
+        if mode == "w" and threads > 1 and fileobj is not None:
+            fileobj = ParallelGzipWriter(fileobj, compresslevel, threads)
+        else:
+            fileobj = gzip.GzipFile(name, mode, compresslevel, fileobj, mtime=0)
     except OSError:
         if fileobj is not None and mode == 'r':
             raise tarfile.ReadError("not a gzip file")
@@ -342,9 +452,71 @@ def gzopen_without_timestamps(name, mode="r", fileobj=None, **kwargs):
     return t
 
 
-def tar_extract(fileobj, destination_dir):
+# Default levels of the xz and zstd formats, the ones of their command line tools
+_XZ_DEFAULT_PRESET = 6
+_ZSTD_DEFAULT_LEVEL = 3
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        from conans.errors import ConanException
+        raise ConanException("The 'zstandard' package is necessary to handle .tzst files, "
+                             "install it with 'pip install zstandard'")
+    return zstandard
+
+
+class _ZstdTarFile(tarfile.TarFile):
+    """ TarFile writing to a zstd stream, that ends the zstd frame when it is closed. The zstd
+    stream is not closed, to not close the fileobj it writes to, that belongs to the caller
+    """
+    def close(self):
+        closed = self.closed
+        super(_ZstdTarFile, self).close()
+        if not closed:
+            self.fileobj.flush(_zstandard().FLUSH_FRAME)
+
+
+def open_compressed_tar(name, fileobj):
+    """ opens a tar file for writing in fileobj, compressed in the format given by the name
+    extension: .tgz (gzip), .txz (xz) or .tzst (zstd). The CONAN_COMPRESSION_FORMAT_LEVEL, in
+    the scale of the format, sets the level of xz and zstd, otherwise they use their own default
+    levels. The CONAN_COMPRESSION_LEVEL is only for gzip, it is always defined by the conan.conf
+    """
+    level = os.getenv("CONAN_COMPRESSION_FORMAT_LEVEL")
+    if name.endswith(".txz"):
+        preset = min(max(int(level), 0), 9) if level is not None else _XZ_DEFAULT_PRESET
+        try:
+            return tarfile.open(name, "w:xz", fileobj=fileobj, format=tarfile.GNU_FORMAT,
+                                preset=preset)
+        except tarfile.CompressionError as e:  # Python without lzma module
+            from conans.errors import ConanException
+            raise ConanException("Cannot create %s: %s" % (name, str(e)))
+    if name.endswith(".tzst"):
+        zstandard = _zstandard()
+        level = min(max(int(level), 1), 22) if level is not None else _ZSTD_DEFAULT_LEVEL
+        compressor = zstandard.ZstdCompressor(level=level)
+        writer = compressor.stream_writer(fileobj)
+        # Format is forced, as in gzopen_without_timestamps(), to get stable checksums
+        return _ZstdTarFile.taropen(name, "w", writer, format=tarfile.GNU_FORMAT)
+    return gzopen_without_timestamps(name, mode="w", fileobj=fileobj)
+
+
+def compressed_tar_extract(name, fileobj, destination_dir, stream=False):
+    """ tar_extract() for all the formats of open_compressed_tar(), gzip and xz are detected by
+    tarfile, zstd (not supported by tarfile) is selected by the name extension
+    """
+    if name.endswith(".tzst"):
+        fileobj = _zstandard().ZstdDecompressor().stream_reader(fileobj)
+        stream = True
+    tar_extract(fileobj, destination_dir, stream=stream)
+
+
+def tar_extract(fileobj, destination_dir, stream=False):
     """Extract tar file controlling not absolute paths and fixing the routes
-    if the tar was zipped in windows"""
+    if the tar was zipped in windows. With stream=True the fileobj is read sequentially,
+    and it doesn't need to be seekable"""
     def badpath(path, base):
         # joinpath will ignore base if path is absolute
         return not realpath(abspath(joinpath(base, path))).startswith(base)
@@ -361,7 +533,7 @@ def tar_extract(fileobj, destination_dir):
                 finfo.name = finfo.name.replace("\\", "/")
                 yield finfo
 
-    the_tar = tarfile.open(fileobj=fileobj)
+    the_tar = tarfile.open(fileobj=fileobj, mode="r|*" if stream else "r")
     # NOTE: The errorlevel=2 has been removed because it was failing in Win10, it didn't allow to
     # "could not change modification time", with time=0
     # the_tar.errorlevel = 2  # raise exception if any error
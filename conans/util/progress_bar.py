@@ -8,6 +8,7 @@ from conans.client.output import ConanOutput
 
 TIMEOUT_BEAT_SECONDS = 30
 TIMEOUT_BEAT_CHARACTER = '.'
+REFRESH_SECONDS = 0.2
 LEFT_JUSTIFY_DESC = 28
 LEFT_JUSTIFY_MESSAGE = 90
 
@@ -43,6 +44,8 @@ class Progress(object):
         self._post_description = "{} completed".format(
             self._description) if not post_description else post_description
         self._last_time = time.time()
+        self._last_refresh = self._last_time
+        self._pending_size = 0
         if self._output and self._output.is_terminal and self._description:
             self._tqdm_bar = tqdm(total=self._total_length,
                                   desc=left_justify_description(self._description),
@@ -60,13 +63,25 @@ class Progress(object):
             self._last_time = time.time()
             self._output.write(TIMEOUT_BEAT_CHARACTER)
 
+    def timed_update(self, chunk_size):
+        """ the bar is refreshed at most every REFRESH_SECONDS, not for every chunk
+        """
+        self._processed_size += chunk_size
+        self._pending_size += chunk_size
+        now = time.time()
+        if now - self._last_refresh >= REFRESH_SECONDS:
+            self._last_refresh = now
+            self._pb_update(self._pending_size)
+            self._pending_size = 0
+
     def update(self, chunks):
         for chunk in chunks:
             yield chunk
-            data_size = len(chunk)
-            self._processed_size += data_size
-            self._pb_update(data_size)
+            self.timed_update(len(chunk))
 
+        if self._pending_size:
+            self._pb_update(self._pending_size)
+            self._pending_size = 0
         if self._total_length > self._processed_size:
             self._pb_update(self._total_length - self._processed_size)
 